@@ -0,0 +1,59 @@
+"""
+Batch climate physics: enclosure-days per second for what-if mist tuning.
+
+    poetry run python benchmarks/bench_climate.py --enclosures 1000 --days 7
+
+Runs simulate_profiles() over copies of the crested_gecko profile with the
+first mist burst shifted, each under its own ambient humidity, at a 1-minute
+step. Requires the optional `sim` group (numpy).
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from vivariumassistant.packages.core.config_loader import load_profile
+from vivariumassistant.packages.simulator.physics import ClimateParams, simulate_profiles
+
+TZ = "America/New_York"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--enclosures", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--variants", type=int, default=10)
+    args = parser.parse_args()
+
+    base = load_profile("crested_gecko")
+    assert base.mist is not None
+    variants = []
+    for v in range(args.variants):
+        bursts = list(base.mist.bursts)
+        bursts[0] = bursts[0].model_copy(update={"at": f"07:{v * 5 % 60:02d}"})
+        variants.append(
+            base.model_copy(update={"mist": base.mist.model_copy(update={"bursts": bursts})})
+        )
+    profiles = [variants[i % len(variants)] for i in range(args.enclosures)]
+    params = ClimateParams(ambient_humidity_pct=np.linspace(40.0, 70.0, args.enclosures))
+
+    start = datetime(2026, 6, 1, tzinfo=ZoneInfo(TZ))
+    t0 = time.perf_counter()
+    run = simulate_profiles(
+        profiles, TZ, start, start + timedelta(days=args.days), timedelta(minutes=1), params=params
+    )
+    wall = time.perf_counter() - t0
+
+    enclosure_days = args.enclosures * args.days
+    print(f"{enclosure_days} enclosure-days in {wall:.2f} s ({enclosure_days / wall:,.0f}/s)")
+    print(f"steps x enclosures: {run.humidity_pct.shape}")
+    print(f"humidity range: {run.humidity_pct.min():.1f} .. {run.humidity_pct.max():.1f} %")
+
+
+if __name__ == "__main__":
+    main()
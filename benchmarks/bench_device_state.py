@@ -0,0 +1,65 @@
+"""
+Per-tick cost of building and serializing desired states.
+
+    poetry run python benchmarks/bench_device_state.py --ticks 100000
+
+Builds the four states a SIM tick produces (light, UVB, mister, waterfall)
+and dumps them the way the control_tick log does, once with the validated
+Pydantic DeviceState (before) and once with the slotted StateRecord the agent
+now uses on the hot path (after).
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+
+from vivariumassistant.packages.core.device_state import DeviceState, StateRecord
+
+
+def pydantic_tick() -> dict[str, object]:
+    desired = {
+        "light_day": DeviceState(device_id="light_day", on=True, level=0.42),
+        "uvb": DeviceState(device_id="uvb", on=True),
+        "mister": DeviceState(device_id="mister", on=True, meta={"burst_seconds": 20}),
+        "waterfall": DeviceState(device_id="waterfall", on=False),
+    }
+    return {k: v.model_dump() for k, v in desired.items()}
+
+
+def record_tick() -> dict[str, object]:
+    desired = {
+        "light_day": StateRecord(device_id="light_day", on=True, level=0.42),
+        "uvb": StateRecord(device_id="uvb", on=True),
+        "mister": StateRecord(device_id="mister", on=True, meta={"burst_seconds": 20}),
+        "waterfall": StateRecord(device_id="waterfall", on=False),
+    }
+    return {k: v.as_dict() for k, v in desired.items()}
+
+
+def per_tick_us(fn: Callable[[], object], ticks: int) -> float:
+    for _ in range(min(ticks, 1000)):  # warm up
+        fn()
+    t0 = time.perf_counter()
+    for _ in range(ticks):
+        fn()
+    return (time.perf_counter() - t0) / ticks * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=100_000)
+    args = parser.parse_args()
+
+    assert pydantic_tick() == record_tick()
+
+    before = per_tick_us(pydantic_tick, args.ticks)
+    after = per_tick_us(record_tick, args.ticks)
+    print(f"DeviceState  (before): {before:7.2f} us/tick")
+    print(f"StateRecord  (after):  {after:7.2f} us/tick")
+    print(f"speedup:               {before / after:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+AgentHost throughput: N SIM enclosures on one event loop at a fixed tick.
+
+    poetry run python benchmarks/bench_host.py --enclosures 1000 --seconds 30
+
+Reports per-tick latency, start lag against each enclosure's slot, missed
+slots, and CPU used by the process over the run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from vivariumassistant.apps.agent.host import AgentHost
+from vivariumassistant.apps.agent.sim_agent import SimAgent
+from vivariumassistant.packages.core.config_loader import load_enclosure, load_profile
+from vivariumassistant.packages.engine.schedule import CompiledSchedule
+
+
+def build_host(n: int, interval: float) -> AgentHost:
+    base = load_enclosure("enclosure_1")
+    prof = load_profile(base.profile or "crested_gecko")
+    schedule = CompiledSchedule(prof, base.timezone)
+    agents = [
+        SimAgent.from_config(
+            base.model_copy(update={"id": f"enc_{i:04d}"}), prof, schedule=schedule
+        )
+        for i in range(n)
+    ]
+    return AgentHost(agents, interval_seconds=interval, log_ticks=False)
+
+
+async def run(n: int, interval: float, seconds: float) -> None:
+    host = build_host(n, interval)
+
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    try:
+        await asyncio.wait_for(host.run(), timeout=seconds)
+    except TimeoutError:
+        pass
+    cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+
+    stats = list(host.metrics().values())
+    ticks = sum(s.ticks for s in stats)
+    totals = [s.stages["total"] for s in stats]
+    means = [t.mean * 1000 for t in totals if t.count]
+    expected = n * seconds / interval
+
+    print(f"enclosures={n} interval={interval}s run={wall:.1f}s")
+    print(f"ticks={ticks} (expected ~{expected:.0f})  ticks/s={ticks / wall:,.0f}")
+    p99 = max(t.quantile(0.99) for t in totals) * 1000
+    print(
+        f"tick mean={statistics.fmean(means):.3f}ms  p99={p99:.3f}ms  "
+        f"max={max(t.max for t in totals) * 1000:.2f}ms"
+    )
+    print(f"start lag max={max(s.drift.max for s in stats) * 1000:.1f}ms")
+    print(f"overruns={sum(s.overruns for s in stats)}  cpu={cpu / wall:.0%} of one core")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--enclosures", type=int, default=1000)
+    ap.add_argument("--interval", type=float, default=5.0)
+    ap.add_argument("--seconds", type=float, default=30.0)
+    args = ap.parse_args()
+    asyncio.run(run(args.enclosures, args.interval, args.seconds))
+
+
+if __name__ == "__main__":
+    main()
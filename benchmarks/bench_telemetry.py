@@ -0,0 +1,60 @@
+"""
+Telemetry ring buffer: per-tick record cost and "last 24 h" query latency.
+
+    poetry run python benchmarks/bench_telemetry.py
+
+Fills a default TelemetryBuffer with several days of 5 s ticks for the four
+SIM devices, then times recording one tick and querying the last 24 h of
+light_day at each resolution.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from vivariumassistant.packages.core.device_state import StateRecord
+from vivariumassistant.packages.core.telemetry import TelemetryBuffer
+
+US = 1_000_000
+
+
+def states(k: int) -> dict[str, StateRecord]:
+    return {
+        "light_day": StateRecord("light_day", on=True, level=(k % 1000) / 1000),
+        "uvb": StateRecord("uvb", on=k % 2 == 0),
+        "mister": StateRecord("mister", on=False),
+        "waterfall": StateRecord("waterfall", on=False),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=float, default=3.0)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    buf = TelemetryBuffer()
+    ticks = int(args.days * 86400 / 5)
+    batch = [states(k) for k in range(1000)]
+
+    t0 = time.perf_counter()
+    for k in range(ticks):
+        buf.record_states(k * 5 * US, batch[k % 1000])
+    record_us = (time.perf_counter() - t0) / ticks * 1e6
+
+    end = ticks * 5 * US
+    since = end - 86400 * US
+    print(f"record one tick (4 channels): {record_us:8.2f} us")
+    print(f"memory ceiling per enclosure:  {buf.max_bytes(4) / 1024:8.0f} KiB")
+
+    for resolution in (None, "1m", "15m"):
+        t0 = time.perf_counter()
+        for _ in range(args.queries):
+            s = buf.series("light_day", since, resolution=resolution)
+        per = (time.perf_counter() - t0) / args.queries * 1e6
+        print(f"last 24h light_day [{s.resolution:>3}]: {per:8.2f} us  ({len(s)} points)")
+
+
+if __name__ == "__main__":
+    main()
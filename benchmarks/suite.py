@@ -0,0 +1,322 @@
+"""
+Benchmark suite: engine functions, state construction, logging and a full tick.
+
+    poetry run python benchmarks/suite.py --output results.json
+    poetry run python benchmarks/suite.py --save-baseline   # after an intended change
+
+Each case is timed in batches (auto-sized to ~0.1 s) and the best of
+--repeat batches is kept. Results are written as JSON. When a baseline exists
+(benchmarks/baseline.json by default) every case is compared against it and
+the run exits with status 1 if any case got slower than --threshold times its
+baseline.
+
+Timings are compared relative to a fixed pure-Python reference loop measured
+in the same run, so a baseline recorded on one machine stays meaningful on
+another; pass --absolute to compare raw nanoseconds instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from vivariumassistant.apps.agent.sim_agent import SimAgent
+from vivariumassistant.packages.core.clock import SimClock
+from vivariumassistant.packages.core.config_loader import load_profile
+from vivariumassistant.packages.core.device_state import DeviceState, StateRecord
+from vivariumassistant.packages.core.logging import JsonFormatter
+from vivariumassistant.packages.core.manual_override import ManualOverride
+from vivariumassistant.packages.drivers.i2c_relay import I2CRelayDriver
+from vivariumassistant.packages.drivers.pca9685 import PCA9685PWMDriver
+from vivariumassistant.packages.drivers.real_pwm_gpiozero import RealPWMDriverGpioZero
+from vivariumassistant.packages.engine.lighting import compute_daylight_level
+from vivariumassistant.packages.engine.mist import MistRuntime, mist_burst_due
+from vivariumassistant.packages.engine.override_resolution import apply_manual_overrides
+from vivariumassistant.packages.engine.schedule import CompiledSchedule
+from vivariumassistant.packages.engine.uvb import uvb_should_be_on
+from vivariumassistant.packages.simulator import fake_gpiozero, fake_smbus
+
+BASELINE = Path(__file__).with_name("baseline.json")
+REFERENCE = "reference_loop"
+
+TZ = "America/New_York"
+NOON = datetime(2026, 1, 15, 12, tzinfo=ZoneInfo(TZ))
+
+# run(loops) -> seconds spent doing `loops` operations
+Runner = Callable[[int], float]
+
+
+def sync_case(fn: Callable[[], object]) -> Runner:
+    def run(loops: int) -> float:
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        return time.perf_counter() - t0
+
+    return run
+
+
+def reference_loop() -> Runner:
+    def spin() -> int:
+        total = 0
+        for i in range(100):
+            total += i * i
+        return total
+
+    return sync_case(spin)
+
+
+def daylight() -> Runner:
+    lighting = load_profile("crested_gecko").lighting
+    return sync_case(lambda: compute_daylight_level(NOON, TZ, lighting))
+
+
+def uvb() -> Runner:
+    prof = load_profile("crested_gecko").uvb
+    assert prof is not None
+    return sync_case(lambda: uvb_should_be_on(NOON, TZ, prof))
+
+
+def mist() -> Runner:
+    prof = load_profile("crested_gecko").mist
+    assert prof is not None
+    rt = MistRuntime()
+    at = NOON.replace(hour=7, minute=30)  # a burst slot, so the full check runs
+    return sync_case(lambda: mist_burst_due(at, TZ, prof, rt))
+
+
+def mist_decision() -> Runner:
+    sched = CompiledSchedule(load_profile("crested_gecko"), TZ)
+    rt = MistRuntime()
+    rt.slots_done_through = NOON - timedelta(hours=4)
+    return sync_case(lambda: sched.mist_decision(NOON, rt))
+
+
+def manual_overrides() -> Runner:
+    desired = {
+        d: DeviceState(device_id=d, on=False) for d in ("light_day", "uvb", "mister", "waterfall")
+    }
+    overrides = {
+        "uvb": ManualOverride(
+            device_id="uvb",
+            state=DeviceState(device_id="uvb", on=True),
+            expires_at=NOON + timedelta(hours=1),
+        ),
+        "mister": ManualOverride(
+            device_id="mister",
+            state=DeviceState(device_id="mister", on=False),
+            expires_at=NOON - timedelta(hours=1),
+        ),
+    }
+    return sync_case(lambda: apply_manual_overrides(NOON, desired, overrides))
+
+
+def device_state() -> Runner:
+    return sync_case(lambda: DeviceState(device_id="light_day", on=True, level=0.42))
+
+
+def state_record() -> Runner:
+    return sync_case(lambda: StateRecord(device_id="light_day", on=True, level=0.42))
+
+
+def json_formatter() -> Runner:
+    formatter = JsonFormatter()
+    record = logging.LogRecord(
+        "vivariumassistant.agent", logging.INFO, __file__, 0, "control_tick", None, None
+    )
+    record.__dict__.update(
+        event="control_tick",
+        enclosure_id="enclosure_1",
+        desired={"light_day": {"device_id": "light_day", "on": True, "level": 0.42}},
+    )
+    return sync_case(lambda: formatter.format(record))
+
+
+def agent_tick() -> Runner:
+    """A full SIM tick: evaluate, overrides, diffed driver writes, metrics."""
+    clock = SimClock(NOON)
+    agent = SimAgent("enclosure_1", "crested_gecko", clock=clock)
+
+    async def ticks(loops: int) -> float:
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            await agent.tick()
+            clock.advance(5)
+        return time.perf_counter() - t0
+
+    loop = asyncio.new_event_loop()
+    return lambda loops: loop.run_until_complete(ticks(loops))
+
+
+def ramp_step() -> Runner:
+    """One 50 Hz iteration of the PWM ramp executor during the sunrise."""
+    clock = SimClock(NOON.replace(hour=8, minute=10))
+    agent = SimAgent("enclosure_1", "crested_gecko", clock=clock)
+    ramps = agent.enable_ramps(rate_hz=50)
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(agent.tick())
+
+    async def steps(loops: int) -> float:
+        t0 = time.perf_counter()
+        for i in range(loops):
+            # stay inside the ramp however many loops a batch runs
+            clock.advance(0.02 if i % 10_000 else -200)
+            await ramps.step()
+        return time.perf_counter() - t0
+
+    return lambda loops: loop.run_until_complete(steps(loops))
+
+
+def gpio_apply() -> Runner:
+    """A four-channel PWM batch through the hardware I/O worker (fake gpiozero pins)."""
+    pwm = RealPWMDriverGpioZero({ch: 18 + ch for ch in range(4)}, gpio=fake_gpiozero)
+
+    async def batches(loops: int) -> float:
+        t0 = time.perf_counter()
+        for i in range(loops):
+            level = (i % 256) / 255
+            await pwm.apply({ch: level for ch in range(4)})
+        fake_gpiozero.writes.clear()
+        return time.perf_counter() - t0
+
+    loop = asyncio.new_event_loop()
+    return lambda loops: loop.run_until_complete(batches(loops))
+
+
+def pca9685_apply() -> Runner:
+    """A four-channel PWM batch to a PCA9685 on the in-memory SMBus: one block write."""
+    pwm = PCA9685PWMDriver(fake_smbus.SMBus(1))
+
+    async def batches(loops: int) -> float:
+        t0 = time.perf_counter()
+        for i in range(loops):
+            level = (i % 4095 + 1) / 4096
+            await pwm.apply({ch: level for ch in range(4)})
+        fake_smbus.transactions.clear()
+        return time.perf_counter() - t0
+
+    loop = asyncio.new_event_loop()
+    return lambda loops: loop.run_until_complete(batches(loops))
+
+
+def i2c_relay_apply() -> Runner:
+    """Three relays switched through an I2C expander on the in-memory SMBus: one port write."""
+    relay = I2CRelayDriver(fake_smbus.SMBus(1), {1: 1, 2: 2, 3: 3}, active_low=True)
+
+    async def batches(loops: int) -> float:
+        t0 = time.perf_counter()
+        for i in range(loops):
+            on = bool(i % 2)
+            await relay.apply({1: on, 2: not on, 3: on})
+        fake_smbus.transactions.clear()
+        return time.perf_counter() - t0
+
+    loop = asyncio.new_event_loop()
+    return lambda loops: loop.run_until_complete(batches(loops))
+
+
+CASES: dict[str, Callable[[], Runner]] = {
+    REFERENCE: reference_loop,
+    "compute_daylight_level": daylight,
+    "uvb_should_be_on": uvb,
+    "mist_burst_due": mist,
+    "CompiledSchedule.mist_decision": mist_decision,
+    "apply_manual_overrides": manual_overrides,
+    "DeviceState": device_state,
+    "StateRecord": state_record,
+    "JsonFormatter.format": json_formatter,
+    "SimAgent.tick": agent_tick,
+    "RampExecutor.step": ramp_step,
+    "RealPWMDriverGpioZero.apply": gpio_apply,
+    "PCA9685PWMDriver.apply": pca9685_apply,
+    "I2CRelayDriver.apply": i2c_relay_apply,
+}
+
+
+def measure(run: Runner, repeat: int, target_seconds: float = 0.1) -> tuple[float, int]:
+    """Best ns/op over `repeat` batches, with the batch size grown to ~target_seconds."""
+    loops = 1
+    while (elapsed := run(loops)) < target_seconds / 10:
+        loops *= 10
+    loops = max(1, int(loops * target_seconds / max(elapsed, 1e-9)))
+    best = min(run(loops) for _ in range(repeat))
+    return best / loops * 1e9, loops
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+    key: str,
+) -> list[str]:
+    """Cases slower than threshold x baseline, formatted for the report."""
+    failed = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if name == REFERENCE or base is None or not base.get(key):
+            continue
+        ratio = result[key] / base[key]
+        if ratio > threshold:
+            failed.append(f"{name}: {ratio:.2f}x baseline (limit {threshold:.2f}x)")
+    return failed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", type=Path, default=None, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="overwrite the baseline")
+    parser.add_argument("--threshold", type=float, default=1.5, help="allowed slowdown factor")
+    parser.add_argument("--absolute", action="store_true", help="compare raw ns, not relative")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("-k", "--filter", default="", help="only cases containing this text")
+    args = parser.parse_args()
+
+    names = [n for n in CASES if n == REFERENCE or args.filter in n]
+    results: dict[str, dict[str, float]] = {}
+    for name in names:
+        ns, loops = measure(CASES[name](), args.repeat)
+        results[name] = {"ns_per_op": ns, "loops": loops}
+    ref = results[REFERENCE]["ns_per_op"]
+    for name, result in results.items():
+        result["relative"] = result["ns_per_op"] / ref
+        us = result["ns_per_op"] / 1000
+        print(f"{name:32s} {us:10.2f} us/op  {result['relative']:8.2f}x ref")
+
+    doc = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output is not None:
+        args.output.write_text(json.dumps(doc, indent=2) + "\n")
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(doc, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())["results"]
+    key = "ns_per_op" if args.absolute else "relative"
+    failed = compare(results, baseline, args.threshold, key)
+    for line in failed:
+        print(f"REGRESSION {line}")
+    if not failed:
+        print(f"no regressions against {args.baseline} ({key}, limit {args.threshold:.2f}x)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from vivariumassistant.apps.agent.fast_forward import FastForwardRunner
+from vivariumassistant.apps.agent.sim_agent import SimAgent
+from vivariumassistant.packages.core.clock import SimClock
+from vivariumassistant.packages.core.config_loader import load_enclosure
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser(description="Run the SIM agent on virtual time.")
+    ap.add_argument("--enclosure", default="enclosure_1")
+    ap.add_argument("--profile", default="crested_gecko")
+    ap.add_argument("--start", default="2026-01-01", help="local date YYYY-MM-DD")
+    ap.add_argument("--days", type=float, default=30)
+    ap.add_argument("--interval", type=float, default=5.0)
+    ap.add_argument("--event-driven", action="store_true")
+    args = ap.parse_args()
+
+    zone = ZoneInfo(load_enclosure(args.enclosure).timezone)
+    clock = SimClock(datetime.fromisoformat(args.start).replace(tzinfo=zone))
+    agent = SimAgent(args.enclosure, args.profile, clock=clock)
+
+    report = await FastForwardRunner(agent, clock).run_for(
+        timedelta(days=args.days),
+        interval_seconds=args.interval,
+        event_driven=args.event_driven,
+    )
+
+    print(f"ticks: {report.ticks} in {report.wall_seconds:.2f}s wall")
+    print(f"ticks/s: {report.ticks_per_second:,.0f}  speedup: {report.speedup:,.0f}x")
+    print(f"mist seconds used: {sum(agent.mist_rt.daily_seconds_used.values())}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
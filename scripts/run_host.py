@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+
+from vivariumassistant.apps.agent.host import AgentHost
+from vivariumassistant.apps.api.app import create_api
+from vivariumassistant.packages.core.config_loader import (
+    ENCLOSURES_DIR,
+    PROFILES_DIR,
+    default_store,
+)
+from vivariumassistant.packages.core.logging import setup_logging
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser(description="Run every enclosure in a directory on one loop.")
+    ap.add_argument("--enclosures", type=Path, default=ENCLOSURES_DIR)
+    ap.add_argument("--profiles", type=Path, default=PROFILES_DIR)
+    ap.add_argument("--interval", type=float, default=5.0)
+    ap.add_argument(
+        "--reload-seconds", type=float, default=None, help="poll profiles for changes this often"
+    )
+    ap.add_argument(
+        "--config-snapshot", type=Path, default=None, help="validated-config cache for fast start"
+    )
+    ap.add_argument(
+        "--checkpoint-dir", type=Path, default=None, help="keep runtime state here across restarts"
+    )
+    ap.add_argument(
+        "--api-port", type=int, default=None, help="serve metrics, state and history on this port"
+    )
+    ap.add_argument(
+        "--ramp-hz", type=float, default=None, help="interpolate light ramps at this rate"
+    )
+    args = ap.parse_args()
+
+    setup_logging()
+    if args.config_snapshot is not None:
+        default_store().load_snapshot(args.config_snapshot)
+    host = AgentHost.from_directory(
+        args.enclosures,
+        args.profiles,
+        interval_seconds=args.interval,
+        reload_seconds=args.reload_seconds,
+        telemetry=args.api_port is not None,
+        snapshots=args.api_port is not None,
+        checkpoint_dir=args.checkpoint_dir,
+        ramp_hz=args.ramp_hz,
+    )
+    if args.config_snapshot is not None:
+        default_store().save_snapshot(args.config_snapshot)
+    if args.api_port is None:
+        await host.run()
+        return
+
+    api = create_api(
+        host.metrics, snapshots=host.snapshots, history=host.telemetry, port=args.api_port
+    )
+    await api.start()
+    try:
+        await host.run()
+    finally:
+        await api.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,11 +1,49 @@
+import argparse
 import asyncio
+from pathlib import Path
+from vivariumassistant.apps.agent.checkpoint import AgentCheckpointer
 from vivariumassistant.apps.agent.sim_agent import SimAgent
+from vivariumassistant.apps.api.app import create_api
+from vivariumassistant.apps.api.snapshots import SnapshotHub
+from vivariumassistant.packages.core.telemetry import TelemetryBuffer
 from vivariumassistant.packages.core.logging import setup_logging
 
 async def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--event-driven", action="store_true", help="sleep until the next state change")
+    ap.add_argument(
+        "--api-port", type=int, default=None, help="serve metrics, state and history on this port"
+    )
+    ap.add_argument("--checkpoint", type=Path, default=None, help="keep runtime state in this file")
+    ap.add_argument(
+        "--ramp-hz", type=float, default=None, help="interpolate light ramps at this rate"
+    )
+    args = ap.parse_args()
+
     setup_logging()
     agent = SimAgent(enclosure_id="enclosure_1", profile_id="crested_gecko")
-    await agent.run(interval_seconds=5)
+    if args.checkpoint is not None:
+        agent.checkpoint = AgentCheckpointer(agent, args.checkpoint)
+        agent.checkpoint.restore()
+    if args.ramp_hz is not None:
+        agent.enable_ramps(args.ramp_hz)
+
+    api = None
+    if args.api_port is not None:
+        agent.snapshots = SnapshotHub()
+        agent.telemetry = TelemetryBuffer()
+        api = create_api(
+            lambda: {agent.enc.id: agent.metrics},
+            snapshots=agent.snapshots,
+            history=lambda enc_id: agent.telemetry if enc_id == agent.enc.id else None,
+            port=args.api_port,
+        )
+        await api.start()
+    try:
+        await agent.run(interval_seconds=5, event_driven=args.event_driven)
+    finally:
+        if api is not None:
+            await api.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
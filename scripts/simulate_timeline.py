@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from vivariumassistant.packages.core.config_loader import load_enclosure, load_profile
+from vivariumassistant.packages.engine.timeline import evaluate_timeline
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Evaluate a profile over a date range in one batch.")
+    ap.add_argument("--enclosure", default="enclosure_1")
+    ap.add_argument("--profile", default="crested_gecko")
+    ap.add_argument("--start", default=None, help="YYYY-MM-DD (default: Jan 1 this year)")
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--step-seconds", type=float, default=1.0)
+    args = ap.parse_args()
+
+    enc = load_enclosure(args.enclosure)
+    prof = load_profile(args.profile)
+    zone = ZoneInfo(enc.timezone)
+
+    start = (
+        datetime.fromisoformat(args.start).replace(tzinfo=zone)
+        if args.start
+        else datetime(datetime.now(tz=zone).year, 1, 1, tzinfo=zone)
+    )
+    end = start + timedelta(days=args.days)
+    step = timedelta(seconds=args.step_seconds)
+
+    t0 = time.perf_counter()
+    tl = evaluate_timeline(prof, enc.timezone, start, end, step)
+    elapsed = time.perf_counter() - t0
+
+    step_h = args.step_seconds / 3600.0
+    print(f"samples: {len(tl)} in {elapsed:.2f}s")
+    print(f"light dose (level-hours/day): {tl.light.sum() * step_h / args.days:.2f}")
+    print(f"uvb hours/day: {tl.uvb.sum() * step_h / args.days:.2f}")
+    print(f"mist bursts: {int((tl.mist_seconds > 0).sum())}, seconds: {int(tl.mist_seconds.sum())}")
+
+
+if __name__ == "__main__":
+    main()
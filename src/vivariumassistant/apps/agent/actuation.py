@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+from datetime import datetime, timedelta
+
+from vivariumassistant.packages.core.clock import Clock
+from vivariumassistant.packages.drivers.base import RelayDriver
+
+logger = logging.getLogger("vivariumassistant.actuation")
+
+Action = Callable[[], Awaitable[None]]
+
+
+def pulse_key(relay: RelayDriver, channel: int) -> Hashable:
+    return (id(relay), channel)
+
+
+class PendingAction:
+    """Handle for a scheduled action; cancelled entries are skipped lazily."""
+
+    __slots__ = ("due", "key", "action", "cancelled")
+
+    def __init__(self, due: datetime, key: Hashable, action: Action) -> None:
+        self.due = due
+        self.key = key
+        self.action = action
+        self.cancelled = False
+
+
+class ActuationScheduler:
+    """
+    Deadline-based timed actuation.
+
+    A pulse turns a relay on immediately and registers an off-deadline; a heap
+    of pending deadlines is drained by fire_due(), either from the timer task
+    (start()/run(), real time) or by whoever drives virtual time. Scheduling
+    never waits, so a tick's latency does not depend on pulses in flight.
+
+    At most one action is pending per key: scheduling again replaces it.
+    """
+
+    def __init__(self, clock: Clock) -> None:
+        self.clock = clock
+        self._heap: list[tuple[datetime, int, PendingAction]] = []
+        self._by_key: dict[Hashable, PendingAction] = {}
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    def schedule(self, due: datetime, key: Hashable, action: Action) -> PendingAction:
+        self.cancel(key)
+        pending = PendingAction(due, key, action)
+        self._by_key[key] = pending
+        heapq.heappush(self._heap, (due, next(self._seq), pending))
+        self._wakeup.set()
+        return pending
+
+    def cancel(self, key: Hashable) -> bool:
+        pending = self._by_key.pop(key, None)
+        if pending is None:
+            return False
+        pending.cancelled = True
+        return True
+
+    def pending(self, key: Hashable) -> PendingAction | None:
+        return self._by_key.get(key)
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def next_deadline(self) -> datetime | None:
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    async def pulse(
+        self,
+        relay: RelayDriver,
+        channel: int,
+        seconds: float,
+        now: datetime | None = None,
+    ) -> PendingAction:
+        """Turn `channel` on now and off after `seconds` (extends a running pulse)."""
+        start = now or self.clock.now()
+        await relay.set_on(channel, True)
+
+        async def _off() -> None:
+            await relay.set_on(channel, False)
+
+        return self.schedule(start + timedelta(seconds=seconds), pulse_key(relay, channel), _off)
+
+    async def fire_due(self, now: datetime | None = None) -> int:
+        """Run every action whose deadline is <= now. Returns how many ran."""
+        now = now or self.clock.now()
+        fired = 0
+        while (deadline := self.next_deadline()) is not None and deadline <= now:
+            _, _, pending = heapq.heappop(self._heap)
+            del self._by_key[pending.key]
+            await self._run(pending)
+            fired += 1
+        return fired
+
+    def start(self) -> None:
+        """Start the real-time timer task (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(), name="actuation-timer")
+
+    async def run(self) -> None:
+        while True:
+            deadline = self.next_deadline()
+            timeout = (
+                None
+                if deadline is None
+                else max(0.0, (deadline - self.clock.now()).total_seconds())
+            )
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except TimeoutError:
+                pass
+            await self.fire_due()
+
+    async def close(self) -> None:
+        """
+        Stop the timer task and run every pending action now.
+
+        Pending actions are off-deadlines, so running them early is the safe
+        shutdown: nothing is left energised because its timer was cancelled.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        pending = sorted(
+            (entry for entry in self._heap if not entry[2].cancelled),
+            key=lambda entry: (entry[0], entry[1]),
+        )
+        self._heap.clear()
+        self._by_key.clear()
+        for _, _, p in pending:
+            await self._run(p)
+
+    async def _run(self, pending: PendingAction) -> None:
+        try:
+            await pending.action()
+        except Exception:
+            logger.exception("actuation_failed", extra={"event": "actuation_failed"})
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from vivariumassistant.apps.agent.sim_agent import SimAgent
+from vivariumassistant.packages.engine.override_store import OverrideStore
+
+logger = logging.getLogger("vivariumassistant.checkpoint")
+
+CHECKPOINT_VERSION = 1
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Replace `path` with `data`; a crash leaves either the old or the new file."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_checkpoint(path: Path) -> dict[str, Any] | None:
+    """A checkpoint document, or None if missing, unreadable or another version."""
+    try:
+        doc = json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(doc, dict) or doc.get("version") != CHECKPOINT_VERSION:
+        return None
+    return doc
+
+
+def _iso(dt: datetime | None) -> str | None:
+    return dt.isoformat() if dt is not None else None
+
+
+def _dt(s: str | None) -> datetime | None:
+    return datetime.fromisoformat(s) if s is not None else None
+
+
+def capture(agent: SimAgent, *, include_global: bool = True) -> dict[str, Any]:
+    """
+    Runtime state of one agent as a JSON-ready document.
+
+    Global overrides are only included with include_global (a host saves its
+    shared ones once, not per agent).
+    """
+    rt = agent.mist_rt
+    levels, switches = agent.applied
+    doc: dict[str, Any] = {
+        "version": CHECKPOINT_VERSION,
+        "enclosure_id": agent.enc.id,
+        "mist": {
+            "last_burst_at": _iso(rt.last_burst_at),
+            "daily_seconds_used": rt.daily_seconds_used,
+            "slots_done_through": _iso(rt.slots_done_through),
+        },
+        "overrides": agent.overrides.dump(agent.enc.id),
+        "applied": {
+            "levels": {str(ch): v for ch, v in levels.items()},
+            "switches": {str(ch): v for ch, v in switches.items()},
+        },
+    }
+    if include_global:
+        doc["global_overrides"] = agent.overrides.dump(None)
+    return doc
+
+
+def restore(agent: SimAgent, doc: dict[str, Any], *, trust_applied: bool = False) -> None:
+    """
+    Load a capture() document into a freshly built agent.
+
+    Mist spacing, daily usage and handled bursts carry over, so a burst that
+    already ran is not repeated after a restart. Overrides that have expired
+    in the meantime are dropped on the first tick. Last-applied channel values
+    are only restored with trust_applied, for outputs that keep their state
+    while the agent is down; otherwise the first tick rewrites every channel.
+    """
+    mist = doc["mist"]
+    rt = agent.mist_rt
+    rt.last_burst_at = _dt(mist["last_burst_at"])
+    rt.daily_seconds_used = {k: int(v) for k, v in mist["daily_seconds_used"].items()}
+    done = _dt(mist["slots_done_through"])
+    # the saved mark may predate the last burst; never re-offer a burst that ran
+    if rt.last_burst_at is not None and (done is None or done < rt.last_burst_at):
+        done = rt.last_burst_at
+    rt.slots_done_through = done
+    # cached rule outputs were computed from the runtime state just replaced
+    agent.graph.invalidate()
+
+    agent.overrides.load(agent.enc.id, doc["overrides"])
+    if "global_overrides" in doc:
+        agent.overrides.load(None, doc["global_overrides"])
+
+    if trust_applied:
+        applied = doc["applied"]
+        agent.assume_applied(
+            {int(ch): float(v) for ch, v in applied["levels"].items()},
+            {int(ch): bool(v) for ch, v in applied["switches"].items()},
+        )
+
+
+class AgentCheckpointer:
+    """
+    Keeps one agent's checkpoint file up to date.
+
+    flush() is cheap enough to await after every tick. It writes the file
+    right away when a mist burst or an override changed, because losing those
+    could repeat a burst or drop an override. Changes to applied channel values
+    (a light ramp, say) are written at most every `min_interval_seconds`.
+    Unchanged state is never rewritten, so the file sees a handful of small
+    writes a day instead of one per tick. The write itself (with fsync) runs in
+    a worker thread so a slow SD card does not stall the loop.
+    """
+
+    def __init__(
+        self,
+        agent: SimAgent,
+        path: Path,
+        *,
+        min_interval_seconds: float = 60.0,
+        include_global: bool = True,
+        trust_applied: bool = False,
+    ) -> None:
+        self.agent = agent
+        self.path = path
+        self.min_interval_seconds = min_interval_seconds
+        self.include_global = include_global
+        self.trust_applied = trust_applied
+        self.writes = 0
+        self._key: tuple[Any, ...] | None = None
+        self._applied: tuple[Any, ...] | None = None
+        self._data: bytes | None = None
+        self._saved_at: datetime | None = None
+
+    def restore(self) -> bool:
+        """Load the checkpoint file into the agent, if there is a usable one."""
+        doc = read_checkpoint(self.path)
+        if doc is None or doc.get("enclosure_id") != self.agent.enc.id:
+            return False
+        try:
+            restore(self.agent, doc, trust_applied=self.trust_applied)
+        except (KeyError, TypeError, ValueError):
+            logger.exception(
+                "checkpoint_restore_failed",
+                extra={"event": "checkpoint_restore_failed", "path": str(self.path)},
+            )
+            return False
+        self._key = self._critical_key()
+        self._applied = self._applied_key()
+        return True
+
+    def collect(self, now: datetime) -> bytes | None:
+        """Encoded checkpoint if something worth keeping changed since the last one."""
+        key = self._critical_key()
+        applied = self._applied_key()
+        if key == self._key:
+            if applied == self._applied:
+                return None
+            if (
+                self._saved_at is not None
+                and (now - self._saved_at).total_seconds() < self.min_interval_seconds
+            ):
+                return None
+        self._key, self._applied = key, applied
+        self._saved_at = now
+        return self._encode(now)
+
+    def maybe_save(self, now: datetime) -> bool:
+        data = self.collect(now)
+        if data is None:
+            return False
+        self._write(data)
+        return True
+
+    async def flush(self, now: datetime) -> bool:
+        data = self.collect(now)
+        if data is None:
+            return False
+        try:
+            await asyncio.to_thread(write_atomic, self.path, data)
+        except OSError:
+            self._forget()
+            raise
+        return True
+
+    def save(self) -> bool:
+        """Write the current state now (e.g. at shutdown) unless the file already holds it."""
+        data = self._encode(self.agent.clock.now())
+        if data is None:
+            return False
+        self._write(data)
+        return True
+
+    def _write(self, data: bytes) -> None:
+        try:
+            write_atomic(self.path, data)
+        except OSError:
+            self._forget()
+            raise
+
+    def _forget(self) -> None:
+        # the file does not hold what we think it does: write again next time
+        self._key = self._applied = self._data = None
+
+    def _encode(self, now: datetime) -> bytes | None:
+        self.agent.mist_rt.prune(now)
+        doc = capture(self.agent, include_global=self.include_global)
+        data = json.dumps(doc, separators=(",", ":")).encode()
+        if data == self._data:
+            return None
+        self._data = data
+        self.writes += 1
+        return data
+
+    def _critical_key(self) -> tuple[Any, ...]:
+        return (self.agent.mist_rt.last_burst_at, self.agent.overrides.version)
+
+    def _applied_key(self) -> tuple[Any, ...]:
+        levels, switches = self.agent.applied
+        return tuple(levels.items()), tuple(switches.items())
+
+
+class GlobalOverrideCheckpointer:
+    """A host's global overrides (shared by all its agents), saved when they change."""
+
+    def __init__(self, store: OverrideStore, path: Path) -> None:
+        self.store = store
+        self.path = path
+        # store version the file holds, and the one a flush() is writing
+        self._version: int | None = None
+        self._writing: int | None = None
+
+    def restore(self) -> bool:
+        doc = read_checkpoint(self.path)
+        if doc is None:
+            return False
+        self.store.load(None, doc.get("overrides", []))
+        self._version = self.store.version
+        return True
+
+    def collect(self) -> tuple[int, bytes] | None:
+        """The store's version and encoded overrides, or None if already saved (or saving)."""
+        version = self.store.version
+        if version == self._version or version == self._writing:
+            return None
+        doc = {"version": CHECKPOINT_VERSION, "overrides": self.store.dump(None)}
+        return version, json.dumps(doc, separators=(",", ":")).encode()
+
+    async def flush(self) -> bool:
+        """Write changed overrides from a worker thread (the tick path)."""
+        collected = self.collect()
+        if collected is None:
+            return False
+        version, data = collected
+        self._writing = version
+        try:
+            await asyncio.to_thread(write_atomic, self.path, data)
+        finally:
+            self._writing = None
+        # only once it is on disk, so a failed write is retried
+        self._version = version
+        return True
+
+    def maybe_save(self) -> bool:
+        """Write changed overrides now, blocking (e.g. at shutdown)."""
+        collected = self.collect()
+        if collected is None:
+            return False
+        version, data = collected
+        write_atomic(self.path, data)
+        self._version = version
+        return True
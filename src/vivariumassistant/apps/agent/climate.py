@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime
+
+from vivariumassistant.apps.agent.sim_agent import SimAgent
+from vivariumassistant.packages.simulator.physics import ClimateBatch, ClimateParams
+from vivariumassistant.packages.simulator.sensor import SimSensorDriver
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+# device kinds that drive the model (others, e.g. uvb or pump, do not)
+_PWM_KINDS = {"light"}
+_RELAY_KINDS = {"heat", "fan", "mist"}
+
+
+class AgentClimate:
+    """
+    Close the loop for SIM agents: read what each agent's drivers are doing,
+    step one ClimateBatch for all of them, and feed the result to their
+    simulated sensors.
+
+    Outputs are treated as held since the previous advance_to(), so call it
+    before anything changes them (FastForwardRunner does, at the top of each
+    iteration, before actuation deadlines and ticks run).
+    """
+
+    def __init__(self, agents: Sequence[SimAgent], params: ClimateParams | None = None) -> None:
+        self.agents = list(agents)
+        self.batch = ClimateBatch(len(self.agents), params)
+        self._last: datetime | None = None
+
+        # per agent: (kind, channel) for the devices the model cares about, with
+        # the channels the agent itself drives (its per-kind defaults included)
+        self._outputs = [
+            [
+                (kind, ch)
+                for _, kind, ch in agent.outputs
+                if kind in _PWM_KINDS or kind in _RELAY_KINDS
+            ]
+            for agent in self.agents
+        ]
+        self._sensors = [
+            [s for s in agent.sensors.values() if isinstance(s, SimSensorDriver)]
+            for agent in self.agents
+        ]
+
+    async def advance_to(self, now: datetime) -> None:
+        if self._last is None:
+            self._last = now
+            self.batch.feed(self._sensors)
+            return
+        dt = (now - self._last).total_seconds()
+        if dt <= 0:
+            return
+        self._last = now
+
+        n = len(self.agents)
+        levels = {k: np.zeros(n) for k in ("light", "heat", "fan", "mist")}
+        for i, (agent, outputs) in enumerate(zip(self.agents, self._outputs)):
+            for kind, ch in outputs:
+                if kind in _PWM_KINDS:
+                    value = await agent.pwm.get_level(ch)
+                else:
+                    value = 1.0 if await agent.relay.get_on(ch) else 0.0
+                levels[kind][i] = max(levels[kind][i], value)
+
+        self.batch.step(
+            dt,
+            light=levels["light"],
+            heat=levels["heat"],
+            fan=levels["fan"],
+            mist_seconds=levels["mist"] * dt,
+        )
+        self.batch.feed(self._sensors)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from vivariumassistant.apps.agent.sim_agent import SimAgent
+from vivariumassistant.packages.core.clock import SimClock
+from vivariumassistant.packages.core.device_state import StateRecord
+
+if TYPE_CHECKING:
+    from vivariumassistant.apps.agent.climate import AgentClimate
+
+TickCallback = Callable[[datetime, dict[str, StateRecord]], None]
+
+
+@dataclass(frozen=True)
+class RunReport:
+    ticks: int
+    simulated_seconds: float
+    wall_seconds: float
+
+    @property
+    def ticks_per_second(self) -> float:
+        return self.ticks / self.wall_seconds if self.wall_seconds > 0 else float("inf")
+
+    @property
+    def speedup(self) -> float:
+        """Simulated seconds per wall-clock second."""
+        return self.simulated_seconds / self.wall_seconds if self.wall_seconds > 0 else float("inf")
+
+
+class FastForwardRunner:
+    """
+    Drive a SimAgent on virtual time.
+
+    The agent must have been built with this SimClock. Sleeping advances the
+    clock instead of waiting, straight to the next tick, actuation deadline or
+    sensor poll, so days of control loop run as fast as the ticks
+    themselves execute.
+    """
+
+    def __init__(
+        self, agent: SimAgent, clock: SimClock, *, climate: AgentClimate | None = None
+    ) -> None:
+        if agent.clock is not clock:
+            raise ValueError("agent must be constructed with the runner's SimClock")
+        self.agent = agent
+        self.clock = clock
+        # optional physics feeding the agent's simulated sensors
+        self.climate = climate
+
+    async def run_for(
+        self,
+        duration: timedelta,
+        *,
+        interval_seconds: float = 5.0,
+        event_driven: bool = False,
+        max_sleep_seconds: float = 300.0,
+        on_tick: TickCallback | None = None,
+    ) -> RunReport:
+        """Tick until `duration` of virtual time has passed; no per-tick logging."""
+        start = self.clock.now()
+        end = start + duration
+        max_sleep = timedelta(seconds=max_sleep_seconds)
+        ticks = 0
+
+        actuator = self.agent.actuator
+        poller = self.agent.poller
+        next_tick = start
+
+        t0 = time.perf_counter()
+        while self.clock.now() < end:
+            if self.climate is not None:
+                await self.climate.advance_to(self.clock.now())
+            # pulse deadlines between ticks fire at their exact virtual instant
+            await actuator.fire_due(self.clock.now())
+            await poller.poll_due(self.clock.now())
+
+            if self.clock.now() >= next_tick:
+                now, desired = await self.agent.tick()
+                ticks += 1
+                if on_tick is not None:
+                    on_tick(now, desired)
+
+                if event_driven:
+                    next_tick = self.agent.next_wakeup(now, max_sleep)
+                else:
+                    next_tick = now + timedelta(seconds=interval_seconds)
+
+            target = min(next_tick, end)
+            for deadline in (actuator.next_deadline(), poller.next_due()):
+                if deadline is not None:
+                    target = min(target, deadline)
+            await self.clock.sleep((target - self.clock.now()).total_seconds())
+        wall = time.perf_counter() - t0
+
+        return RunReport(
+            ticks=ticks,
+            simulated_seconds=(self.clock.now() - start).total_seconds(),
+            wall_seconds=wall,
+        )
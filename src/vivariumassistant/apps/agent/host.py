@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from vivariumassistant.apps.agent.checkpoint import AgentCheckpointer, GlobalOverrideCheckpointer
+from vivariumassistant.apps.agent.sim_agent import SimAgent
+from vivariumassistant.apps.api.snapshots import SnapshotHub
+from vivariumassistant.packages.core.config_loader import (
+    PROFILES_DIR,
+    default_store,
+    load_enclosure_dir,
+    load_profile_file,
+)
+from vivariumassistant.packages.core.config_schema import ProfileConfig
+from vivariumassistant.packages.core.config_store import ConfigStore
+from vivariumassistant.packages.core.metrics import TickMetrics
+from vivariumassistant.packages.core.telemetry import TelemetryBuffer
+from vivariumassistant.packages.engine.override_store import OverrideStore
+from vivariumassistant.packages.engine.schedule import CompiledSchedule
+
+logger = logging.getLogger("vivariumassistant.host")
+
+
+class AgentHost:
+    """
+    Run many enclosures' agents concurrently on one asyncio loop.
+
+    Each agent gets its own task. Start times are staggered evenly across one
+    interval so ticks are spread out instead of all waking together.
+    """
+
+    def __init__(
+        self,
+        agents: list[SimAgent],
+        *,
+        interval_seconds: float = 5.0,
+        log_ticks: bool = True,
+        reload_seconds: float | None = None,
+        telemetry: bool = False,
+        snapshots: bool = False,
+        checkpoint_dir: Path | None = None,
+        ramp_hz: float | None = None,
+    ) -> None:
+        ids = [a.enc.id for a in agents]
+        if len(set(ids)) != len(ids):
+            raise ValueError("enclosure ids must be unique within a host")
+
+        self.agents = {a.enc.id: a for a in agents}
+        self.interval_seconds = interval_seconds
+        self.log_ticks = log_ticks
+
+        # one store for the whole host, so group overrides span enclosures
+        self.overrides = OverrideStore()
+        # what the API serves, published by every agent once per tick
+        self.snapshots = SnapshotHub() if snapshots else None
+        for agent in agents:
+            agent.overrides = self.overrides
+            agent.snapshots = self.snapshots
+            if telemetry and agent.telemetry is None:
+                agent.telemetry = TelemetryBuffer()
+            if ramp_hz is not None and agent.ramps is None:
+                agent.enable_ramps(ramp_hz)
+
+        # runtime state survives restarts: one file per enclosure plus the global overrides
+        self.global_checkpoint: GlobalOverrideCheckpointer | None = None
+        if checkpoint_dir is not None:
+            self._restore_checkpoints(checkpoint_dir)
+
+        # profile hot reload: poll the config store every reload_seconds
+        self.reload_seconds = reload_seconds
+        self.profile_paths: dict[str, Path] = {}  # enclosure id -> profile file
+
+    @classmethod
+    def from_directory(
+        cls,
+        enclosure_dir: Path,
+        profile_dir: Path = PROFILES_DIR,
+        **kwargs,
+    ) -> AgentHost:
+        """One agent per enclosure YAML; each must name its `profile`."""
+        profiles: dict[str, ProfileConfig] = {}
+        schedules: dict[tuple[str, str], CompiledSchedule] = {}
+        agents: list[SimAgent] = []
+        paths: dict[str, Path] = {}
+
+        for enc in load_enclosure_dir(enclosure_dir):
+            if not enc.profile:
+                raise ValueError(f"enclosure {enc.id!r} does not set a profile")
+            path = profile_dir / f"{enc.profile}.yaml"
+            if enc.profile not in profiles:
+                profiles[enc.profile] = load_profile_file(path)
+            paths[enc.id] = Path(os.path.abspath(path))
+            prof = profiles[enc.profile]
+
+            key = (enc.profile, enc.timezone)
+            if key not in schedules:
+                schedules[key] = CompiledSchedule(prof, enc.timezone)
+            agents.append(SimAgent.from_config(enc, prof, schedule=schedules[key]))
+
+        host = cls(agents, **kwargs)
+        host.profile_paths = paths
+        return host
+
+    def _restore_checkpoints(self, directory: Path) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        t0 = time.perf_counter()
+        self.global_checkpoint = GlobalOverrideCheckpointer(
+            self.overrides, directory / "_global.json"
+        )
+        self.global_checkpoint.restore()
+        restored = 0
+        for enc_id, agent in self.agents.items():
+            agent.checkpoint = AgentCheckpointer(
+                agent, directory / f"{enc_id}.json", include_global=False
+            )
+            restored += agent.checkpoint.restore()
+        logger.info(
+            "checkpoint_restored",
+            extra={
+                "event": "checkpoint_restored",
+                "enclosures": restored,
+                "elapsed_ms": round((time.perf_counter() - t0) * 1000, 2),
+            },
+        )
+
+    def phase_offset(self, index: int) -> float:
+        return self.interval_seconds * index / max(len(self.agents), 1)
+
+    def latency_report(self) -> dict[str, dict[str, float | int]]:
+        return {enc_id: agent.metrics.as_dict() for enc_id, agent in self.agents.items()}
+
+    def metrics(self) -> dict[str, TickMetrics]:
+        return {enc_id: agent.metrics for enc_id, agent in self.agents.items()}
+
+    def telemetry(self, enclosure_id: str) -> TelemetryBuffer | None:
+        agent = self.agents.get(enclosure_id)
+        return agent.telemetry if agent is not None else None
+
+    async def run(self) -> None:
+        for agent in self.agents.values():
+            agent.actuator.start()
+            agent.poller.start()
+            if agent.ramps is not None:
+                agent.ramps.start()
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for i, agent in enumerate(self.agents.values()):
+                    tg.create_task(
+                        self._run_agent(agent, self.phase_offset(i)),
+                        name=f"agent:{agent.enc.id}",
+                    )
+                if self.reload_seconds:
+                    tg.create_task(self._watch_profiles(self.reload_seconds), name="config-reload")
+        finally:
+            for agent in self.agents.values():
+                if agent.ramps is not None:
+                    await agent.ramps.close()
+                await agent.poller.close()
+                await agent.actuator.close()
+                await agent.drivers.close()
+                if agent.checkpoint is not None:
+                    agent.checkpoint.save()
+            if self.global_checkpoint is not None:
+                self.global_checkpoint.maybe_save()
+
+    async def _run_agent(self, agent: SimAgent, offset: float) -> None:
+        interval = timedelta(seconds=self.interval_seconds)
+        metrics = agent.metrics
+
+        await agent.clock.sleep(offset)
+        slot = agent.clock.now()
+
+        while True:
+            metrics.drift.observe(max(0.0, (agent.clock.now() - slot).total_seconds()))
+            try:
+                now, desired = await agent.tick()
+            except Exception:
+                # one broken enclosure must not take the others down
+                logger.exception(
+                    "tick_failed", extra={"event": "tick_failed", "enclosure_id": agent.enc.id}
+                )
+            else:
+                if self.log_ticks:
+                    agent.log_tick(now, desired, tick_interval_seconds=self.interval_seconds)
+                await self._checkpoint(agent, now)
+
+            slot += interval
+            now = agent.clock.now()
+            if now >= slot:
+                # fell behind: skip to the next future slot rather than bursting
+                missed = (now - slot) // interval + 1
+                metrics.overruns += missed
+                slot += interval * missed
+            await agent.clock.sleep((slot - now).total_seconds())
+
+    async def _checkpoint(self, agent: SimAgent, now: datetime) -> None:
+        try:
+            if agent.checkpoint is not None:
+                await agent.checkpoint.flush(now)
+            if self.global_checkpoint is not None:
+                await self.global_checkpoint.flush()
+        except OSError:
+            logger.exception(
+                "checkpoint_write_failed",
+                extra={"event": "checkpoint_write_failed", "enclosure_id": agent.enc.id},
+            )
+
+    def reload_profiles(self, store: ConfigStore | None = None) -> list[str]:
+        """
+        Poll the config store and stage changed profiles into their agents.
+
+        Agents pick the new profile up at the start of their next tick. One
+        compiled schedule is shared per (profile, timezone), as at startup.
+        Returns the ids of the enclosures that were updated.
+        """
+        store = store or default_store()
+        changed = set(store.poll())
+        if not changed:
+            return []
+
+        schedules: dict[tuple[Path, str], CompiledSchedule] = {}
+        updated: list[str] = []
+        for enc_id, path in self.profile_paths.items():
+            if path not in changed:
+                continue
+            agent = self.agents[enc_id]
+            prof = store.profile(path)
+            key = (path, agent.enc.timezone)
+            if key not in schedules:
+                schedules[key] = CompiledSchedule(prof, agent.enc.timezone)
+            agent.stage_profile(prof, schedules[key])
+            updated.append(enc_id)
+
+        if updated:
+            logger.info(
+                "profile_reloaded",
+                extra={
+                    "event": "profile_reloaded",
+                    "paths": sorted(str(p) for p in changed),
+                    "enclosure_ids": updated,
+                },
+            )
+        return updated
+
+    async def _watch_profiles(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            # a stat() per cached file; parsing only happens when one changed
+            try:
+                self.reload_profiles()
+            except Exception:
+                logger.exception("profile_reload_failed", extra={"event": "profile_reload_failed"})
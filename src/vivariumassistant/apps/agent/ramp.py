@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+
+from vivariumassistant.packages.core.clock import Clock
+from vivariumassistant.packages.engine.context import to_epoch_us
+from vivariumassistant.packages.engine.schedule import Ramp
+
+logger = logging.getLogger("vivariumassistant.ramp")
+
+# writes {channel: level} to the PWM driver
+LevelWriter = Callable[[dict[int, float]], Awaitable[None]]
+
+
+class RampExecutor:
+    """
+    Smooth PWM ramps between control ticks.
+
+    The agent hands over the linear segment a light is on (follow()). The
+    executor's own task then interpolates that channel at up to `rate_hz` and
+    writes it, without running a tick. A channel is only written when its
+    level reaches another 1/resolution step, so a 45-minute sunrise costs one
+    write per PWM step, not `rate_hz` writes a second. When a ramp ends, its
+    end level is written and the channel goes back to the tick. With no ramp
+    to follow the task just waits.
+    """
+
+    def __init__(
+        self,
+        clock: Clock,
+        write: LevelWriter,
+        *,
+        rate_hz: float = 50.0,
+        resolution: int = 256,
+    ) -> None:
+        if rate_hz <= 0:
+            raise ValueError("rate_hz must be > 0")
+        self.clock = clock
+        self.period = 1.0 / rate_hz
+        self.resolution = resolution
+        self.writes = 0  # channels written
+        self._write = write
+        self._ramps: dict[int, Ramp] = {}
+        self._steps: dict[int, int] = {}  # last written step per channel
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    def follow(self, channel: int, ramp: Ramp | None) -> None:
+        """Interpolate `channel` along `ramp` from now on; None releases it."""
+        if ramp is None:
+            self.release(channel)
+            return
+        if self._ramps.get(channel) != ramp:
+            self._ramps[channel] = ramp
+            self._steps.pop(channel, None)
+            self._wakeup.set()
+
+    def release(self, channel: int) -> None:
+        self._ramps.pop(channel, None)
+        self._steps.pop(channel, None)
+
+    def following(self, channel: int) -> bool:
+        return channel in self._ramps
+
+    def __len__(self) -> int:
+        return len(self._ramps)
+
+    async def step(self, now: datetime | None = None) -> int:
+        """Write every followed channel whose step changed by `now`. Returns how many."""
+        if not self._ramps:
+            return 0
+        t = to_epoch_us(now or self.clock.now())
+        levels: dict[int, float] = {}
+        for ch, ramp in list(self._ramps.items()):
+            if t >= ramp.end:
+                levels[ch] = ramp.end_level
+                self.release(ch)
+                continue
+            level = ramp.level_at(t)
+            step = int(level * self.resolution)
+            if self._steps.get(ch) != step:
+                self._steps[ch] = step
+                levels[ch] = level
+        if not levels:
+            return 0
+        try:
+            await self._write(levels)
+        except Exception:
+            # forget the steps so the next iteration tries again
+            for ch in levels:
+                self._steps.pop(ch, None)
+            logger.exception("ramp_write_failed", extra={"event": "ramp_write_failed"})
+            return 0
+        self.writes += len(levels)
+        return len(levels)
+
+    @property
+    def running(self) -> bool:
+        """Whether the interpolation task runs (FastForwardRunner never starts it)."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the interpolation task (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(), name="pwm-ramps")
+
+    async def run(self) -> None:
+        while True:
+            if not self._ramps:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            await self.step()
+            await asyncio.sleep(self.period)
+
+    async def close(self) -> None:
+        """Stop the task; channels keep their last written level."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._ramps.clear()
+        self._steps.clear()
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from vivariumassistant.packages.core.clock import Clock
+from vivariumassistant.packages.drivers.base import SensorDriver, SensorReading
+
+logger = logging.getLogger("vivariumassistant.sensors")
+
+ReadingCallback = Callable[[str, datetime, SensorReading], None]
+
+
+@dataclass(frozen=True, slots=True)
+class Observation:
+    """Latest good reading of one sensor, as seen at `now`."""
+
+    sensor_id: str
+    reading: SensorReading
+    at: datetime
+    stale: bool
+
+
+class _Sensor:
+    __slots__ = ("driver", "interval", "next_due", "reading", "at", "failures")
+
+    def __init__(self, driver: SensorDriver, interval: timedelta) -> None:
+        self.driver = driver
+        self.interval = interval
+        self.next_due: datetime | None = None  # None = poll as soon as possible
+        self.reading: SensorReading | None = None
+        self.at: datetime | None = None
+        self.failures = 0  # consecutive
+
+
+class SensorPoller:
+    """
+    Poll every sensor on its own cadence and cache the latest reading.
+
+    Reads run in the poller's tasks (one per sensor, so a slow or hung bus
+    only delays its own sensor), each bounded by `timeout_seconds`. Ticks only
+    look at the cache: latest()/snapshot() never wait on a bus. A reading older
+    than `stale_after` (default: three poll intervals) is reported stale, which
+    is also what a sensor that keeps failing turns into.
+    """
+
+    def __init__(
+        self,
+        sensors: Mapping[str, SensorDriver],
+        clock: Clock,
+        *,
+        interval_seconds: float | Mapping[str, float] = 10.0,
+        timeout_seconds: float = 2.0,
+        stale_after_seconds: float | None = None,
+        on_reading: ReadingCallback | None = None,
+    ) -> None:
+        self.clock = clock
+        self.timeout_seconds = timeout_seconds
+        self.on_reading = on_reading
+
+        def interval(sensor_id: str) -> float:
+            if isinstance(interval_seconds, Mapping):
+                return float(interval_seconds.get(sensor_id, 10.0))
+            return float(interval_seconds)
+
+        self._sensors = {
+            sid: _Sensor(driver, timedelta(seconds=interval(sid))) for sid, driver in sensors.items()
+        }
+        self._stale_after = {
+            sid: timedelta(seconds=stale_after_seconds)
+            if stale_after_seconds is not None
+            else s.interval * 3
+            for sid, s in self._sensors.items()
+        }
+        self._tasks: list[asyncio.Task[None]] = []
+
+    def __len__(self) -> int:
+        return len(self._sensors)
+
+    def latest(self, sensor_id: str, now: datetime | None = None) -> Observation | None:
+        s = self._sensors[sensor_id]
+        if s.reading is None or s.at is None:
+            return None
+        now = now or self.clock.now()
+        return Observation(sensor_id, s.reading, s.at, now - s.at > self._stale_after[sensor_id])
+
+    def snapshot(self, now: datetime | None = None) -> dict[str, Observation]:
+        """Latest observation per sensor that has ever produced a reading."""
+        now = now or self.clock.now()
+        out: dict[str, Observation] = {}
+        for sid in self._sensors:
+            obs = self.latest(sid, now)
+            if obs is not None:
+                out[sid] = obs
+        return out
+
+    def next_due(self) -> datetime | None:
+        dues = [s.next_due for s in self._sensors.values()]
+        if not dues:
+            return None
+        if any(d is None for d in dues):
+            return self.clock.now()
+        return min(d for d in dues if d is not None)
+
+    async def poll_due(self, now: datetime | None = None) -> int:
+        """
+        Read, concurrently, every sensor whose poll is due. For callers driving
+        virtual time; run() uses per-sensor tasks instead. Returns how many read.
+        """
+        now = now or self.clock.now()
+        due = [
+            sid for sid, s in self._sensors.items() if s.next_due is None or s.next_due <= now
+        ]
+        if due:
+            await asyncio.gather(*(self._poll(sid, now) for sid in due))
+        return len(due)
+
+    async def _poll(self, sensor_id: str, now: datetime) -> None:
+        s = self._sensors[sensor_id]
+        s.next_due = now + s.interval
+        try:
+            reading = await asyncio.wait_for(s.driver.read(), self.timeout_seconds)
+        except Exception:
+            s.failures += 1
+            if s.failures == 1:  # log the first failure of a run, not every retry
+                logger.exception(
+                    "sensor_read_failed",
+                    extra={"event": "sensor_read_failed", "sensor_id": sensor_id},
+                )
+            return
+        if s.failures:
+            logger.info(
+                "sensor_recovered",
+                extra={"event": "sensor_recovered", "sensor_id": sensor_id, "failures": s.failures},
+            )
+        s.failures = 0
+        s.reading = reading
+        s.at = self.clock.now()
+        if self.on_reading is not None:
+            try:
+                self.on_reading(sensor_id, s.at, reading)
+            except Exception:
+                # the reading is cached either way; keep polling
+                logger.exception(
+                    "sensor_callback_failed",
+                    extra={"event": "sensor_callback_failed", "sensor_id": sensor_id},
+                )
+
+    def start(self) -> None:
+        """Start one polling task per sensor (idempotent)."""
+        if self._tasks:
+            return
+        for sid in self._sensors:
+            self._tasks.append(asyncio.create_task(self._run(sid), name=f"sensor:{sid}"))
+
+    async def _run(self, sensor_id: str) -> None:
+        s = self._sensors[sensor_id]
+        while True:
+            await self._poll(sensor_id, self.clock.now())
+            assert s.next_due is not None
+            await self.clock.sleep((s.next_due - self.clock.now()).total_seconds())
+
+    async def close(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -2,109 +2,522 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import datetime
+from collections.abc import Awaitable
+from time import perf_counter
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
 from zoneinfo import ZoneInfo
 
+from vivariumassistant.apps.agent.actuation import Action, ActuationScheduler, pulse_key
+from vivariumassistant.apps.agent.ramp import RampExecutor
+from vivariumassistant.apps.agent.sensors import Observation, SensorPoller
+from vivariumassistant.apps.agent.tick_log import TickLog
+from vivariumassistant.packages.core.clock import Clock, RealClock
 from vivariumassistant.packages.core.config_loader import load_enclosure, load_profile
-from vivariumassistant.packages.core.device_state import DeviceState
-from vivariumassistant.packages.drivers.factory import build_drivers
-from vivariumassistant.packages.engine.lighting import compute_daylight_level
-from vivariumassistant.packages.engine.mist import MistRuntime, mist_burst_due
-from vivariumassistant.packages.engine.uvb import uvb_should_be_on
+from vivariumassistant.packages.core.config_schema import (
+    DeviceKind,
+    EnclosureConfig,
+    ProfileConfig,
+)
+from vivariumassistant.packages.core.device_state import StateRecord
+from vivariumassistant.packages.core.manual_override import ManualOverride
+from vivariumassistant.packages.core.metrics import TickMetrics
+from vivariumassistant.packages.core.telemetry import TelemetryBuffer
+from vivariumassistant.packages.drivers.base import SensorReading
+from vivariumassistant.packages.drivers.factory import build_drivers, build_sensors
+from vivariumassistant.packages.engine.context import TickContext, to_epoch_us
+from vivariumassistant.packages.engine.control_graph import ControlGraph
+from vivariumassistant.packages.engine.mist import MistRuntime
+from vivariumassistant.packages.engine.override_store import OverrideStore
+from vivariumassistant.packages.engine.schedule import (
+    CompiledSchedule,
+    MistDecision,
+    from_epoch_us,
+)
+
+if TYPE_CHECKING:
+    from vivariumassistant.apps.agent.checkpoint import AgentCheckpointer
+    from vivariumassistant.apps.api.snapshots import SnapshotHub
 
 logger = logging.getLogger("vivariumassistant.agent")
 
+# driver channel per device kind when a device's params do not name one
+_DEFAULT_CHANNELS = {"light": 0, "uvb": 1, "mist": 2, "pump": 3}
+
+
+def _pwm_level(state: StateRecord) -> float:
+    """PWM duty for a state; an override may set on/off without a level."""
+    if state.level is not None:
+        return state.level
+    return 1.0 if state.on else 0.0
+
 
 class SimAgent:
-    def __init__(self, enclosure_id: str, profile_id: str):
-        self.enc = load_enclosure(enclosure_id)
-        self.prof = load_profile(profile_id)
+    def __init__(
+        self,
+        enclosure_id: str,
+        profile_id: str,
+        *,
+        clock: Clock | None = None,
+        pwm_resolution: int = 256,
+    ):
+        self._setup(load_enclosure(enclosure_id), load_profile(profile_id), clock, pwm_resolution)
+
+    @classmethod
+    def from_config(
+        cls,
+        enc: EnclosureConfig,
+        prof: ProfileConfig,
+        *,
+        clock: Clock | None = None,
+        pwm_resolution: int = 256,
+        schedule: CompiledSchedule | None = None,
+        overrides: OverrideStore | None = None,
+    ) -> SimAgent:
+        """
+        Build an agent from already-loaded configs (e.g. by AgentHost).
+
+        Agents sharing a profile and timezone may share one compiled `schedule`;
+        agents on one host share one `overrides` store.
+        """
+        agent = cls.__new__(cls)
+        agent._setup(enc, prof, clock, pwm_resolution, schedule, overrides)
+        return agent
+
+    def _setup(
+        self,
+        enc: EnclosureConfig,
+        prof: ProfileConfig,
+        clock: Clock | None,
+        pwm_resolution: int,
+        schedule: CompiledSchedule | None = None,
+        overrides: OverrideStore | None = None,
+    ) -> None:
+        self.enc = enc
+        self.prof = prof
+        self.zone = ZoneInfo(self.enc.timezone)
+
+        # all time (now + sleeps) comes from the clock so SimClock can drive the agent
+        self.clock = clock or RealClock(self.enc.timezone)
 
-        bundle = build_drivers(self.enc)
-        self.pwm = bundle.pwm
-        self.relay = bundle.relay
+        self.drivers = build_drivers(self.enc)
+        self.pwm = self.drivers.pwm
+        self.relay = self.drivers.relay
 
+        # sensors are read by the poller's own tasks; ticks only see the cache
+        self.sensors = build_sensors(self.enc)
+        self.poller = SensorPoller(
+            self.sensors,
+            self.clock,
+            interval_seconds={
+                s.id: float(s.params.get("poll_seconds", 10)) for s in self.enc.sensors
+            },
+            on_reading=self._record_reading,
+        )
+        self.observations: dict[str, Observation] = {}
+
+        self.schedule = schedule or CompiledSchedule(self.prof, self.enc.timezone)
         self.mist_rt = MistRuntime()
+        self.graph = ControlGraph(self.enc.devices, self.schedule, self.mist_rt)
+        # evaluate()'s mist decision, applied to mist_rt by tick()
+        self._mist_decision: MistDecision | None = None
+        self._pending_profile: tuple[ProfileConfig, CompiledSchedule] | None = None
+        self.actuator = ActuationScheduler(self.clock)
+        self.overrides = overrides if overrides is not None else OverrideStore()
+        # set by set_override(); wakes run() early, since a new override changes desired state
+        self._override_set = asyncio.Event()
+        self.tick_log = TickLog.from_env()
+        self.metrics = TickMetrics()
+        # opt-in output history (fixed memory per channel once enabled)
+        self.telemetry: TelemetryBuffer | None = None
+        # where the API reads state from; published to once per tick
+        self.snapshots: SnapshotHub | None = None
+        # persists mist runtime, overrides and applied values across restarts
+        self.checkpoint: AgentCheckpointer | None = None
+
+        # last value written per driver channel; ticks only write differences
+        self._applied_levels: dict[int, float] = {}
+        self._applied_switches: dict[int, bool] = {}
+
+        # PWM steps per full scale; event-driven mode wakes once per step of a ramp
+        self.pwm_resolution = pwm_resolution
+        # opt-in smooth dimming between ticks (enable_ramps())
+        self.ramps: RampExecutor | None = None
 
         # index devices by id for quick access
         self.devices = {d.id: d for d in self.enc.devices}
+        self.device_kinds = {d.id: d.kind for d in self.enc.devices}
+        # (device id, kind, driver channel) in config order
+        self._outputs = [
+            (d.id, d.kind, int(d.params.get("channel", _DEFAULT_CHANNELS.get(d.kind, 0))))
+            for d in self.enc.devices
+        ]
+
+    def stage_profile(
+        self, prof: ProfileConfig, schedule: CompiledSchedule | None = None
+    ) -> None:
+        """
+        Replace the running profile at the start of the next tick.
+
+        Profile and schedule are swapped together, never mid-tick. Mist runtime
+        (last burst, seconds used today) carries over, so a reload does not
+        reset spacing or the daily cap.
+        """
+        self._pending_profile = (prof, schedule or CompiledSchedule(prof, self.enc.timezone))
+
+    def enable_ramps(self, rate_hz: float = 50.0) -> RampExecutor:
+        """
+        Interpolate light ramps between ticks at up to `rate_hz`.
+
+        Ticks then hand each light's current ramp to the executor instead of
+        writing it. While the executor's task runs, event-driven mode wakes at
+        the end of a ramp rather than at every PWM step of it.
+        """
+        self.ramps = RampExecutor(
+            self.clock, self._write_levels, rate_hz=rate_hz, resolution=self.pwm_resolution
+        )
+        return self.ramps
 
-    async def tick(self) -> tuple[datetime, dict[str, DeviceState]]:
-        now = datetime.now(tz=ZoneInfo(self.enc.timezone))
-        desired: dict[str, DeviceState] = {}
-
-        # LIGHT (PWM)
-        if "light_day" in self.devices:
-            light = self.devices["light_day"]
-            level = compute_daylight_level(now, self.enc.timezone, self.prof.lighting).level
-            ch = int(light.params.get("channel", 0))
-            await self.pwm.set_level(ch, level)
-            desired["light_day"] = DeviceState(
-                device_id="light_day",
-                on=(level > 0.001),
-                level=level,
+    def set_override(self, ovr: ManualOverride) -> None:
+        """Apply (or replace) a manual override; it wins until it expires."""
+        self.overrides.set(ovr, enclosure_id=self.enc.id)
+        self._override_set.set()
+
+    def evaluate(self, now: datetime | TickContext) -> dict[str, StateRecord]:
+        """Engine step: desired state per device at `now` (runtime state is not changed)."""
+        ctx = now if isinstance(now, TickContext) else self.schedule.context(now)
+        desired = self.graph.evaluate(ctx, self.observations)
+        # None when the last decision was reused: there is nothing new to apply
+        self._mist_decision = self.graph.mist_decision
+        return desired
+
+    async def tick(self) -> tuple[datetime, dict[str, StateRecord]]:
+        if self._pending_profile is not None:
+            self.prof, self.schedule = self._pending_profile
+            self._pending_profile = None
+            self.graph = ControlGraph(
+                self.enc.devices, self.schedule, self.mist_rt, previous=self.graph
             )
 
-        # UVB (relay)
-        if self.prof.uvb and "uvb" in self.devices:
-            uvb = self.devices["uvb"]
-            ch = int(uvb.params.get("channel", 1))
-            on = uvb_should_be_on(now, self.enc.timezone, self.prof.uvb)
-            await self.relay.set_on(ch, on)
-            desired["uvb"] = DeviceState(device_id="uvb", on=on)
-
-        # MIST (relay bursts)
-        if self.prof.mist and "mister" in self.devices:
-            mister = self.devices["mister"]
-            ch = int(mister.params.get("channel", 2))
-            seconds = mist_burst_due(now, self.enc.timezone, self.prof.mist, self.mist_rt)
-
-            if seconds:
-                await self.relay.set_on(ch, True)
-                desired["mister"] = DeviceState(
-                    device_id="mister",
-                    on=True,
-                    meta={"burst_seconds": seconds},
-                )
+        stages = self.metrics.stages
+        t0 = perf_counter()
+
+        # one resolved instant for every rule this tick
+        ctx = self.schedule.context(self.clock.now())
+        now = ctx.now
+        # safety net for deadlines the timer task has not reached yet
+        await self.actuator.fire_due(now)
+        self.observations = self.poller.snapshot(now)
+        desired = self.evaluate(ctx)
+        t1 = perf_counter()
+        self.overrides.evict(now)
+        self.overrides.resolve(now, self.enc.id, self.device_kinds, desired)
+        t2 = perf_counter()
+
+        levels: dict[int, float] = {}
+        switches: dict[int, bool] = {}
+        burst_seconds = 0
+
+        for device_id, kind, ch in self._outputs:
+            state = desired.get(device_id)
+            if state is None:
+                continue
+
+            if kind == "light":
+                # PWM; during a ramp the executor writes it, between ticks too
+                if self.ramps is not None and self._follow_ramp(device_id, ch, ctx):
+                    continue
+                levels[ch] = _pwm_level(state)
+                continue
 
-                # simulate burst duration without blocking loop too long
-                await asyncio.sleep(min(seconds, 5))
+            if kind != "mist":
+                # relay
+                switches[ch] = state.on
+                continue
 
-                await self.relay.set_on(ch, False)
+            # MIST (relay bursts)
+            seconds = int(state.meta.get("burst_seconds", 0))
+            key = pulse_key(self.relay, ch)
+            burst = self.actuator.pending(key)
 
-                self.mist_rt.last_burst_at = now
-                key = now.date().isoformat()
-                self.mist_rt.daily_seconds_used[key] = (
-                    self.mist_rt.daily_seconds_used.get(key, 0) + int(seconds)
+            if state.on and seconds:
+                # relay on now, off at the deadline; the tick does not wait
+                switches[ch] = True
+                self.actuator.schedule(
+                    now + timedelta(seconds=seconds), key, self._switch_off(ch)
+                )
+                burst_seconds = max(burst_seconds, seconds)
+            elif burst is not None and not self._overridden(device_id, now):
+                # a burst is still running: report it rather than cutting it short
+                desired[device_id] = StateRecord(
+                    device_id=device_id,
+                    on=True,
+                    meta={"burst_until": burst.due.isoformat()},
                 )
             else:
-                await self.relay.set_on(ch, False)
-                desired["mister"] = DeviceState(device_id="mister", on=False)
+                self.actuator.cancel(key)
+                switches[ch] = state.on
+
+        # one burst however many misters ran it
+        if burst_seconds:
+            self.mist_rt.record_burst(now, burst_seconds)
+
+        if self._mist_decision is not None:
+            self._settle_mist(ctx, self._mist_decision)
+            self._mist_decision = None
 
-        # WATERFALL (OFF in v1)
-        if "waterfall" in self.devices:
-            wf = self.devices["waterfall"]
-            ch = int(wf.params.get("channel", 3))
-            await self.relay.set_on(ch, False)
-            desired["waterfall"] = DeviceState(device_id="waterfall", on=False)
+        if self.ramps is not None:
+            await self.ramps.step(now)
+        await self._apply(levels, switches)
+        t3 = perf_counter()
+        if self.telemetry is not None:
+            self.telemetry.record_states(ctx.t_us, desired)
+        if self.snapshots is not None:
+            self.snapshots.publish(self.enc.id, now, desired, self.overrides)
+        t4 = perf_counter()
 
+        stages["engine"].observe(t1 - t0)
+        stages["overrides"].observe(t2 - t1)
+        stages["drivers"].observe(t3 - t2)
+        stages["telemetry"].observe(t4 - t3)
+        stages["total"].observe(t4 - t0)
         return now, desired
 
-    async def run(self, interval_seconds: int = 5):
-        while True:
-            now, desired = await self.tick()
+    async def _apply(self, levels: dict[int, float], switches: dict[int, bool]) -> None:
+        """Write only channels whose target differs from what was last applied."""
+        level_diff = {ch: v for ch, v in levels.items() if self._applied_levels.get(ch) != v}
+        switch_diff = {ch: v for ch, v in switches.items() if self._applied_switches.get(ch) != v}
+
+        writes = []
+        if level_diff:
+            writes.append(self._guarded("pwm", self._write_levels(level_diff)))
+        if switch_diff:
+            writes.append(self._guarded("relay", self._write_switches(switch_diff)))
+        if writes:
+            await asyncio.gather(*writes)
 
-            logger.info(
-                "control_tick",
+    async def _guarded(self, driver: str, write: Awaitable[None]) -> None:
+        # a hung or failing output must not end the loop: nothing was recorded
+        # as applied, so a later tick writes the batch again
+        try:
+            await write
+        except (TimeoutError, RuntimeError):
+            logger.exception(
+                "driver_write_failed",
+                extra={"event": "driver_write_failed", "enclosure_id": self.enc.id, "driver": driver},
+            )
+
+    async def _write_levels(self, levels: dict[int, float]) -> None:
+        self.metrics.driver_batches["pwm"] += 1
+        await self.pwm.apply(levels)
+        # only recorded once the driver accepted it, so a failed write is retried
+        self._applied_levels.update(levels)
+        self.metrics.driver_writes["pwm"] += len(levels)
+
+    async def _write_switches(self, switches: dict[int, bool]) -> None:
+        self.metrics.driver_batches["relay"] += 1
+        await self.relay.apply(switches)
+        self._applied_switches.update(switches)
+        self.metrics.driver_writes["relay"] += len(switches)
+
+    def _follow_ramp(self, device_id: str, channel: int, ctx: TickContext) -> bool:
+        """Hand a light's current ramp to the executor; False if the tick writes it."""
+        assert self.ramps is not None
+        overridden = self._overridden(device_id, ctx.now)
+        ramp = None if overridden else self.schedule.ramp_at(ctx)
+        self.ramps.follow(channel, ramp)
+        return ramp is not None
+
+    def _switch_off(self, channel: int) -> Action:
+        async def _off() -> None:
+            await self._write_switches({channel: False})
+
+        return _off
+
+    def _settle_mist(self, ctx: TickContext, decision: MistDecision) -> None:
+        self.mist_rt.slots_done_through = from_epoch_us(decision.done_through, self.zone)
+        if decision.skipped:
+            logger.warning(
+                "mist_burst_skipped",
                 extra={
-                    "event": "control_tick",
-                    "mode": getattr(getattr(self.enc, "runtime", None), "mode", "sim"),
-                    "tick_interval_seconds": interval_seconds,
+                    "event": "mist_burst_skipped",
                     "enclosure_id": self.enc.id,
-                    "profile_id": self.prof.id,
-                    "now": now.isoformat(),
-                    "desired": {k: v.model_dump() for k, v in desired.items()},
+                    "scheduled_at": [
+                        from_epoch_us(t, self.zone).isoformat() for t in decision.skipped
+                    ],
                 },
             )
+        if decision.seconds and decision.scheduled is not None:
+            late = (ctx.t_us - decision.scheduled) / 1_000_000
+            if late >= 60:
+                logger.info(
+                    "mist_burst_late",
+                    extra={
+                        "event": "mist_burst_late",
+                        "enclosure_id": self.enc.id,
+                        "scheduled_at": from_epoch_us(decision.scheduled, self.zone).isoformat(),
+                        "late_seconds": late,
+                    },
+                )
+
+    def _record_reading(self, sensor_id: str, at: datetime, reading: SensorReading) -> None:
+        if self.telemetry is None:
+            return
+        t = to_epoch_us(at)
+        if reading.temperature_c is not None:
+            self.telemetry.record(t, f"{sensor_id}.temperature_c", reading.temperature_c)
+        if reading.humidity_pct is not None:
+            self.telemetry.record(t, f"{sensor_id}.humidity_pct", reading.humidity_pct)
+
+    @property
+    def outputs(self) -> list[tuple[str, DeviceKind, int]]:
+        """(device id, kind, driver channel) per device, in config order (do not modify)."""
+        return self._outputs
+
+    @property
+    def applied(self) -> tuple[dict[int, float], dict[int, bool]]:
+        """Last value written per PWM channel and per relay channel (do not modify)."""
+        return self._applied_levels, self._applied_switches
+
+    def assume_applied(self, levels: dict[int, float], switches: dict[int, bool]) -> None:
+        """Treat these channel values as already written (outputs that kept their state)."""
+        self._applied_levels = dict(levels)
+        self._applied_switches = dict(switches)
+
+    def invalidate_applied(self) -> None:
+        """Forget what the drivers were last set to; the next tick rewrites every channel."""
+        self._applied_levels.clear()
+        self._applied_switches.clear()
+
+    def _overridden(self, device_id: str, now: datetime) -> bool:
+        kind = self.device_kinds[device_id]
+        return self.overrides.lookup(now, self.enc.id, device_id, kind) is not None
+
+    def next_wakeup(self, now: datetime, max_sleep: timedelta) -> datetime:
+        """
+        Earliest instant after `now` at which any device's desired state can
+        change: a PWM step of a light ramp, a UVB edge, a mist slot (or the end
+        of mist spacing), or an override expiry. Never later than now + max_sleep.
+        """
+        candidates: list[datetime | None] = [now + max_sleep]
+        kinds = self.graph.kinds
+
+        if "light" in kinds:
+            # a running ramp executor steps the light itself, so a ramp needs no
+            # tick until it ends; otherwise (e.g. on virtual time) ticks step it
+            stepped = self.ramps is not None and self.ramps.running
+            resolution = None if stepped else self.pwm_resolution
+            candidates.append(self.schedule.next_change_after(now, "light", resolution=resolution))
+
+        if "uvb" in kinds:
+            candidates.append(self.schedule.next_change_after(now, "uvb"))
+
+        if self.prof.mist and "mist" in kinds:
+            slot = self.schedule.next_mist_slot_after(now)
+            if slot is not None:
+                candidates.append(from_epoch_us(slot.start, self.zone))
+            if self.mist_rt.last_burst_at is not None:
+                spacing = timedelta(minutes=self.prof.mist.safety.min_minutes_between)
+                candidates.append(self.mist_rt.last_burst_at + spacing)
+
+        # soonest expiry of any override in the store, ours or not: at worst an early wakeup
+        candidates.append(self.overrides.next_expiry())
+
+        return min(c for c in candidates if c is not None and c > now)
+
+    async def run(
+        self,
+        interval_seconds: int = 5,
+        *,
+        event_driven: bool = False,
+        max_sleep_seconds: float = 300.0,
+    ):
+        """
+        Run the control loop.
+
+        By default the loop ticks every `interval_seconds`. With event_driven=True
+        it instead sleeps until next_wakeup(), so idle stretches (nights, the
+        middle of the day) cost one wakeup per `max_sleep_seconds` at most.
+        Either way set_override() wakes it for an immediate tick.
+        """
+        max_sleep = timedelta(seconds=max_sleep_seconds)
+        self.actuator.start()
+        self.poller.start()
+        if self.ramps is not None:
+            self.ramps.start()
+        try:
+            await self._loop(interval_seconds, event_driven, max_sleep)
+        finally:
+            if self.ramps is not None:
+                await self.ramps.close()
+            await self.poller.close()
+            # turns off anything still pulsing
+            await self.actuator.close()
+            await self.drivers.close()
+            if self.checkpoint is not None:
+                self.checkpoint.save()
+
+    async def _loop(self, interval_seconds: int, event_driven: bool, max_sleep: timedelta):
+        while True:
+            self._override_set.clear()
+            now, desired = await self.tick()
+            if self.checkpoint is not None:
+                try:
+                    await self.checkpoint.flush(now)
+                except OSError:
+                    # the checkpointer forgot what it saved, so the next tick retries
+                    logger.exception(
+                        "checkpoint_write_failed",
+                        extra={"event": "checkpoint_write_failed", "enclosure_id": self.enc.id},
+                    )
+
+            if event_driven:
+                wake = self.next_wakeup(now, max_sleep)
+                self.log_tick(now, desired, next_wakeup=wake.isoformat())
+            else:
+                self.log_tick(now, desired, tick_interval_seconds=interval_seconds)
+                wake = self.clock.now() + timedelta(seconds=interval_seconds)
+
+            await self._sleep_until(wake)
+            late = max(0.0, (self.clock.now() - wake).total_seconds())
+            self.metrics.drift.observe(late)
+            # woke a whole interval (or more) late: those slots were missed
+            self.metrics.overruns += int(late // interval_seconds)
+
+    async def _sleep_until(self, wake: datetime) -> None:
+        """Sleep until `wake`, or until a new override needs a tick sooner."""
+        if self._override_set.is_set():
+            return
+        sleep = asyncio.ensure_future(self.clock.sleep((wake - self.clock.now()).total_seconds()))
+        override = asyncio.ensure_future(self._override_set.wait())
+        try:
+            await asyncio.wait((sleep, override), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            sleep.cancel()
+            override.cancel()
+
+    def log_tick(self, now: datetime, desired: dict[str, StateRecord], **fields: object) -> None:
+        t0 = perf_counter()
+        self._log_tick(now, desired, fields)
+        self.metrics.stages["log"].observe(perf_counter() - t0)
 
-            await asyncio.sleep(interval_seconds)
\ No newline at end of file
+    def _log_tick(
+        self, now: datetime, desired: dict[str, StateRecord], fields: dict[str, object]
+    ) -> None:
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        states = self.tick_log.fields(now, desired)
+        if states is None:
+            return  # delta mode, nothing changed
+        logger.info(
+            "control_tick",
+            extra={
+                "event": "control_tick",
+                "mode": getattr(getattr(self.enc, "runtime", None), "mode", "sim"),
+                "enclosure_id": self.enc.id,
+                "profile_id": self.prof.id,
+                "now": now.isoformat(),
+                **states,
+                **fields,
+            },
+        )
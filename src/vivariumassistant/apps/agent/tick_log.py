@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import os
+from datetime import datetime, timedelta
+from typing import Any
+
+from vivariumassistant.packages.core.device_state import StateRecord
+
+
+class TickLog:
+    """
+    Decide what a control_tick log entry carries.
+
+    In full mode every tick logs the whole `desired` map. In delta mode a tick
+    logs only the devices whose state changed since the previous tick under
+    `changed` (and nothing at all if none did), with a full `desired` snapshot
+    at least every `snapshot_seconds` so a log reader can always resync.
+    """
+
+    def __init__(self, *, delta: bool = False, snapshot_seconds: float = 300.0) -> None:
+        self.delta = delta
+        self.snapshot_interval = timedelta(seconds=snapshot_seconds)
+        self._last: dict[str, StateRecord] = {}
+        self._last_snapshot: datetime | None = None
+
+    @classmethod
+    def from_env(cls) -> TickLog:
+        """
+        Env vars:
+          VA_LOG_TICKS=full|delta (default full)
+          VA_LOG_SNAPSHOT_SECONDS=<seconds> between delta-mode snapshots (default 300)
+        """
+        return cls(
+            delta=os.getenv("VA_LOG_TICKS", "full").strip().lower() == "delta",
+            snapshot_seconds=float(os.getenv("VA_LOG_SNAPSHOT_SECONDS", "300")),
+        )
+
+    def fields(self, now: datetime, desired: dict[str, StateRecord]) -> dict[str, Any] | None:
+        """Log fields for this tick, or None if delta mode has nothing to report."""
+        if not self.delta:
+            return {"desired": {k: v.as_dict() for k, v in desired.items()}}
+
+        last, self._last = self._last, dict(desired)
+
+        if self._last_snapshot is None or now - self._last_snapshot >= self.snapshot_interval:
+            self._last_snapshot = now
+            return {"snapshot": True, "desired": {k: v.as_dict() for k, v in desired.items()}}
+
+        changed = {k: v.as_dict() for k, v in desired.items() if last.get(k) != v}
+        removed = [k for k in last if k not in desired]
+        if not changed and not removed:
+            return None
+
+        out: dict[str, Any] = {"changed": changed}
+        if removed:
+            out["removed"] = removed
+        return out
+
+    def reset(self) -> None:
+        """Force a full snapshot on the next tick."""
+        self._last.clear()
+        self._last_snapshot = None
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import math
+from collections.abc import Callable, Mapping
+from http import HTTPStatus
+
+from vivariumassistant.apps.api.server import ApiServer, Request, Response
+from vivariumassistant.apps.api.snapshots import SnapshotHub
+from vivariumassistant.packages.core.metrics import TickMetrics, render_prometheus
+from vivariumassistant.packages.core.telemetry import TelemetryBuffer
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+JSON_CONTENT_TYPE = "application/json"
+SSE_CONTENT_TYPE = "text/event-stream"
+
+MetricsSource = Callable[[], Mapping[str, TickMetrics]]
+# enclosure id -> its telemetry buffer, None if unknown or not recording
+HistorySource = Callable[[str], TelemetryBuffer | None]
+
+HISTORY_CACHE_SIZE = 256
+
+
+def create_api(
+    metrics: MetricsSource,
+    *,
+    snapshots: SnapshotHub | None = None,
+    history: HistorySource | None = None,
+    host: str = "127.0.0.1",
+    port: int = 8080,
+) -> ApiServer:
+    """
+    HTTP API for a running agent or host.
+
+    - GET /metrics: Prometheus text format, per-enclosure tick metrics
+
+    With `snapshots` (what the control loop published on its last tick):
+    - GET /state[?enclosure=ID]: desired states and overrides, with ETag
+    - GET /overrides?enclosure=ID: active overrides, with ETag
+    - GET /events[?enclosure=ID,...]: server-sent events, a snapshot per
+      enclosure then one delta per tick that changed something
+
+    With `history`:
+    - GET /history?enclosure=ID&channel=NAME[&seconds=3600][&resolution=1m]
+
+    None of these touch the engine or the drivers: state reads return bytes
+    serialized at publish time, and history reads only window the in-memory
+    buffer (cached until the channel gets a new sample).
+    """
+    api = ApiServer(host=host, port=port)
+
+    async def get_metrics(request: Request) -> Response:
+        body = render_prometheus(metrics()).encode()
+        return Response(body=body, content_type=PROMETHEUS_CONTENT_TYPE)
+
+    api.route("/metrics", get_metrics)
+
+    if snapshots is not None:
+        hub = snapshots
+
+        async def get_state(request: Request) -> Response:
+            enc_id = request.query.get("enclosure")
+            found = hub.snapshot(enc_id) if enc_id is not None else hub.snapshot_all()
+            return _cached(found)
+
+        async def get_overrides(request: Request) -> Response:
+            enc_id = request.query.get("enclosure")
+            if enc_id is None:
+                return Response(HTTPStatus.BAD_REQUEST, b"enclosure is required\n")
+            return _cached(hub.overrides(enc_id))
+
+        async def get_events(request: Request) -> Response:
+            param = request.query.get("enclosure")
+            enclosures = param.split(",") if param else None
+            return Response(
+                content_type=SSE_CONTENT_TYPE,
+                headers={"Cache-Control": "no-cache"},
+                stream=hub.stream(enclosures),
+            )
+
+        api.route("/state", get_state)
+        api.route("/overrides", get_overrides)
+        api.route("/events", get_events)
+
+    if history is not None:
+        source = history
+        cache: dict[tuple[str, ...], tuple[int, bytes]] = {}
+
+        async def get_history(request: Request) -> Response:
+            q = request.query
+            enc_id, channel = q.get("enclosure"), q.get("channel")
+            if enc_id is None or channel is None:
+                return Response(HTTPStatus.BAD_REQUEST, b"enclosure and channel are required\n")
+            try:
+                seconds = float(q.get("seconds", "3600"))
+            except ValueError:
+                return Response(HTTPStatus.BAD_REQUEST, b"seconds must be a number\n")
+            if not (math.isfinite(seconds) and seconds > 0):
+                return Response(HTTPStatus.BAD_REQUEST, b"seconds must be positive and finite\n")
+            resolution = q.get("resolution")
+
+            buf = source(enc_id)
+            last = buf.last_us(channel) if buf is not None else None
+            if buf is None or last is None:
+                return Response(HTTPStatus.NOT_FOUND, b"no history for that channel\n")
+            if resolution is not None and resolution not in (r.name for r in buf.resolutions):
+                return Response(HTTPStatus.BAD_REQUEST, b"unknown resolution\n")
+
+            key = (enc_id, channel, str(seconds), resolution or "")
+            hit = cache.get(key)
+            if hit is None or hit[0] != last:
+                series = buf.series(
+                    channel, last - int(seconds * 1_000_000), resolution=resolution
+                )
+                doc: dict[str, object] = {
+                    "enclosure_id": enc_id,
+                    "channel": channel,
+                    "resolution": series.resolution,
+                    "t_us": series.t_us.tolist(),
+                    "value": series.value.tolist(),
+                }
+                if series.resolution != buf.resolutions[0].name:
+                    doc["low"] = series.low.tolist()
+                    doc["high"] = series.high.tolist()
+                if len(cache) >= HISTORY_CACHE_SIZE:
+                    cache.clear()
+                hit = cache[key] = (last, json.dumps(doc, separators=(",", ":")).encode())
+            return Response(
+                body=hit[1],
+                content_type=JSON_CONTENT_TYPE,
+                headers={"ETag": f'"{channel}-{last}"'},
+            )
+
+        api.route("/history", get_history)
+
+    return api
+
+
+def _cached(found: tuple[bytes, str] | None) -> Response:
+    if found is None:
+        return Response(HTTPStatus.NOT_FOUND, b"unknown enclosure\n")
+    body, etag = found
+    return Response(body=body, content_type=JSON_CONTENT_TYPE, headers={"ETag": etag})
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit
+
+logger = logging.getLogger("vivariumassistant.api")
+
+MAX_HEADER_BYTES = 16 * 1024
+
+
+@dataclass(frozen=True)
+class Request:
+    method: str
+    path: str
+    query: dict[str, str]
+    headers: dict[str, str]  # lower-cased names
+
+
+@dataclass
+class Response:
+    status: int = 200
+    body: bytes = b""
+    content_type: str = "text/plain; charset=utf-8"
+    headers: dict[str, str] = field(default_factory=dict)
+    # streamed body (e.g. server-sent events); written chunk by chunk until exhausted
+    stream: AsyncGenerator[bytes, None] | None = None
+
+
+Handler = Callable[[Request], Awaitable[Response]]
+
+
+class ApiServer:
+    """
+    Minimal asyncio HTTP/1.1 server (stdlib only) for read-only endpoints.
+
+    One request per connection; handlers get a parsed Request and return a
+    Response. Only GET and HEAD are served. A response carrying an ETag
+    header is answered with 304 when the request's If-None-Match matches it.
+    A streamed response keeps the connection open until its stream ends, the
+    client goes away or the server closes.
+    """
+
+    def __init__(self, *, host: str = "127.0.0.1", port: int = 8080) -> None:
+        self.host = host
+        self.port = port
+        self.routes: dict[str, Handler] = {}
+        self._server: asyncio.Server | None = None
+        self._connections: set[asyncio.Task[None]] = set()
+
+    def route(self, path: str, handler: Handler) -> None:
+        self.routes[path] = handler
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # the real port when started with port=0
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(
+            "api_started", extra={"event": "api_started", "host": self.host, "port": self.port}
+        )
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # streams never end on their own
+            for task in list(self._connections):
+                task.cancel()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._connections.add(task)
+        try:
+            request = await asyncio.wait_for(self._read_request(reader), timeout=10)
+            if request is None:
+                return
+            response = await self._dispatch(request)
+            await self._write(writer, request, response)
+        except (TimeoutError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if task is not None:
+                self._connections.discard(task)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Request | None:
+        head = await reader.readuntil(b"\r\n\r\n")
+        if len(head) > MAX_HEADER_BYTES:
+            return None
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            return None
+        headers: dict[str, str] = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(":")
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        url = urlsplit(target)
+        return Request(method.upper(), url.path, dict(parse_qsl(url.query)), headers)
+
+    async def _dispatch(self, request: Request) -> Response:
+        if request.method not in ("GET", "HEAD"):
+            return Response(HTTPStatus.METHOD_NOT_ALLOWED, b"method not allowed\n")
+        handler = self.routes.get(request.path)
+        if handler is None:
+            return Response(HTTPStatus.NOT_FOUND, b"not found\n")
+        try:
+            response = await handler(request)
+        except Exception:
+            logger.exception(
+                "api_handler_failed", extra={"event": "api_handler_failed", "path": request.path}
+            )
+            return Response(HTTPStatus.INTERNAL_SERVER_ERROR, b"internal error\n")
+        etag = response.headers.get("ETag")
+        if etag is not None and response.stream is None and _etag_matches(request, etag):
+            return Response(HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
+        return response
+
+    async def _write(
+        self, writer: asyncio.StreamWriter, request: Request, response: Response
+    ) -> None:
+        status = HTTPStatus(response.status)
+        head = [f"HTTP/1.1 {status.value} {status.phrase}"]
+        if status != HTTPStatus.NOT_MODIFIED:
+            head.append(f"Content-Type: {response.content_type}")
+            if response.stream is None:
+                head.append(f"Content-Length: {len(response.body)}")
+        head.append("Connection: close")
+        head.extend(f"{k}: {v}" for k, v in response.headers.items())
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+
+        if response.stream is None:
+            if request.method != "HEAD":
+                writer.write(response.body)
+            await writer.drain()
+            return
+
+        try:
+            await writer.drain()
+            if request.method == "HEAD":
+                return
+            async for chunk in response.stream:
+                writer.write(chunk)
+                # a client that stops reading blocks only its own stream
+                await writer.drain()
+        finally:
+            await response.stream.aclose()
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncGenerator, Iterable
+from datetime import datetime
+from typing import Any
+
+from vivariumassistant.packages.core.device_state import StateRecord
+from vivariumassistant.packages.engine.override_store import OverrideStore
+
+
+def _dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), default=str).encode()
+
+
+class _Enclosure:
+    __slots__ = (
+        "states",
+        "overrides",
+        "override_version",
+        "version",
+        "updated_at",
+        "body",
+        "overrides_body",
+    )
+
+    def __init__(self) -> None:
+        self.states: dict[str, StateRecord] = {}
+        self.overrides: list[dict[str, Any]] = []
+        self.override_version = -1
+        self.version = 0
+        self.updated_at = ""
+        # serialized once per change, not per read
+        self.body = b"{}"
+        self.overrides_body = b"[]"
+
+
+class Subscription:
+    """One SSE client: a bounded queue of pre-serialized events."""
+
+    def __init__(self, enclosures: set[str] | None, maxsize: int) -> None:
+        self.enclosures = enclosures
+        self.queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize)
+
+    def wants(self, enc_id: str) -> bool:
+        return self.enclosures is None or enc_id in self.enclosures
+
+    def offer(self, event: bytes) -> bool:
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+
+class SnapshotHub:
+    """
+    What the API serves, published by the control loop once per tick.
+
+    publish() compares the tick's states (and the enclosure's overrides)
+    with the previous tick and only when something changed re-serializes
+    that enclosure's snapshot, bumps its version and queues one delta event
+    for stream subscribers. Readers only ever get these cached bytes, so any
+    number of clients costs the control loop nothing beyond the change check.
+    A subscriber that falls `queue_size` events behind is disconnected and
+    resyncs from a fresh snapshot when it reconnects.
+    """
+
+    def __init__(self, *, queue_size: int = 256) -> None:
+        self.queue_size = queue_size
+        self.version = 0  # bumps whenever any enclosure changes
+        self._enclosures: dict[str, _Enclosure] = {}
+        self._subscribers: set[Subscription] = set()
+        self._all_body: tuple[int, bytes] = (-1, b"{}")
+
+    @property
+    def enclosure_ids(self) -> list[str]:
+        return list(self._enclosures)
+
+    def publish(
+        self,
+        enc_id: str,
+        now: datetime,
+        desired: dict[str, StateRecord],
+        overrides: OverrideStore | None = None,
+    ) -> bool:
+        """Record one tick's outcome. Returns whether anything changed."""
+        enc = self._enclosures.get(enc_id)
+        if enc is None:
+            enc = self._enclosures[enc_id] = _Enclosure()
+
+        changed = {k: v for k, v in desired.items() if enc.states.get(k) != v}
+        removed = [k for k in enc.states if k not in desired]
+
+        override_list = None
+        if overrides is not None and overrides.version != enc.override_version:
+            enc.override_version = overrides.version
+            current = overrides.describe(enc_id, now)
+            if current != enc.overrides:
+                override_list = current
+
+        if not changed and not removed and override_list is None:
+            return False
+
+        enc.states = dict(desired)
+        if override_list is not None:
+            enc.overrides = override_list
+            enc.overrides_body = _dumps(override_list)
+        enc.version += 1
+        enc.updated_at = now.isoformat()
+        self.version += 1
+        enc.body = _dumps(
+            {
+                "enclosure_id": enc_id,
+                "version": enc.version,
+                "updated_at": enc.updated_at,
+                "desired": {k: v.as_dict() for k, v in enc.states.items()},
+                "overrides": enc.overrides,
+            }
+        )
+
+        if self._subscribers:
+            delta: dict[str, Any] = {
+                "enclosure_id": enc_id,
+                "version": enc.version,
+                "now": enc.updated_at,
+                "changed": {k: v.as_dict() for k, v in changed.items()},
+            }
+            if removed:
+                delta["removed"] = removed
+            if override_list is not None:
+                delta["overrides"] = override_list
+            event = _sse("delta", _dumps(delta), self.version)
+            for sub in list(self._subscribers):
+                if sub.wants(enc_id) and not sub.offer(event):
+                    self._drop(sub)
+        return True
+
+    def snapshot(self, enc_id: str) -> tuple[bytes, str] | None:
+        """Serialized snapshot and its ETag, or None for an unknown enclosure."""
+        enc = self._enclosures.get(enc_id)
+        if enc is None:
+            return None
+        return enc.body, f'"{enc_id}-{enc.version}"'
+
+    def snapshot_all(self) -> tuple[bytes, str]:
+        version, body = self._all_body
+        if version != self.version:
+            parts = [_dumps(k) + b":" + e.body for k, e in self._enclosures.items()]
+            body = b"{" + b",".join(parts) + b"}"
+            self._all_body = (self.version, body)
+        return body, f'"all-{self.version}"'
+
+    def overrides(self, enc_id: str) -> tuple[bytes, str] | None:
+        """Serialized active overrides for one enclosure and their ETag."""
+        enc = self._enclosures.get(enc_id)
+        if enc is None:
+            return None
+        return enc.overrides_body, f'"{enc_id}-{enc.version}"'
+
+    def subscribe(self, enclosures: Iterable[str] | None = None) -> Subscription:
+        sub = Subscription(set(enclosures) if enclosures is not None else None, self.queue_size)
+        # baseline first, so deltas apply on top of a known state
+        for enc_id, enc in self._enclosures.items():
+            if sub.wants(enc_id):
+                sub.offer(_sse("snapshot", enc.body, self.version))
+        self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subscribers.discard(sub)
+
+    def _drop(self, sub: Subscription) -> None:
+        self._subscribers.discard(sub)
+        # make room for the end-of-stream marker
+        while not sub.queue.empty():
+            sub.queue.get_nowait()
+        sub.queue.put_nowait(None)
+
+    async def stream(
+        self, enclosures: Iterable[str] | None = None, *, keepalive_seconds: float = 15.0
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        SSE bytes for one client: a snapshot event per enclosure, then deltas.
+
+        Subscribes when iteration starts and unsubscribes when it stops; ends
+        by itself if the client fell too far behind.
+        """
+        sub = self.subscribe(enclosures)
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(sub.queue.get(), keepalive_seconds)
+                except TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                if event is None:
+                    return
+                yield event
+        finally:
+            self.unsubscribe(sub)
+
+
+def _sse(event: str, data: bytes, event_id: int) -> bytes:
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (event_id, event.encode(), data)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
@@ -10,6 +11,10 @@ class Clock(ABC):
     def now(self) -> datetime:
         """Return the current timezone-aware datetime."""
 
+    @abstractmethod
+    async def sleep(self, seconds: float) -> None:
+        """Let `seconds` of this clock's time pass."""
+
 
 class RealClock(Clock):
     def __init__(self, timezone: str):
@@ -18,6 +23,9 @@ class RealClock(Clock):
     def now(self) -> datetime:
         return datetime.now(tz=self._tz)
 
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(max(0.0, seconds))
+
 
 class SimClock(Clock):
     def __init__(self, start: datetime):
@@ -28,5 +36,10 @@ class SimClock(Clock):
     def now(self) -> datetime:
         return self._now
 
-    def advance(self, seconds: int) -> None:
-        self._now = self._now + timedelta(seconds=seconds)
\ No newline at end of file
+    def advance(self, seconds: float) -> None:
+        self._now = self._now + timedelta(seconds=seconds)
+
+    async def sleep(self, seconds: float) -> None:
+        """Jump virtual time forward immediately (no wall-clock wait)."""
+        self.advance(max(0.0, seconds))
+        await asyncio.sleep(0)
\ No newline at end of file
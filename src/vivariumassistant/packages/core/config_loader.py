@@ -1,22 +1,34 @@
 from __future__ import annotations
 
 from pathlib import Path
-import yaml
 
 from vivariumassistant.packages.core.config_schema import EnclosureConfig, ProfileConfig
+from vivariumassistant.packages.core.config_store import ConfigStore
 
 REPO_ROOT = Path(__file__).resolve().parents[4]
+ENCLOSURES_DIR = REPO_ROOT / "config" / "enclosures"
+PROFILES_DIR = REPO_ROOT / "config" / "profiles"
 
-def _load_yaml(path: Path) -> dict:
-    data = yaml.safe_load(path.read_text())
-    if not isinstance(data, dict):
-        raise ValueError(f"Expected YAML mapping at {path}")
-    return data
+# process-wide cache behind the load_* helpers
+_store = ConfigStore()
+
+def default_store() -> ConfigStore:
+    return _store
 
 def load_enclosure(enclosure_id: str) -> EnclosureConfig:
-    path = REPO_ROOT / "config" / "enclosures" / f"{enclosure_id}.yaml"
-    return EnclosureConfig.model_validate(_load_yaml(path))
+    return load_enclosure_file(ENCLOSURES_DIR / f"{enclosure_id}.yaml")
 
 def load_profile(profile_id: str) -> ProfileConfig:
-    path = REPO_ROOT / "config" / "profiles" / f"{profile_id}.yaml"
-    return ProfileConfig.model_validate(_load_yaml(path))
+    return load_profile_file(PROFILES_DIR / f"{profile_id}.yaml")
+
+def load_enclosure_file(path: Path) -> EnclosureConfig:
+    """Validated enclosure config, cached until the file changes (treat as read-only)."""
+    return _store.enclosure(path)
+
+def load_profile_file(path: Path) -> ProfileConfig:
+    """Validated profile config, cached until the file changes (treat as read-only)."""
+    return _store.profile(path)
+
+def load_enclosure_dir(directory: Path) -> list[EnclosureConfig]:
+    """All enclosure configs (*.yaml) in a directory, sorted by file name."""
+    return [load_enclosure_file(p) for p in sorted(directory.glob("*.yaml"))]
@@ -35,6 +35,7 @@ class EnclosureConfig(BaseModel):
     id: str
     name: str
     timezone: str = "America/New_York"
+    profile: Optional[str] = None  # profile id under config/profiles/
     runtime: RuntimeConfig = Field(default_factory=RuntimeConfig)
     devices: list[DeviceConfig] = Field(default_factory=list)
     sensors: list[SensorConfig] = Field(default_factory=list)
@@ -70,12 +71,22 @@ class MistWindow(BaseModel):
     seconds: int
 
 
+class MistCatchUp(BaseModel):
+    # late: a burst whose minute was missed (delayed or sparse ticks) still fires
+    #       on the first tick within grace_seconds of its scheduled start
+    # skip: only a tick inside the burst's own minute fires it
+    # either way a burst fires at most once, and one given up on is logged
+    policy: Literal["late", "skip"] = "late"
+    grace_seconds: int = Field(default=300, ge=0)
+
+
 class MistProfile(BaseModel):
     # Mode A: fixed bursts (existing)
     bursts: list[MistBurst] = Field(default_factory=list)
     # Mode B: window schedule (new)
     windows: list[MistWindow] = Field(default_factory=list)
     safety: MistSafety = Field(default_factory=MistSafety)
+    catch_up: MistCatchUp = Field(default_factory=MistCatchUp)
 
 
 class ProfileConfig(BaseModel):
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TypeVar
+
+import yaml
+from pydantic import BaseModel
+
+from vivariumassistant.packages.core.config_schema import EnclosureConfig, ProfileConfig
+
+logger = logging.getLogger("vivariumassistant.config")
+
+SNAPSHOT_VERSION = 1
+
+M = TypeVar("M", bound=BaseModel)
+
+# snapshot "kind" -> model class
+_KINDS: dict[str, type[BaseModel]] = {"enclosure": EnclosureConfig, "profile": ProfileConfig}
+_KIND_OF = {cls: kind for kind, cls in _KINDS.items()}
+
+
+@dataclass(slots=True)
+class _Entry:
+    mtime_ns: int
+    size: int
+    digest: str  # sha256 of the file bytes
+    model: BaseModel
+
+
+def _parse(raw: bytes, path: Path, cls: type[M]) -> M:
+    data = yaml.safe_load(raw)
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected YAML mapping at {path}")
+    return cls.model_validate(data)
+
+
+class ConfigStore:
+    """
+    Validated configs kept in memory, keyed by file path.
+
+    A cached model is reused while the file's mtime and size are unchanged. If
+    they changed, the file is hashed and the model is only re-parsed and
+    re-validated when the content actually differs.
+    Returned models are shared between callers and must be treated as read-only.
+
+    A snapshot (JSON of the validated models plus their file stamps) can be
+    saved and loaded to skip YAML parsing on a cold start.
+    """
+
+    def __init__(self, snapshot: Path | None = None) -> None:
+        self._entries: dict[Path, _Entry] = {}
+        if snapshot is not None:
+            self.load_snapshot(snapshot)
+
+    def enclosure(self, path: Path) -> EnclosureConfig:
+        return self._get(path, EnclosureConfig)
+
+    def profile(self, path: Path) -> ProfileConfig:
+        return self._get(path, ProfileConfig)
+
+    def __contains__(self, path: object) -> bool:
+        return isinstance(path, (str, Path)) and Path(os.path.abspath(path)) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, path: Path, cls: type[M]) -> M:
+        path = Path(os.path.abspath(path))
+        st = path.stat()
+        entry = self._entries.get(path)
+        if (
+            entry is None
+            or type(entry.model) is not cls
+            or (entry.mtime_ns, entry.size) != (st.st_mtime_ns, st.st_size)
+        ):
+            entry = self._load(path, cls, st, entry)
+        return entry.model  # type: ignore[return-value]
+
+    def _load(self, path: Path, cls: type[M], st: os.stat_result, old: _Entry | None) -> _Entry:
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if old is not None and old.digest == digest and type(old.model) is cls:
+            model: BaseModel = old.model
+        else:
+            model = _parse(raw, path, cls)
+        entry = _Entry(st.st_mtime_ns, st.st_size, digest, model)
+        self._entries[path] = entry
+        return entry
+
+    def poll(self) -> list[Path]:
+        """
+        Stat every cached file and reload the ones that changed on disk.
+
+        Returns the paths whose validated model was replaced. A file that fails
+        to parse or validate keeps its last good model (and is retried only once
+        it changes again); a deleted file is left cached.
+        """
+        changed: list[Path] = []
+        for path, entry in list(self._entries.items()):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            if (st.st_mtime_ns, st.st_size) == (entry.mtime_ns, entry.size):
+                continue
+            try:
+                new = self._load(path, type(entry.model), st, entry)
+            except (OSError, yaml.YAMLError, ValueError):
+                logger.exception(
+                    "config_reload_failed",
+                    extra={"event": "config_reload_failed", "path": str(path)},
+                )
+                entry.mtime_ns, entry.size = st.st_mtime_ns, st.st_size
+                continue
+            if new.model is not entry.model:
+                changed.append(path)
+        return changed
+
+    def save_snapshot(self, path: Path) -> None:
+        """Write every cached config to `path` atomically."""
+        doc = {
+            "version": SNAPSHOT_VERSION,
+            "entries": {
+                str(p): {
+                    "kind": _KIND_OF[type(e.model)],
+                    "mtime_ns": e.mtime_ns,
+                    "size": e.size,
+                    "digest": e.digest,
+                    "data": e.model.model_dump(mode="json"),
+                }
+                for p, e in self._entries.items()
+            },
+        }
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(doc))
+        os.replace(tmp, path)
+
+    def load_snapshot(self, path: Path) -> int:
+        """
+        Seed the cache from a snapshot; returns how many entries were loaded.
+
+        A missing, unreadable or other-version snapshot is ignored. Entries are
+        still checked against the file on first use, so a stale one only costs
+        a hash of the file (or a normal parse if the content changed).
+        """
+        try:
+            doc = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return 0
+        if not isinstance(doc, dict) or doc.get("version") != SNAPSHOT_VERSION:
+            return 0
+
+        loaded = 0
+        for p, e in doc.get("entries", {}).items():
+            cls = _KINDS.get(e.get("kind"))
+            if cls is None:
+                continue
+            try:
+                model = cls.model_validate(e["data"])
+                self._entries[Path(p)] = _Entry(e["mtime_ns"], e["size"], e["digest"], model)
+            except (KeyError, ValueError):
+                continue
+            loaded += 1
+        return loaded
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from typing import Any, Optional
 
 from pydantic import BaseModel, Field, field_validator
@@ -24,4 +25,35 @@ class DeviceState(BaseModel):
             return v
         if not (0.0 <= v <= 1.0):
             raise ValueError("level must be between 0.0 and 1.0 inclusive")
-        return v
\ No newline at end of file
+        return v
+
+@dataclass(slots=True)
+class StateRecord:
+    """
+    Unvalidated desired state for the engine -> agent hot path.
+
+    Same fields as DeviceState without Pydantic's construction and dump cost;
+    the agent builds several per tick. Convert with to_model()/from_model() at
+    the API and config boundary, where validation matters.
+    """
+
+    device_id: str
+    on: bool
+    level: Optional[float] = None
+    meta: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_model(cls, state: DeviceState) -> StateRecord:
+        return cls(state.device_id, state.on, state.level, dict(state.meta))
+
+    def to_model(self) -> DeviceState:
+        return DeviceState(device_id=self.device_id, on=self.on, level=self.level, meta=self.meta)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Same shape as DeviceState.model_dump()."""
+        return {
+            "device_id": self.device_id,
+            "on": self.on,
+            "level": self.level,
+            "meta": dict(self.meta),
+        }
@@ -1,10 +1,42 @@
 from __future__ import annotations
 
+import atexit
+import copy
 import json
 import logging
 import os
+import queue
 from datetime import datetime, timezone
-from typing import Any
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Literal
+
+DropPolicy = Literal["newest", "oldest"]
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RESERVED = frozenset(
+    (
+        "name",
+        "msg",
+        "args",
+        "levelname",
+        "levelno",
+        "pathname",
+        "filename",
+        "module",
+        "exc_info",
+        "exc_text",
+        "stack_info",
+        "lineno",
+        "funcName",
+        "created",
+        "msecs",
+        "relativeCreated",
+        "thread",
+        "threadName",
+        "processName",
+        "process",
+    )
+)
 
 
 class JsonFormatter(logging.Formatter):
@@ -12,7 +44,8 @@ class JsonFormatter(logging.Formatter):
 
     def format(self, record: logging.LogRecord) -> str:
         payload: dict[str, Any] = {
-            "ts": datetime.now(timezone.utc).isoformat(),
+            # when the event happened, not when (possibly later) it was formatted
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "msg": record.getMessage(),
@@ -20,30 +53,7 @@ class JsonFormatter(logging.Formatter):
 
         # include fields passed via logger.*(..., extra={...})
         for key, value in record.__dict__.items():
-            if key.startswith("_"):
-                continue
-            if key in (
-                "name",
-                "msg",
-                "args",
-                "levelname",
-                "levelno",
-                "pathname",
-                "filename",
-                "module",
-                "exc_info",
-                "exc_text",
-                "stack_info",
-                "lineno",
-                "funcName",
-                "created",
-                "msecs",
-                "relativeCreated",
-                "thread",
-                "threadName",
-                "processName",
-                "process",
-            ):
+            if key in _RESERVED or key.startswith("_"):
                 continue
             payload[key] = value
 
@@ -53,6 +63,81 @@ class JsonFormatter(logging.Formatter):
         return json.dumps(payload, default=str)
 
 
+class DroppingQueueHandler(QueueHandler):
+    """
+    Hand records to a bounded queue without ever blocking the caller.
+
+    When the queue is full, drop="newest" discards the incoming record and
+    drop="oldest" evicts the oldest queued one to make room. Drops are counted
+    and reported by a `log_dropped` warning once the queue has spare room again.
+    """
+
+    def __init__(self, q: queue.Queue[Any], *, drop: DropPolicy = "newest") -> None:
+        super().__init__(q)
+        self._q = q
+        self.drop = drop
+        self.dropped = 0
+        self._unreported = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # resolve %-args now since they may change later; formatting happens on the listener
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self._unreported and self._offer(self._drop_report(), evict=False):
+            self._unreported = 0
+        if not self._offer(record):
+            self.dropped += 1
+            self._unreported += 1
+
+    def _offer(self, record: logging.LogRecord, *, evict: bool = True) -> bool:
+        q = self._q
+        try:
+            q.put_nowait(record)
+            return True
+        except queue.Full:
+            if self.drop == "newest" or not evict:
+                return False
+        try:
+            q.get_nowait()
+            self.dropped += 1
+            self._unreported += 1
+            q.put_nowait(record)
+            return True
+        except (queue.Empty, queue.Full):
+            return False
+
+    def _drop_report(self) -> logging.LogRecord:
+        return logging.makeLogRecord(
+            {
+                "name": "vivariumassistant.logging",
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": "log_dropped",
+                "event": "log_dropped",
+                "dropped": self._unreported,
+                "dropped_total": self.dropped,
+            }
+        )
+
+
+class _BoundedQueueListener(QueueListener):
+    def stop(self) -> None:
+        # idempotent: setup_logging() and atexit may both stop the same listener
+        if self._thread is not None:  # type: ignore[attr-defined]
+            super().stop()
+
+    def enqueue_sentinel(self) -> None:
+        # the default put_nowait would fail on a full queue; wait for the thread to drain it
+        self.queue.put(self._sentinel)  # type: ignore[attr-defined]
+
+
+_listener: QueueListener | None = None
+
+
 def setup_logging() -> None:
     """
     Configure root logging once.
@@ -60,19 +145,38 @@ def setup_logging() -> None:
     Env vars:
       VA_LOG_LEVEL=DEBUG|INFO|WARNING|ERROR (default INFO)
       VA_LOG_FORMAT=json|text (default json)
+      VA_LOG_QUEUE=1 to format and write on a background thread (default off)
+      VA_LOG_QUEUE_SIZE=<records> bound for the queue (default 10000)
+      VA_LOG_DROP=newest|oldest which record to drop when it is full (default newest)
     """
+    global _listener
+
     level_name = os.getenv("VA_LOG_LEVEL", "INFO").upper()
     level = getattr(logging, level_name, logging.INFO)
 
     log_format = os.getenv("VA_LOG_FORMAT", "json").lower()
 
-    handler = logging.StreamHandler()
+    handler: logging.Handler = logging.StreamHandler()
     if log_format == "text":
         handler.setFormatter(logging.Formatter("[%(asctime)s] %(levelname)s %(name)s: %(message)s"))
     else:
         handler.setFormatter(JsonFormatter())
 
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+    if os.getenv("VA_LOG_QUEUE", "").strip().lower() in {"1", "true", "yes", "on"}:
+        size = int(os.getenv("VA_LOG_QUEUE_SIZE", "10000"))
+        drop: DropPolicy = "oldest" if os.getenv("VA_LOG_DROP", "").lower() == "oldest" else "newest"
+
+        q: queue.Queue[Any] = queue.Queue(maxsize=size)
+        _listener = _BoundedQueueListener(q, handler)
+        _listener.start()
+        atexit.register(_listener.stop)
+        handler = DroppingQueueHandler(q, drop=drop)
+
     root = logging.getLogger()
     root.handlers.clear()
     root.addHandler(handler)
-    root.setLevel(level)
\ No newline at end of file
+    root.setLevel(level)
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 
+from .config_schema import DeviceKind
 from .device_state import DeviceState
 
 
@@ -13,4 +15,21 @@ class ManualOverride:
     expires_at: datetime
 
     def is_active(self, now: datetime) -> bool:
-        return now < self.expires_at
\ No newline at end of file
+        return now < self.expires_at
+
+@dataclass(frozen=True, slots=True)
+class GroupOverride:
+    """
+    Override every device of `kind` (every device if kind is None) in one
+    enclosure, or in all enclosures if enclosure_id is None.
+
+    `state.device_id` is ignored; each matched device gets the state under its own id.
+    """
+
+    state: DeviceState
+    expires_at: datetime
+    kind: Optional[DeviceKind] = None
+    enclosure_id: Optional[str] = None
+
+    def is_active(self, now: datetime) -> bool:
+        return now < self.expires_at
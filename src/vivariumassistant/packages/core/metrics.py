@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Mapping
+
+# seconds; the last bucket is +Inf
+DEFAULT_BUCKETS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram: O(log buckets) to record, constant memory."""
+
+    __slots__ = ("bounds", "counts", "count", "sum", "max")
+
+    def __init__(self, bounds: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot: above every bound
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate of the q-quantile: interpolated inside the bucket that holds
+        it, and never above the largest value seen.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lo = self.bounds[i - 1] if i > 0 else 0.0
+                hi = self.bounds[i] if i < len(self.bounds) else self.max
+                return min(self.max, lo + (hi - lo) * (rank - seen) / n)
+            seen += n
+        return self.max
+
+
+class TickMetrics:
+    """
+    Timing and counters for one enclosure's control loop.
+
+    Stage spans are measured with the monotonic perf counter by the agent:
+    engine (evaluate, incl. due actuation deadlines), overrides, drivers
+    (batched writes), telemetry (incl. API snapshots), log, and total (the
+    whole tick except log).
+    `drift` is how late a tick started against its schedule.
+    """
+
+    STAGES = ("engine", "overrides", "drivers", "telemetry", "log", "total")
+
+    def __init__(self, bounds: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.stages = {stage: Histogram(bounds) for stage in self.STAGES}
+        self.drift = Histogram(bounds)
+        self.overruns = 0  # schedule slots skipped because a tick ran long or woke late
+        self.driver_writes = {"pwm": 0, "relay": 0}  # channels written
+        self.driver_batches = {"pwm": 0, "relay": 0}  # apply() calls
+
+    @property
+    def ticks(self) -> int:
+        return self.stages["total"].count
+
+    def as_dict(self) -> dict[str, float | int]:
+        total = self.stages["total"]
+        return {
+            "ticks": total.count,
+            "mean_ms": total.mean * 1000,
+            "p50_ms": total.quantile(0.5) * 1000,
+            "p99_ms": total.quantile(0.99) * 1000,
+            "max_ms": total.max * 1000,
+            "max_lag_ms": self.drift.max * 1000,
+            "overruns": self.overruns,
+            "pwm_writes": self.driver_writes["pwm"],
+            "relay_writes": self.driver_writes["relay"],
+        }
+
+
+def _escape(value: str) -> str:
+    # label values may not hold a raw backslash, double quote or newline
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    inner = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+    return "{" + inner + "}"
+
+
+def _fmt(v: float) -> str:
+    return repr(float(v)) if v != float("inf") else "+Inf"
+
+
+def _histogram_lines(name: str, h: Histogram, labels: dict[str, str], out: list[str]) -> None:
+    cumulative = 0
+    for bound, n in zip(h.bounds, h.counts):
+        cumulative += n
+        out.append(f"{name}_bucket{_labels(**labels, le=_fmt(bound))} {cumulative}")
+    out.append(f'{name}_bucket{_labels(**labels, le="+Inf")} {h.count}')
+    out.append(f"{name}_sum{_labels(**labels)} {_fmt(h.sum)}")
+    out.append(f"{name}_count{_labels(**labels)} {h.count}")
+
+
+def render_prometheus(metrics: Mapping[str, TickMetrics]) -> str:
+    """Prometheus text exposition (format 0.0.4) for per-enclosure tick metrics."""
+    out: list[str] = []
+
+    out.append("# HELP vivarium_tick_stage_seconds Time spent per control tick stage.")
+    out.append("# TYPE vivarium_tick_stage_seconds histogram")
+    for enc_id, m in metrics.items():
+        for stage, h in m.stages.items():
+            _histogram_lines(
+                "vivarium_tick_stage_seconds", h, {"enclosure": enc_id, "stage": stage}, out
+            )
+
+    out.append("# HELP vivarium_tick_stage_quantile_seconds Estimated p50/p99 per tick stage.")
+    out.append("# TYPE vivarium_tick_stage_quantile_seconds gauge")
+    for enc_id, m in metrics.items():
+        for stage, h in m.stages.items():
+            for q in ("0.5", "0.99"):
+                labels = _labels(enclosure=enc_id, stage=stage, quantile=q)
+                out.append(
+                    f"vivarium_tick_stage_quantile_seconds{labels} {_fmt(h.quantile(float(q)))}"
+                )
+
+    out.append("# HELP vivarium_tick_stage_max_seconds Slowest observation per tick stage.")
+    out.append("# TYPE vivarium_tick_stage_max_seconds gauge")
+    for enc_id, m in metrics.items():
+        for stage, h in m.stages.items():
+            labels = _labels(enclosure=enc_id, stage=stage)
+            out.append(f"vivarium_tick_stage_max_seconds{labels} {_fmt(h.max)}")
+
+    out.append("# HELP vivarium_tick_drift_seconds How late ticks started against their schedule.")
+    out.append("# TYPE vivarium_tick_drift_seconds histogram")
+    for enc_id, m in metrics.items():
+        _histogram_lines("vivarium_tick_drift_seconds", m.drift, {"enclosure": enc_id}, out)
+
+    out.append(
+        "# HELP vivarium_tick_overruns_total"
+        " Tick slots skipped because a tick ran long or woke late."
+    )
+    out.append("# TYPE vivarium_tick_overruns_total counter")
+    for enc_id, m in metrics.items():
+        out.append(f"vivarium_tick_overruns_total{_labels(enclosure=enc_id)} {m.overruns}")
+
+    out.append("# HELP vivarium_driver_writes_total Driver channels written.")
+    out.append("# TYPE vivarium_driver_writes_total counter")
+    for enc_id, m in metrics.items():
+        for driver, n in m.driver_writes.items():
+            out.append(
+                f"vivarium_driver_writes_total{_labels(enclosure=enc_id, driver=driver)} {n}"
+            )
+
+    out.append("# HELP vivarium_driver_batches_total Batched driver apply() calls.")
+    out.append("# TYPE vivarium_driver_batches_total counter")
+    for enc_id, m in metrics.items():
+        for driver, n in m.driver_batches.items():
+            out.append(
+                f"vivarium_driver_batches_total{_labels(enclosure=enc_id, driver=driver)} {n}"
+            )
+
+    return "\n".join(out) + "\n"
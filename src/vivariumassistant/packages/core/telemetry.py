@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+
+from vivariumassistant.packages.core.device_state import StateRecord
+
+
+@dataclass(frozen=True, slots=True)
+class Resolution:
+    name: str
+    seconds: int  # bucket width; 0 = raw samples
+    capacity: int  # samples (or buckets) kept
+
+    @property
+    def span_seconds(self) -> int:
+        return self.seconds * self.capacity
+
+
+# raw: 6 h at a 5 s tick; 1-min buckets for 2 days; 15-min buckets for 30 days
+DEFAULT_RESOLUTIONS = (
+    Resolution("raw", 0, 4320),
+    Resolution("1m", 60, 2880),
+    Resolution("15m", 900, 2880),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Series:
+    """
+    Query result: parallel arrays, oldest first.
+
+    Raw series have one sample per point and `low`/`high` equal to `value`;
+    downsampled series have one point per bucket (t = bucket start, value =
+    mean of the samples in it).
+    """
+
+    resolution: str
+    t_us: array[int]
+    value: array[float]
+    low: array[float]
+    high: array[float]
+
+    def __len__(self) -> int:
+        return len(self.t_us)
+
+
+class _Ring:
+    """Preallocated circular columns: one int64 time column plus float64 value columns."""
+
+    __slots__ = ("capacity", "t", "cols", "head", "size")
+
+    def __init__(self, capacity: int, ncols: int) -> None:
+        if capacity <= 0:
+            raise ValueError("ring capacity must be positive")
+        self.capacity = capacity
+        self.t = array("q", bytes(8 * capacity))
+        self.cols = [array("d", bytes(8 * capacity)) for _ in range(ncols)]
+        self.head = 0  # next slot to write
+        self.size = 0
+
+    @property
+    def nbytes(self) -> int:
+        return 8 * self.capacity * (1 + len(self.cols))
+
+    def append(self, t: int, values: tuple[float, ...]) -> None:
+        i = self.head
+        self.t[i] = t
+        for col, v in zip(self.cols, values):
+            col[i] = v
+        self.head = (i + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+
+    def covers(self, since: int) -> bool:
+        """Whether nothing at or after `since` has been overwritten yet."""
+        return self.size < self.capacity or self.t[self.head] <= since
+
+    def _bisect(self, x: int) -> int:
+        """Logical index of the first sample with t >= x."""
+        cap, start = self.capacity, (self.head - self.size) % self.capacity
+        if start + self.size <= cap:
+            return bisect_left(self.t, x, start, start + self.size) - start
+        # wrapped: older run is [start, cap), newer run is [0, end)
+        if x <= self.t[cap - 1]:
+            return bisect_left(self.t, x, start, cap) - start
+        return (cap - start) + bisect_left(self.t, x, 0, start + self.size - cap)
+
+    def window(self, since: int, until: int) -> tuple[array[int], list[array[float]]]:
+        """Copies of the samples with since <= t < until."""
+        lo, hi = self._bisect(since), self._bisect(until)
+        n = max(0, hi - lo)
+        first = (self.head - self.size + lo) % self.capacity
+        end = first + n
+        if end <= self.capacity:
+            return self.t[first:end], [c[first:end] for c in self.cols]
+        end -= self.capacity
+        return self.t[first:] + self.t[:end], [c[first:] + c[:end] for c in self.cols]
+
+
+class _Channel:
+    __slots__ = ("last_t", "raw", "rings", "widths", "bucket", "acc")
+
+    def __init__(self, resolutions: tuple[Resolution, ...]) -> None:
+        self.last_t: int | None = None
+        self.raw = _Ring(resolutions[0].capacity, 1)
+        down = resolutions[1:]
+        self.rings = [_Ring(r.capacity, 3) for r in down]
+        self.widths = [r.seconds * 1_000_000 for r in down]
+        # open bucket per resolution: start, then [sum, count, min, max]
+        self.bucket = [-1] * len(down)
+        self.acc = [[0.0, 0, 0.0, 0.0] for _ in down]
+
+    def add(self, t: int, v: float) -> bool:
+        """Record a sample; one older than the last (the clock stepped back) is dropped."""
+        if self.last_t is not None and t < self.last_t:
+            return False
+        self.last_t = t
+        self.raw.append(t, (v,))
+
+        for i, width in enumerate(self.widths):
+            start = t - t % width
+            acc = self.acc[i]
+            if start != self.bucket[i]:
+                if acc[1]:
+                    # first sample of a new bucket closes the previous one
+                    self.rings[i].append(self.bucket[i], (acc[0] / acc[1], acc[2], acc[3]))
+                self.bucket[i] = start
+                acc[0], acc[1], acc[2], acc[3] = v, 1, v, v
+            else:
+                acc[0] += v
+                acc[1] += 1
+                if v < acc[2]:
+                    acc[2] = v
+                if v > acc[3]:
+                    acc[3] = v
+        return True
+
+
+class TelemetryBuffer:
+    """
+    Fixed-memory history of device outputs (and later sensor readings) for one
+    enclosure.
+
+    Each channel (a device id, or any other name) keeps a raw ring of samples
+    plus one ring per downsampled resolution holding mean/min/max per bucket.
+    All storage is preallocated `array` columns allocated when a channel is
+    first recorded, so memory is max_bytes(channels) regardless of uptime and
+    no Python object is kept per sample. Buckets are aligned to epoch time and
+    appear in queries once the next bucket starts.
+    """
+
+    def __init__(self, resolutions: tuple[Resolution, ...] = DEFAULT_RESOLUTIONS) -> None:
+        if not resolutions or resolutions[0].seconds != 0:
+            raise ValueError("the first resolution must be raw (seconds=0)")
+        if any(r.seconds <= 0 for r in resolutions[1:]):
+            raise ValueError("downsampled resolutions need a positive bucket width")
+        self.resolutions = resolutions
+        self._channels: dict[str, _Channel] = {}
+        # samples older than their channel's newest one, e.g. after a clock step back
+        self.dropped = 0
+
+    @property
+    def channels(self) -> list[str]:
+        return list(self._channels)
+
+    def last_us(self, channel: str) -> int | None:
+        """Time of the channel's newest sample, or None if it has none."""
+        ch = self._channels.get(channel)
+        return ch.last_t if ch is not None else None
+
+    def bytes_per_channel(self) -> int:
+        return 8 * sum(r.capacity * (2 if r.seconds == 0 else 4) for r in self.resolutions)
+
+    def max_bytes(self, channels: int) -> int:
+        """Array memory for `channels` channels (the ceiling, reached at allocation)."""
+        return channels * self.bytes_per_channel()
+
+    def record(self, t_us: int, channel: str, value: float) -> None:
+        ch = self._channels.get(channel)
+        if ch is None:
+            ch = self._channels[channel] = _Channel(self.resolutions)
+        if not ch.add(t_us, value):
+            self.dropped += 1
+
+    def record_states(self, t_us: int, states: Mapping[str, StateRecord]) -> None:
+        """One sample per device: its level if it has one, else 1.0/0.0 for on/off."""
+        for device_id, state in states.items():
+            level = state.level
+            self.record(t_us, device_id, level if level is not None else float(state.on))
+
+    def record_many(self, t_us: int, values: Iterable[tuple[str, float]]) -> None:
+        for channel, value in values:
+            self.record(t_us, channel, value)
+
+    def series(
+        self,
+        channel: str,
+        since_us: int,
+        until_us: int | None = None,
+        *,
+        resolution: str | None = None,
+    ) -> Series:
+        """
+        Samples of `channel` with since_us <= t < until_us.
+
+        With resolution=None the finest resolution whose history still reaches
+        back to since_us is used (the coarsest one if none does).
+        """
+        ch = self._channels.get(channel)
+        if ch is None:
+            raise KeyError(channel)
+        until = until_us if until_us is not None else (ch.last_t or 0) + 1
+
+        rings = [ch.raw, *ch.rings]
+        names = [r.name for r in self.resolutions]
+        if resolution is None:
+            i = next((k for k, ring in enumerate(rings) if ring.covers(since_us)), len(rings) - 1)
+        else:
+            i = names.index(resolution)
+
+        t, cols = rings[i].window(since_us, until)
+        if i == 0:
+            return Series(names[0], t, cols[0], cols[0], cols[0])
+        return Series(names[i], t, cols[0], cols[1], cols[2])
@@ -1,5 +1,9 @@
 from __future__ import annotations
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Optional
 
 class PWMDriver(ABC):
     @abstractmethod
@@ -7,8 +11,30 @@ class PWMDriver(ABC):
     @abstractmethod
     async def get_level(self, channel: int) -> float: ...
 
+    async def apply(self, levels: Mapping[int, float]) -> None:
+        """Set several channels at once. Drivers that can batch writes override this."""
+        await asyncio.gather(*(self.set_level(ch, lvl) for ch, lvl in levels.items()))
+
 class RelayDriver(ABC):
     @abstractmethod
     async def set_on(self, channel: int, on: bool) -> None: ...
     @abstractmethod
-    async def get_on(self, channel: int) -> bool: ...
\ No newline at end of file
+    async def get_on(self, channel: int) -> bool: ...
+
+    async def apply(self, states: Mapping[int, bool]) -> None:
+        """Switch several channels at once. Drivers that can batch writes override this."""
+        await asyncio.gather(*(self.set_on(ch, on) for ch, on in states.items()))
+
+@dataclass(frozen=True, slots=True)
+class SensorReading:
+    """One sample from a sensor; fields the sensor does not measure are None."""
+    temperature_c: Optional[float] = None
+    humidity_pct: Optional[float] = None
+
+class SensorDriver(ABC):
+    """
+    One physical sensor. read() must not block the event loop: drivers backed
+    by a synchronous bus library should do the transfer in a worker thread.
+    """
+    @abstractmethod
+    async def read(self) -> SensorReading: ...
@@ -1,16 +1,28 @@
 from __future__ import annotations
 
+import asyncio
+import importlib
+import logging
 import os
 import platform
 from dataclasses import dataclass
-from typing import Any
+from types import ModuleType
+from typing import Any, cast
 
-from vivariumassistant.packages.core.config_schema import EnclosureConfig
-from vivariumassistant.packages.drivers.base import PWMDriver, RelayDriver
+from vivariumassistant.packages.core.config_schema import DeviceConfig, EnclosureConfig
+from vivariumassistant.packages.drivers.base import PWMDriver, RelayDriver, SensorDriver
 from vivariumassistant.packages.simulator.pwm import SimPWMDriver
 from vivariumassistant.packages.simulator.relay import SimRelayDriver
+from vivariumassistant.packages.simulator.sensor import SimSensorDriver
 
-VA_GPIOZERO_MODULE = "gpiozero"
+logger = logging.getLogger("vivariumassistant.drivers")
+
+# module providing the gpiozero output devices; VA_GPIOZERO_MODULE swaps it, e.g. for the fake
+GPIOZERO_MODULE = "gpiozero"
+FAKE_GPIOZERO_MODULE = "vivariumassistant.packages.simulator.fake_gpiozero"
+# module providing SMBus for I2C devices; VA_SMBUS_MODULE swaps it the same way
+SMBUS_MODULE = "smbus2"
+FAKE_SMBUS_MODULE = "vivariumassistant.packages.simulator.fake_smbus"
 
 
 @dataclass(frozen=True)
@@ -19,6 +31,18 @@ class DriverBundle:
     relay: RelayDriver
     mode: str  # "sim" | "real"
 
+    async def close(self) -> None:
+        """
+        Safe-off every hardware output: relays (water, UVB) first, then PWM.
+
+        Hardware drivers block while their I/O worker finishes, so each close()
+        runs in a thread. SIM drivers have nothing to close.
+        """
+        for driver in (self.relay, self.pwm):
+            close = getattr(driver, "close", None)
+            if close is not None:
+                await asyncio.to_thread(close)
+
 
 def _real_mode_enabled() -> bool:
     """
@@ -48,28 +72,57 @@ def _assert_supported_real_platform() -> None:
         )
 
 
-def _assert_real_deps_available() -> None:
+def _gpiozero_module_name() -> str:
+    return os.getenv("VA_GPIOZERO_MODULE", "").strip() or GPIOZERO_MODULE
+
+
+def _assert_real_deps_available() -> ModuleType:
     """
-    Ensure the expected GPIO dependency is installed.
+    Ensure the expected GPIO dependency is installed, and return it.
     Import is intentionally local so SIM/dev environments do not require it.
     """
+    name = _gpiozero_module_name()
     try:
-        import importlib
-
-        importlib.import_module(VA_GPIOZERO_MODULE)
+        return importlib.import_module(name)
     except Exception as e:
         raise RuntimeError(
-            f"REAL mode requires the '{VA_GPIOZERO_MODULE}' dependency. "
+            f"REAL mode requires the '{name}' dependency. "
             "Install it (on Pi) with: poetry add gpiozero"
         ) from e
 
 
-def _get_int_param(params: dict[str, Any], key: str) -> int:
-    val = params.get(key)
+def _smbus_module_name() -> str:
+    return os.getenv("VA_SMBUS_MODULE", "").strip() or SMBUS_MODULE
+
+
+def _open_smbus(bus: int) -> Any:
+    """
+    A new SMBus handle, owned (and closed) by the one driver it is given to.
+
+    Handles are never shared between drivers: smbus2 selects the slave address
+    and runs the transfer in two separate ioctls on the fd, so two drivers'
+    worker threads on one handle could send a transfer to the other's chip.
+    Separate handles keep their own address, and the kernel serialises the
+    transfers on the adapter.
+    """
+    name = _smbus_module_name()
+    try:
+        module = importlib.import_module(name)
+    except Exception as e:
+        raise RuntimeError(
+            f"REAL mode requires the '{name}' dependency for I2C devices. "
+            "Install it (on Pi) with: poetry add smbus2"
+        ) from e
+    return module.SMBus(bus)
+
+
+def _get_int_param(params: dict[str, Any], key: str, default: int | None = None) -> int:
+    val = params.get(key, default)
     if val is None:
         raise RuntimeError(f"Missing required device param: {key}")
     try:
-        return int(val)
+        # I2C addresses are usually written in hex ("0x40")
+        return int(val, 0) if isinstance(val, str) else int(val)
     except Exception as e:
         raise RuntimeError(f"Invalid int for device param '{key}': {val!r}") from e
 
@@ -84,10 +137,6 @@ def build_drivers(enc: EnclosureConfig) -> DriverBundle:
                 "Set VA_ENABLE_REAL=1 to explicitly allow hardware drivers."
             )
 
-        # Provide clear, actionable errors before we ever touch GPIO.
-        _assert_supported_real_platform()
-        _assert_real_deps_available()
-
         # IMPORTANT: names here must match your class names exactly.
         from vivariumassistant.packages.drivers.real_pwm_gpiozero import RealPWMDriverGpioZero
         from vivariumassistant.packages.drivers.real_relay_gpiozero import RealRelayDriverGpioZero
@@ -100,9 +149,18 @@ def build_drivers(enc: EnclosureConfig) -> DriverBundle:
 
         pwm_pin_by_channel: dict[int, int] = {}
         relay_pin_by_channel: dict[int, int] = {}
+        pca9685_lights: list[DeviceConfig] = []
+        i2c_relays: list[DeviceConfig] = []
 
         for d in enc.devices:
             params: dict[str, Any] = d.params
+            if d.kind in pwm_kinds and d.driver == "pca9685":
+                pca9685_lights.append(d)
+                continue
+            if d.kind in relay_kinds and d.driver == "i2c_relay":
+                i2c_relays.append(d)
+                continue
+
             gpio_pin = params.get("gpio_pin")
             if gpio_pin is None:
                 continue
@@ -115,20 +173,153 @@ def build_drivers(enc: EnclosureConfig) -> DriverBundle:
             elif d.kind in relay_kinds:
                 relay_pin_by_channel[ch] = pin
 
+        if pca9685_lights and pwm_pin_by_channel:
+            raise RuntimeError(
+                "Lights on both a pca9685 and GPIO pins are not supported: "
+                "an enclosure has one PWM driver."
+            )
+        if i2c_relays and relay_pin_by_channel:
+            raise RuntimeError(
+                "Relays on both an i2c_relay board and GPIO pins are not supported: "
+                "an enclosure has one relay driver."
+            )
+        uses_gpio = bool(pwm_pin_by_channel or relay_pin_by_channel)
+        uses_i2c = bool(pca9685_lights or i2c_relays)
+
+        # Provide clear, actionable errors before we ever touch GPIO or the bus.
+        # The fake modules touch no hardware, so they run anywhere.
+        if (uses_gpio and _gpiozero_module_name() != FAKE_GPIOZERO_MODULE) or (
+            uses_i2c and _smbus_module_name() != FAKE_SMBUS_MODULE
+        ):
+            _assert_supported_real_platform()
+        gpio = _assert_real_deps_available() if uses_gpio else None
+
         # Allow REAL mode with only relay, only pwm, or both.
-        pwm: PWMDriver = (
-            RealPWMDriverGpioZero(pin_by_channel=pwm_pin_by_channel)
-            if pwm_pin_by_channel
-            else SimPWMDriver()
-        )
-        relay: RelayDriver = (
-            RealRelayDriverGpioZero(pin_by_channel=relay_pin_by_channel)
-            if relay_pin_by_channel
-            else SimRelayDriver()
-        )
+        pwm: PWMDriver
+        if pca9685_lights:
+            pwm = _build_pca9685(pca9685_lights)
+        elif pwm_pin_by_channel:
+            pwm = RealPWMDriverGpioZero(pin_by_channel=pwm_pin_by_channel, gpio=gpio)
+        else:
+            pwm = SimPWMDriver()
+        relay: RelayDriver
+        if i2c_relays:
+            relay = _build_i2c_relay(i2c_relays)
+        elif relay_pin_by_channel:
+            relay = RealRelayDriverGpioZero(pin_by_channel=relay_pin_by_channel, gpio=gpio)
+        else:
+            relay = SimRelayDriver()
 
         # Safety note: REAL drivers should default OFF / 0.0 on creation.
         return DriverBundle(pwm=pwm, relay=relay, mode="real")
 
     # Default: SIM drivers
-    return DriverBundle(pwm=SimPWMDriver(), relay=SimRelayDriver(), mode="sim")
\ No newline at end of file
+    return DriverBundle(pwm=SimPWMDriver(), relay=SimRelayDriver(), mode="sim")
+
+
+def _get_bool_param(params: dict[str, Any], key: str) -> bool:
+    val = params.get(key, False)
+    if isinstance(val, bool):
+        return val
+    return str(val).strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _build_pca9685(devices: list[DeviceConfig]) -> PWMDriver:
+    """
+    One PCA9685 driving every `driver: pca9685` light.
+
+    Params: channel (0-15), i2c_bus (1), i2c_addr (0x40), pwm_freq_hz (1000)
+    and resolution_bits (12). The chip settings must agree across the lights.
+    """
+    from vivariumassistant.packages.drivers.pca9685 import PCA9685PWMDriver
+
+    channels: set[int] = set()
+    settings: set[tuple[int, int, float, int]] = set()
+    for d in devices:
+        params: dict[str, Any] = d.params
+        channels.add(_get_int_param(params, "channel"))
+        settings.add(
+            (
+                _get_int_param(params, "i2c_bus", 1),
+                _get_int_param(params, "i2c_addr", 0x40),
+                float(params.get("pwm_freq_hz", 1000)),
+                _get_int_param(params, "resolution_bits", 12),
+            )
+        )
+    if len(settings) > 1:
+        raise RuntimeError(
+            "pca9685 lights disagree on i2c_bus/i2c_addr/pwm_freq_hz/resolution_bits: "
+            f"{sorted(settings)}"
+        )
+    bus, address, freq_hz, bits = settings.pop()
+    return PCA9685PWMDriver(
+        _open_smbus(bus),
+        address=address,
+        channels=channels,
+        freq_hz=freq_hz,
+        resolution_bits=bits,
+    )
+
+
+def _build_i2c_relay(devices: list[DeviceConfig]) -> RelayDriver:
+    """
+    One I2C I/O expander switching every `driver: i2c_relay` device.
+
+    Params: channel, bit (the expander output; defaults to the channel),
+    i2c_bus (1), i2c_addr (0x20), chip (pcf8574 | mcp23017), active_low and
+    verify (both false). The board settings must agree across the devices.
+    """
+    from vivariumassistant.packages.drivers.i2c_relay import PORT_BITS, Chip, I2CRelayDriver
+
+    bit_by_channel: dict[int, int] = {}
+    settings: set[tuple[int, int, str, bool, bool]] = set()
+    for d in devices:
+        params: dict[str, Any] = d.params
+        ch = _get_int_param(params, "channel")
+        bit_by_channel[ch] = _get_int_param(params, "bit", ch)
+        settings.add(
+            (
+                _get_int_param(params, "i2c_bus", 1),
+                _get_int_param(params, "i2c_addr", 0x20),
+                str(params.get("chip", "pcf8574")).lower(),
+                _get_bool_param(params, "active_low"),
+                _get_bool_param(params, "verify"),
+            )
+        )
+    if len(settings) > 1:
+        raise RuntimeError(
+            "i2c_relay devices disagree on i2c_bus/i2c_addr/chip/active_low/verify: "
+            f"{sorted(settings)}"
+        )
+    bus, address, chip, active_low, verify = settings.pop()
+    if chip not in PORT_BITS:
+        raise RuntimeError(f"Unsupported i2c_relay chip {chip!r}; use one of {sorted(PORT_BITS)}")
+    return I2CRelayDriver(
+        _open_smbus(bus),
+        bit_by_channel,
+        chip=cast(Chip, chip),
+        address=address,
+        active_low=active_low,
+        verify=verify,
+    )
+
+
+def build_sensors(enc: EnclosureConfig) -> dict[str, SensorDriver]:
+    """
+    One driver per configured sensor, keyed by sensor id.
+
+    SIM mode simulates every sensor. REAL mode has no hardware sensor drivers
+    yet, so configured sensors are skipped (with a warning) rather than fed
+    simulated values.
+    """
+    mode = getattr(getattr(enc, "runtime", None), "mode", "sim")
+
+    if mode == "real":
+        for s in enc.sensors:
+            logger.warning(
+                "sensor_driver_unavailable",
+                extra={"event": "sensor_driver_unavailable", "sensor_id": s.id, "driver": s.driver},
+            )
+        return {}
+
+    return {s.id: SimSensorDriver(s.kind) for s in enc.sensors}
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections.abc import Callable, Collection, Hashable, Iterable
+
+logger = logging.getLogger("vivariumassistant.drivers")
+
+# a blocking pin write, run on the worker thread
+Write = Callable[[], None]
+
+
+class _Command:
+    __slots__ = ("write", "waiters")
+
+    def __init__(self, write: Write) -> None:
+        self.write = write
+        self.waiters: list[asyncio.Future[None]] = []
+
+
+def _settle(fut: asyncio.Future[None], exc: BaseException | None) -> None:
+    if fut.done():  # the caller stopped waiting
+        return
+    if exc is None:
+        fut.set_result(None)
+    else:
+        fut.set_exception(exc)
+
+
+def _discard(fut: asyncio.Future[None]) -> None:
+    if not fut.cancelled():
+        fut.exception()
+
+
+class HardwareWorker:
+    """
+    A thread that owns every blocking write of one driver.
+
+    Drivers submit(channel, write) from the event loop and await the future
+    they get back; the loop itself never calls into the GPIO library. Writes
+    for a channel that is still queued coalesce: the latest one replaces it
+    (last write wins) and everyone waiting on that channel completes when it
+    lands. A slow or hung pin therefore stalls only this thread, and the
+    queue never holds more than one write per channel however long it hangs.
+
+    close() drops whatever is still queued and runs the safe-off steps, in
+    order, as the thread's last work.
+    """
+
+    def __init__(self, name: str = "hw-io") -> None:
+        self.name = name
+        self.writes = 0  # writes run
+        self.coalesced = 0  # writes replaced by a later one before they ran
+        self._cond = threading.Condition()
+        self._pending: dict[Hashable, _Command] = {}  # oldest first
+        self._safe_off: list[Write] = []
+        self._closing = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, key: Hashable, write: Write) -> asyncio.Future[None]:
+        """Queue `write` for `key` (a channel); the future completes once it ran."""
+        fut = asyncio.get_running_loop().create_future()
+        with self._cond:
+            if self._closing:
+                raise RuntimeError(f"{self.name} is closed")
+            cmd = self._pending.get(key)
+            if cmd is None:
+                cmd = self._pending[key] = _Command(write)
+                self._cond.notify()
+            else:
+                cmd.write = write
+                self.coalesced += 1
+            cmd.waiters.append(fut)
+        return fut
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def close(self, safe_off: Iterable[Write] = (), timeout: float = 5.0) -> bool:
+        """
+        Drop queued writes, run `safe_off` in order and stop the thread.
+
+        Blocks for up to `timeout` seconds, so call it off the event loop.
+        Returns whether the thread finished; one stuck in a hung write is left
+        behind (it is a daemon) rather than holding up shutdown.
+        """
+        with self._cond:
+            dropped = list(self._pending.values())
+            self._pending.clear()
+            if not self._closing:
+                self._closing = True
+                self._safe_off = list(safe_off)
+                self._cond.notify()
+        closed = RuntimeError(f"{self.name} closed before the write ran")
+        for cmd in dropped:
+            self._resolve(cmd.waiters, closed)
+
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.error(
+                "hw_worker_hung",
+                extra={"event": "hw_worker_hung", "worker": self.name, "timeout_s": timeout},
+            )
+            return False
+        return True
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closing:
+                    self._cond.wait()
+                if not self._pending:
+                    break
+                key = next(iter(self._pending))
+                cmd = self._pending.pop(key)
+            exc: BaseException | None = None
+            try:
+                cmd.write()
+            except Exception as e:
+                exc = e
+            self.writes += 1
+            self._resolve(cmd.waiters, exc)
+
+        for step in self._safe_off:
+            try:
+                step()
+            except Exception:
+                logger.exception(
+                    "safe_off_failed", extra={"event": "safe_off_failed", "worker": self.name}
+                )
+
+    @staticmethod
+    def _resolve(waiters: list[asyncio.Future[None]], exc: BaseException | None) -> None:
+        for fut in waiters:
+            try:
+                fut.get_loop().call_soon_threadsafe(_settle, fut, exc)
+            except RuntimeError:  # its loop is already closed
+                pass
+
+
+async def wait_written(futures: Collection[asyncio.Future[None]], timeout: float) -> None:
+    """
+    Wait for submitted writes to land.
+
+    Raises TimeoutError if some have not within `timeout` seconds. The writes
+    stay queued; later writes to their channels still replace them. Their
+    futures still complete once they land, so done-callbacks see the outcome.
+    """
+    if not futures:
+        return
+    done, pending = await asyncio.wait(futures, timeout=timeout)
+    for fut in pending:
+        # nobody awaits it any more: keep a late failure from being reported as unretrieved
+        fut.add_done_callback(_discard)
+    if pending:
+        raise TimeoutError(f"{len(pending)} pin write(s) still pending after {timeout}s")
+    for fut in done:
+        fut.result()
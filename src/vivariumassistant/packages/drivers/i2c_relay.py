@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Mapping
+from typing import Literal, Protocol
+
+from vivariumassistant.packages.drivers.base import RelayDriver
+from vivariumassistant.packages.drivers.hw_worker import HardwareWorker, wait_written
+
+Chip = Literal["pcf8574", "mcp23017"]
+
+# MCP23017 registers (IOCON.BANK = 0: A and B ports interleaved, sequential access)
+IODIRA = 0x00
+OLATA = 0x14
+
+PORT_BITS: dict[Chip, int] = {"pcf8574": 8, "mcp23017": 16}
+
+
+class ExpanderBus(Protocol):
+    """The SMBus calls an I/O expander needs (smbus2.SMBus, or the fake)."""
+
+    def write_byte(self, i2c_addr: int, value: int) -> None: ...
+    def read_byte(self, i2c_addr: int) -> int: ...
+    def write_i2c_block_data(self, i2c_addr: int, register: int, data: list[int]) -> None: ...
+    def read_i2c_block_data(self, i2c_addr: int, register: int, length: int) -> list[int]: ...
+    def close(self) -> None: ...
+
+
+class I2CRelayDriver(RelayDriver):
+    """
+    Relay board behind an I2C I/O expander: PCF8574 (8 outputs) or MCP23017 (16).
+
+    The expander's output port is one byte (PCF8574) or one word (MCP23017),
+    so the driver keeps a shadow of the value on the chip. apply() sets the
+    bits for every changed channel and sends the port in a single write. A
+    tick that switches all relays costs one transaction, not one per relay,
+    and a batch that changes nothing costs none.
+
+    `active_low` inverts every bit; most opto-isolated relay boards switch
+    on a low output. With `verify` the port is read back after each write.
+    On a mismatch (a glitch on the bus, an expander that reset) the driver
+    raises, forgets its shadow and reinitialises the chip on the next write.
+
+    Bus transfers run on a HardwareWorker thread. Changes made while a write
+    is queued join it. The driver owns `bus`: close() switches every relay
+    off and closes it.
+    """
+
+    def __init__(
+        self,
+        bus: ExpanderBus,
+        bit_by_channel: dict[int, int],
+        *,
+        chip: Chip = "pcf8574",
+        address: int = 0x20,
+        active_low: bool = False,
+        verify: bool = False,
+        write_timeout: float = 1.0,
+    ) -> None:
+        width = PORT_BITS[chip]
+        for ch, bit in bit_by_channel.items():
+            if not 0 <= bit < width:
+                raise ValueError(f"{chip} has no output {bit} (channel {ch})")
+        self.bus = bus
+        self.chip = chip
+        self.address = address
+        self.verify = verify
+        self.write_timeout = write_timeout
+        self.transactions = 0  # port writes issued
+        self._bits = dict(bit_by_channel)
+        self._invert = (1 << width) - 1 if active_low else 0
+        self._state: dict[int, bool] = {}
+
+        # port values (logical: bit set = relay on): wanted, and on the chip (None: unknown)
+        self._lock = threading.Lock()
+        self._target = 0
+        self._shadow: int | None = None
+
+        self._flush()  # every relay off before anything else
+        self._worker = HardwareWorker("i2c-relay")
+
+    async def set_on(self, channel: int, on: bool) -> None:
+        await self.apply({channel: on})
+
+    async def apply(self, states: Mapping[int, bool]) -> None:
+        with self._lock:
+            target = self._target
+            for ch, on in states.items():
+                mask = 1 << self._bits[ch]
+                target = target | mask if on else target & ~mask
+            changed = target != self._target or target != self._shadow
+            self._target = target
+        if changed:
+            await wait_written([self._worker.submit("port", self._flush)], self.write_timeout)
+        for ch, on in states.items():
+            self._state[ch] = bool(on)
+
+    async def get_on(self, channel: int) -> bool:
+        return bool(self._state.get(channel, False))
+
+    def _flush(self) -> None:
+        # worker thread (and __init__): bring the chip's port to the target
+        with self._lock:
+            port, shadow = self._target, self._shadow
+        if port == shadow:
+            return
+        raw = port ^ self._invert
+        bus, addr = self.bus, self.address
+        if self.chip == "pcf8574":
+            bus.write_byte(addr, raw)
+        else:
+            bus.write_i2c_block_data(addr, OLATA, [raw & 0xFF, raw >> 8])
+            if shadow is None:
+                # outputs only once their latch holds a known value
+                bus.write_i2c_block_data(addr, IODIRA, [0x00, 0x00])
+        self.transactions += 1
+
+        if self.verify:
+            readback = self._read_port()
+            if readback != raw:
+                with self._lock:
+                    self._shadow = None
+                raise RuntimeError(
+                    f"{self.chip} at {addr:#04x}: wrote {raw:#06x}, read back {readback:#06x}"
+                )
+        with self._lock:
+            self._shadow = port
+
+    def _read_port(self) -> int:
+        if self.chip == "pcf8574":
+            return self.bus.read_byte(self.address)
+        lo, hi = self.bus.read_i2c_block_data(self.address, OLATA, 2)
+        return lo | hi << 8
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Best-effort safe shutdown: every relay off, then the bus handle closed."""
+
+        def all_off() -> None:
+            with self._lock:
+                self._target = 0
+            self._flush()
+
+        # a worker stuck in a transfer still uses the handle
+        if self._worker.close([all_off], timeout):
+            self.bus.close()
+        self._state.clear()
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Mapping
+from typing import Protocol
+
+from vivariumassistant.packages.drivers.base import PWMDriver
+from vivariumassistant.packages.drivers.hw_worker import HardwareWorker, wait_written
+
+# registers
+MODE1 = 0x00
+MODE2 = 0x01
+LED0_ON_L = 0x06  # 4 registers per channel: ON_L, ON_H, OFF_L, OFF_H
+ALL_LED_ON_L = 0xFA
+PRESCALE = 0xFE
+
+# MODE1 / MODE2 bits
+RESTART = 0x80
+AI = 0x20  # register auto-increment
+SLEEP = 0x10
+OUTDRV = 0x04  # totem-pole outputs
+FULL = 0x10  # bit 4 of ON_H / OFF_H: fully on / fully off
+
+CHANNELS = 16
+OSC_HZ = 25_000_000
+BLOCK_MAX = 32  # bytes per SMBus block write: 8 channels
+FULL_ON = 4096  # register code for a channel held fully on
+
+
+class SMBusLike(Protocol):
+    """The SMBus calls the I2C drivers make (smbus2.SMBus, or the fake)."""
+
+    def write_byte_data(self, i2c_addr: int, register: int, value: int) -> None: ...
+    def read_byte_data(self, i2c_addr: int, register: int) -> int: ...
+    def write_i2c_block_data(self, i2c_addr: int, register: int, data: list[int]) -> None: ...
+    def close(self) -> None: ...
+
+
+def prescale_for(freq_hz: float) -> int:
+    """PRESCALE register value for a PWM frequency (the chip supports ~24-1526 Hz)."""
+    return max(3, min(255, round(OSC_HZ / (4096 * freq_hz)) - 1))
+
+
+def led_bytes(code: int) -> list[int]:
+    """ON_L, ON_H, OFF_L, OFF_H for a register code (0 off, FULL_ON on, else OFF count)."""
+    if code <= 0:
+        return [0, 0, 0, FULL]
+    if code >= FULL_ON:
+        return [0, FULL, 0, 0]
+    return [0, 0, code & 0xFF, code >> 8]
+
+
+class PCA9685PWMDriver(PWMDriver):
+    """
+    PCA9685 16-channel PWM controller on an I2C bus.
+
+    The driver caches the LED registers it last wrote. apply() turns levels
+    into 12-bit register codes and skips channels whose code is already on
+    the chip. The changed channels then go out with register auto-increment,
+    as few block writes as the 32-byte SMBus limit allows. That means one
+    transaction for any changes within eight consecutive channels, not one
+    per channel.
+
+    `resolution_bits` (1-12) quantizes levels to that many bits. The default
+    uses the chip's full 12 bits; 8 matches the agent's default 256 steps.
+
+    Bus transfers run on a HardwareWorker thread, like the gpiozero
+    drivers. Changes made while a write is still queued join it, so a busy
+    bus coalesces updates instead of queueing them. The driver owns `bus`:
+    close() switches every channel off, puts the chip to sleep and closes it.
+    """
+
+    def __init__(
+        self,
+        bus: SMBusLike,
+        *,
+        address: int = 0x40,
+        channels: set[int] | None = None,
+        freq_hz: float = 1000.0,
+        resolution_bits: int = 12,
+        write_timeout: float = 1.0,
+    ) -> None:
+        if not 1 <= resolution_bits <= 12:
+            raise ValueError("resolution_bits must be between 1 and 12")
+        self.bus = bus
+        self.address = address
+        self.resolution = 1 << resolution_bits
+        self.write_timeout = write_timeout
+        self.transactions = 0  # bus writes issued for LED registers
+        self._channels = set(range(CHANNELS)) if channels is None else set(channels)
+        for ch in self._channels:
+            if not 0 <= ch < CHANNELS:
+                raise ValueError(f"PCA9685 has no channel {ch}")
+        self._shift = 12 - resolution_bits
+        self._levels: dict[int, float] = {}
+
+        # register codes: what the chip holds, and what apply() asked for
+        self._lock = threading.Lock()
+        self._regs = [0] * CHANNELS
+        self._target = [0] * CHANNELS
+
+        self._init_chip(freq_hz)
+        self._worker = HardwareWorker("pca9685")
+
+    def _init_chip(self, freq_hz: float) -> None:
+        bus, addr = self.bus, self.address
+        # the prescaler is only writable while the oscillator sleeps
+        bus.write_byte_data(addr, MODE1, SLEEP | AI)
+        bus.write_i2c_block_data(addr, ALL_LED_ON_L, led_bytes(0))
+        bus.write_byte_data(addr, MODE2, OUTDRV)
+        bus.write_byte_data(addr, PRESCALE, prescale_for(freq_hz))
+        bus.write_byte_data(addr, MODE1, AI)
+        time.sleep(0.0005)  # oscillator start-up
+        bus.write_byte_data(addr, MODE1, AI | RESTART)
+
+    def code_for(self, level: float) -> int:
+        """Register code for a level at the configured resolution."""
+        top = self.resolution - 1
+        steps = round(max(0.0, min(1.0, float(level))) * top)
+        if steps >= top:
+            return FULL_ON
+        return steps << self._shift
+
+    async def set_level(self, channel: int, level: float) -> None:
+        await self.apply({channel: level})
+
+    async def apply(self, levels: Mapping[int, float]) -> None:
+        changed = False
+        with self._lock:
+            for ch, level in levels.items():
+                if ch not in self._channels:
+                    raise KeyError(ch)
+                code = self.code_for(level)
+                # a new target, or one still waiting for (or in) a flush
+                changed = changed or code != self._target[ch] or code != self._regs[ch]
+                self._target[ch] = code
+        if changed:
+            await wait_written([self._worker.submit("leds", self._flush)], self.write_timeout)
+        for ch, level in levels.items():
+            self._levels[ch] = max(0.0, min(1.0, float(level)))
+
+    async def get_level(self, channel: int) -> float:
+        return float(self._levels.get(channel, 0.0))
+
+    def _flush(self) -> None:
+        # worker thread: write every channel whose target differs from the chip
+        with self._lock:
+            target = list(self._target)
+            regs = list(self._regs)
+        changed = [ch for ch in range(CHANNELS) if target[ch] != regs[ch]]
+        per_block = BLOCK_MAX // 4
+        i = 0
+        while i < len(changed):
+            first = last = changed[i]
+            i += 1
+            # take further changes while the span (unchanged channels included) fits one block
+            while i < len(changed) and changed[i] - first < per_block:
+                last = changed[i]
+                i += 1
+            data: list[int] = []
+            for ch in range(first, last + 1):
+                data += led_bytes(target[ch])
+            self.bus.write_i2c_block_data(self.address, LED0_ON_L + 4 * first, data)
+            self.transactions += 1
+            with self._lock:
+                self._regs[first : last + 1] = target[first : last + 1]
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Best-effort safe shutdown: every channel off, the oscillator to sleep,
+        then the driver's bus handle closed.
+        """
+        bus, addr = self.bus, self.address
+
+        def all_off() -> None:
+            bus.write_i2c_block_data(addr, ALL_LED_ON_L, led_bytes(0))
+            with self._lock:
+                self._regs[:] = [0] * CHANNELS
+
+        done = self._worker.close(
+            [all_off, lambda: bus.write_byte_data(addr, MODE1, SLEEP | AI)], timeout
+        )
+        # a worker stuck in a transfer still uses the handle
+        if done:
+            bus.close()
+        self._levels.clear()
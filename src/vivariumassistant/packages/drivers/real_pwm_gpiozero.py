@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Mapping
+from functools import partial
+from types import ModuleType
 from typing import Protocol, cast
 
 from vivariumassistant.packages.drivers.base import PWMDriver
+from vivariumassistant.packages.drivers.hw_worker import HardwareWorker, wait_written
 
 # Guarded import so Codespaces/laptops don’t require gpiozero.
 try:
@@ -25,45 +30,71 @@ class RealPWMDriverGpioZero(PWMDriver):
     """
     Real PWM driver using gpiozero. Channels map to BCM GPIO pins.
 
+    Pin writes run on the driver's own HardwareWorker thread, never on the
+    event loop. apply() queues every channel and waits up to `write_timeout`
+    seconds for them; past that it raises TimeoutError and the loop moves on
+    while the write stays queued. get_level() reports it once it lands.
+
     Safety:
     - Outputs default to 0.0 on creation.
+    - close() drops queued writes and turns every output off.
     - This driver should only be constructed behind REAL-mode safety gate.
     """
 
-    def __init__(self, pin_by_channel: dict[int, int]) -> None:
-        if PWMOutputDevice is None:
+    def __init__(
+        self,
+        pin_by_channel: dict[int, int],
+        *,
+        gpio: ModuleType | None = None,
+        write_timeout: float = 1.0,
+    ) -> None:
+        # `gpio` stands in for the gpiozero module (the fake one in tests)
+        device_cls = PWMOutputDevice if gpio is None else gpio.PWMOutputDevice
+        if device_cls is None:
             raise RuntimeError(
                 "gpiozero is not available. Install it on the Raspberry Pi environment "
                 "(e.g., `poetry add gpiozero`) and run with REAL mode enabled."
             )
 
+        self.write_timeout = write_timeout
         self._channels: dict[int, _PWMDevice] = {}
         self._levels: dict[int, float] = {}
 
         for ch, bcm_pin in pin_by_channel.items():
-            dev = PWMOutputDevice(bcm_pin, initial_value=0.0)  # type: ignore[misc]
+            dev = device_cls(bcm_pin, initial_value=0.0)
             self._channels[ch] = cast(_PWMDevice, dev)
             self._levels[ch] = 0.0
+        self._worker = HardwareWorker("gpio-pwm")
 
     async def set_level(self, channel: int, level: float) -> None:
-        lvl = max(0.0, min(1.0, float(level)))
-        dev = self._channels[channel]
-        dev.value = lvl
-        self._levels[channel] = lvl
+        await self.apply({channel: level})
+
+    async def apply(self, levels: Mapping[int, float]) -> None:
+        futures = []
+        for ch, level in levels.items():
+            lvl = max(0.0, min(1.0, float(level)))
+            dev = self._channels[ch]
+            fut = self._worker.submit(ch, partial(setattr, dev, "value", lvl))
+            # levels read back are the ones that reached the pins, late ones included
+            fut.add_done_callback(partial(self._landed, ch, lvl))
+            futures.append(fut)
+        await wait_written(futures, self.write_timeout)
+
+    def _landed(self, channel: int, level: float, fut: asyncio.Future[None]) -> None:
+        if not fut.cancelled() and fut.exception() is None:
+            self._levels[channel] = level
 
     async def get_level(self, channel: int) -> float:
         return float(self._levels.get(channel, 0.0))
 
-    def close(self) -> None:
-        """Best-effort safe shutdown."""
-        for dev in self._channels.values():
-            try:
-                dev.off()
-            except Exception:
-                pass
-            try:
-                dev.close()
-            except Exception:
-                pass
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Best-effort safe shutdown: every output off, then released.
+
+        Runs on the I/O worker after the writes still queued are dropped, and
+        blocks for up to `timeout` seconds.
+        """
+        devices = list(self._channels.values())
+        self._worker.close([d.off for d in devices] + [d.close for d in devices], timeout)
         self._channels.clear()
-        self._levels.clear()
\ No newline at end of file
+        self._levels.clear()
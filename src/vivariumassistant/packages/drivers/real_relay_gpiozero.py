@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Mapping
+from functools import partial
+from types import ModuleType
 from typing import Protocol, cast
 
 from vivariumassistant.packages.drivers.base import RelayDriver
+from vivariumassistant.packages.drivers.hw_worker import HardwareWorker, wait_written
 
 # Guarded import so non-Pi dev environments don't require gpiozero.
 try:
@@ -22,47 +27,67 @@ class RealRelayDriverGpioZero(RelayDriver):
     """
     Real relay driver using gpiozero. Channels map to BCM GPIO pins.
 
+    Pin writes run on the driver's own HardwareWorker thread, never on the
+    event loop; see RealPWMDriverGpioZero.
+
     Safety:
     - Outputs default OFF on creation (initial_value=False).
+    - close() drops queued writes and switches every output off.
     - This driver should only be constructed behind REAL-mode safety gate.
     """
 
-    def __init__(self, pin_by_channel: dict[int, int]) -> None:
-        if DigitalOutputDevice is None:
+    def __init__(
+        self,
+        pin_by_channel: dict[int, int],
+        *,
+        gpio: ModuleType | None = None,
+        write_timeout: float = 1.0,
+    ) -> None:
+        device_cls = DigitalOutputDevice if gpio is None else gpio.DigitalOutputDevice
+        if device_cls is None:
             raise RuntimeError(
                 "gpiozero is not available. Install it on the Raspberry Pi environment "
                 "(e.g., `poetry add gpiozero`) and run with REAL mode enabled."
             )
 
+        self.write_timeout = write_timeout
         self._channels: dict[int, _RelayDevice] = {}
         self._state: dict[int, bool] = {}
 
         for ch, bcm_pin in pin_by_channel.items():
-            dev = DigitalOutputDevice(bcm_pin, initial_value=False)  # type: ignore[misc]
+            dev = device_cls(bcm_pin, initial_value=False)
             self._channels[ch] = cast(_RelayDevice, dev)
             self._state[ch] = False
+        self._worker = HardwareWorker("gpio-relay")
 
     async def set_on(self, channel: int, on: bool) -> None:
-        dev = self._channels[channel]
-        if on:
-            dev.on()
-        else:
-            dev.off()
-        self._state[channel] = on
+        await self.apply({channel: on})
+
+    async def apply(self, states: Mapping[int, bool]) -> None:
+        futures = []
+        for ch, on in states.items():
+            dev = self._channels[ch]
+            fut = self._worker.submit(ch, dev.on if on else dev.off)
+            # recorded when the write lands, even one that landed after apply() timed out
+            fut.add_done_callback(partial(self._landed, ch, on))
+            futures.append(fut)
+        await wait_written(futures, self.write_timeout)
+
+    def _landed(self, channel: int, on: bool, fut: asyncio.Future[None]) -> None:
+        if not fut.cancelled() and fut.exception() is None:
+            self._state[channel] = on
 
     async def get_on(self, channel: int) -> bool:
         return bool(self._state.get(channel, False))
 
-    def close(self) -> None:
-        """Best-effort safe shutdown."""
-        for dev in self._channels.values():
-            try:
-                dev.off()
-            except Exception:
-                pass
-            try:
-                dev.close()
-            except Exception:
-                pass
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Best-effort safe shutdown: every output off, then released.
+
+        Runs on the I/O worker after the writes still queued are dropped, and
+        blocks for up to `timeout` seconds.
+        """
+        devices = list(self._channels.values())
+        self._worker.close([d.off for d in devices] + [d.close for d in devices], timeout)
         self._channels.clear()
-        self._state.clear()
\ No newline at end of file
+        self._state.clear()
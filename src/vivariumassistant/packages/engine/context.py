@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+_ONE_US = timedelta(microseconds=1)
+
+
+def to_epoch_us(dt: datetime) -> int:
+    """Aware datetime -> integer microseconds since the Unix epoch."""
+    return (dt - _EPOCH) // _ONE_US
+
+
+@lru_cache(maxsize=64)
+def zone_for(tz: str) -> ZoneInfo:
+    return ZoneInfo(tz)
+
+
+@dataclass(slots=True)
+class TickContext:
+    """
+    One tick's instant, resolved once and shared by every engine rule.
+
+    The rules (lighting, UVB, mist, overrides, CompiledSchedule) accept a
+    TickContext wherever they take `now`, and then skip their own zone lookup,
+    localization and epoch conversion. Every rule evaluated with the same
+    context also sees exactly the same instant.
+
+    Treat it as read-only; it is not frozen only because a frozen dataclass
+    costs about as much to build as the localization it saves.
+    """
+
+    now: datetime  # localized to `zone`
+    zone: ZoneInfo
+    t_us: int  # epoch microseconds
+    today: date  # local date
+    minute_of_day: int  # local wall-clock minute, 0..1439
+    utc_offset: timedelta
+    dst: timedelta
+
+    @classmethod
+    def at(cls, now: datetime, tz: str | ZoneInfo) -> TickContext:
+        zone = zone_for(tz) if isinstance(tz, str) else tz
+        local = now.astimezone(zone) if now.tzinfo else now.replace(tzinfo=zone)
+        offset = local.utcoffset() or timedelta(0)
+        return cls(
+            local,
+            zone,
+            # same as to_epoch_us(local), reusing the offset looked up above
+            (local.replace(tzinfo=None) - offset - _NAIVE_EPOCH) // _ONE_US,
+            local.date(),
+            local.hour * 60 + local.minute,
+            offset,
+            local.dst() or timedelta(0),
+        )
+
+
+def localize(now: datetime | TickContext, tz: str) -> tuple[datetime, ZoneInfo]:
+    """`now` in zone `tz`, and the zone; a TickContext is used as is."""
+    if isinstance(now, TickContext):
+        if now.zone.key != tz:
+            raise ValueError(f"tick context is for {now.zone.key!r}, not {tz!r}")
+        return now.now, now.zone
+    zone = zone_for(tz)
+    return (now.astimezone(zone) if now.tzinfo else now.replace(tzinfo=zone)), zone
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any, ClassVar, Literal
+
+from vivariumassistant.packages.core.config_schema import DeviceConfig
+from vivariumassistant.packages.core.device_state import StateRecord
+from vivariumassistant.packages.engine.context import TickContext
+from vivariumassistant.packages.engine.mist import MistRuntime
+from vivariumassistant.packages.engine.schedule import (
+    US_PER_DAY,
+    US_PER_MINUTE,
+    CompiledSchedule,
+    MistDecision,
+)
+
+# what a rule's output can depend on, besides its profile section
+Input = Literal["time", "mist_runtime", "sensors"]
+
+# "holds until" for outputs that do not depend on time
+FOREVER = 2**63 - 1
+
+Outputs = dict[str, StateRecord]
+
+
+class Rule(ABC):
+    """
+    Desired state for every device of one kind.
+
+    A rule reads one profile `section` (None: it reads none) and declares its
+    other `inputs`. evaluate() returns the states and the epoch microsecond
+    they hold until as far as time goes (the tick's own instant when they may
+    change any time after it). The graph reuses them until then, unless
+    another declared input changes.
+    """
+
+    kind: ClassVar[str]
+    section: ClassVar[str | None] = None
+    inputs: ClassVar[frozenset[Input]] = frozenset()
+
+    def __init__(
+        self, schedule: CompiledSchedule, devices: Sequence[DeviceConfig], mist_rt: MistRuntime
+    ) -> None:
+        self.schedule = schedule
+        self.device_ids = tuple(d.id for d in devices)
+        self.mist_rt = mist_rt
+
+    @abstractmethod
+    def evaluate(
+        self, ctx: TickContext, observations: Mapping[str, Any]
+    ) -> tuple[Outputs, int]: ...
+
+
+class LightRule(Rule):
+    kind = "light"
+    section = "lighting"
+    inputs = frozenset({"time"})
+
+    def evaluate(self, ctx: TickContext, observations: Mapping[str, Any]) -> tuple[Outputs, int]:
+        level, until = self.schedule.level_until(ctx, "light")
+        on = level > 0.001
+        return {d: StateRecord(device_id=d, on=on, level=level) for d in self.device_ids}, until
+
+
+class UVBRule(Rule):
+    kind = "uvb"
+    section = "uvb"
+    inputs = frozenset({"time"})
+
+    def evaluate(self, ctx: TickContext, observations: Mapping[str, Any]) -> tuple[Outputs, int]:
+        level, until = self.schedule.level_until(ctx, "uvb")
+        on = level > 0.0
+        return {d: StateRecord(device_id=d, on=on) for d in self.device_ids}, until
+
+
+class MistRule(Rule):
+    """
+    One burst decision per tick, shared by every mister of the enclosure.
+
+    `decision` is the latest one evaluated; the agent applies it to the mist
+    runtime. A quiet decision holds until the next scheduled burst is due.
+    Anything else (a burst, a skip, a burst held back by spacing or the cap)
+    is re-evaluated on the next tick.
+    """
+
+    kind = "mist"
+    section = "mist"
+    inputs = frozenset({"time", "mist_runtime"})
+
+    decision: MistDecision | None = None
+
+    def evaluate(self, ctx: TickContext, observations: Mapping[str, Any]) -> tuple[Outputs, int]:
+        decision = self.decision = self.schedule.mist_decision(ctx, self.mist_rt)
+        seconds = decision.seconds
+        if seconds:
+            bursts = {
+                d: StateRecord(device_id=d, on=True, meta={"burst_seconds": seconds})
+                for d in self.device_ids
+            }
+            return bursts, ctx.t_us
+        off = {d: StateRecord(device_id=d, on=False) for d in self.device_ids}
+        return off, self._quiet_until(ctx, decision)
+
+    def _quiet_until(self, ctx: TickContext, decision: MistDecision) -> int:
+        t = ctx.t_us
+        if decision.skipped or decision.done_through != t:
+            return t
+        slot = self.schedule.next_mist_slot_after(ctx)
+        if slot is None:
+            return t + US_PER_DAY
+        # bursts are due at the start of their slot's minute
+        return slot.start - slot.start % US_PER_MINUTE
+
+
+class PumpRule(Rule):
+    """Pumps (the waterfall) stay off in v1."""
+
+    kind = "pump"
+
+    def evaluate(self, ctx: TickContext, observations: Mapping[str, Any]) -> tuple[Outputs, int]:
+        return {d: StateRecord(device_id=d, on=False) for d in self.device_ids}, FOREVER
+
+
+# device kind -> rule; kinds without one (heat, fan) get no desired state
+RULES: dict[str, type[Rule]] = {r.kind: r for r in (LightRule, UVBRule, MistRule, PumpRule)}
+
+
+class RuleNode:
+    """A rule plus its cached outputs, valid for ticks in [since, until) at `stamp`."""
+
+    __slots__ = ("rule", "outputs", "since", "until", "stamp")
+
+    def __init__(self, rule: Rule) -> None:
+        self.rule = rule
+        self.outputs: Outputs | None = None
+        self.since = 0
+        self.until = 0
+        self.stamp: tuple[Any, ...] = ()
+
+
+class ControlGraph:
+    """
+    An enclosure's devices and profile compiled into one rule node per device kind.
+
+    Built once per profile (and rebuilt when a new one is staged). Each tick,
+    evaluate() re-runs only the rules whose inputs changed: the tick left the
+    interval their last outputs hold for, or a declared input (mist runtime,
+    sensor observations) is not what it was. Everything else reuses the
+    cached outputs, so a steady midday or night costs a few comparisons per
+    kind. Any number of devices of one kind share their rule's evaluation.
+
+    Overrides are applied afterwards, to the returned states, by the
+    OverrideStore; they never change a rule's cached outputs.
+    """
+
+    def __init__(
+        self,
+        devices: Iterable[DeviceConfig],
+        schedule: CompiledSchedule,
+        mist_rt: MistRuntime,
+        *,
+        previous: ControlGraph | None = None,
+    ) -> None:
+        self.schedule = schedule
+        self.mist_rt = mist_rt
+        # rule evaluations per kind (cache misses), for tests and benchmarks
+        self.evaluations: dict[str, int] = {}
+        # mist decision evaluated by the latest evaluate(), None if it was reused
+        self.mist_decision: MistDecision | None = None
+
+        by_kind: dict[str, list[DeviceConfig]] = {}
+        for d in devices:
+            by_kind.setdefault(d.kind, []).append(d)
+
+        profile = schedule.profile
+        self.nodes: list[RuleNode] = []
+        for kind, group in by_kind.items():
+            rule_cls = RULES.get(kind)
+            if rule_cls is None:
+                continue
+            if rule_cls.section is not None and getattr(profile, rule_cls.section) is None:
+                continue
+            self.nodes.append(RuleNode(rule_cls(schedule, group, mist_rt)))
+            self.evaluations[kind] = 0
+
+        if previous is not None:
+            self._adopt(previous)
+
+    @property
+    def kinds(self) -> frozenset[str]:
+        return frozenset(node.rule.kind for node in self.nodes)
+
+    def evaluate(
+        self, ctx: TickContext, observations: Mapping[str, Any] | None = None
+    ) -> dict[str, StateRecord]:
+        """Desired state per device at `ctx` (before overrides)."""
+        observations = observations or {}
+        self.mist_decision = None
+        t = ctx.t_us
+        desired: dict[str, StateRecord] = {}
+        for node in self.nodes:
+            rule = node.rule
+            stamp = self._stamp(rule, observations)
+            outputs = node.outputs
+            if outputs is None or not node.since <= t < node.until or stamp != node.stamp:
+                outputs, node.until = rule.evaluate(ctx, observations)
+                node.outputs, node.since, node.stamp = outputs, t, stamp
+                self.evaluations[rule.kind] += 1
+                if isinstance(rule, MistRule):
+                    self.mist_decision = rule.decision
+            desired.update(outputs)
+        return desired
+
+    def invalidate(self) -> None:
+        """Drop every cached output; the next evaluate() re-runs all rules."""
+        for node in self.nodes:
+            node.outputs = None
+
+    def _stamp(self, rule: Rule, observations: Mapping[str, Any]) -> tuple[Any, ...]:
+        inputs = rule.inputs
+        stamp: list[Any] = []
+        if "mist_runtime" in inputs:
+            stamp.append(self.mist_rt.last_burst_at)
+        if "sensors" in inputs:
+            stamp.extend((sid, obs.reading, obs.stale) for sid, obs in observations.items())
+        return tuple(stamp)
+
+    def _adopt(self, previous: ControlGraph) -> None:
+        # keep cached outputs of rules whose profile section and devices did not change
+        old_profile = previous.schedule.profile
+        new_profile = self.schedule.profile
+        old_nodes = {node.rule.kind: node for node in previous.nodes}
+        for node in self.nodes:
+            rule = node.rule
+            old = old_nodes.get(rule.kind)
+            if old is None or old.rule.device_ids != rule.device_ids:
+                continue
+            section = rule.section
+            if section is not None and getattr(old_profile, section) != getattr(
+                new_profile, section
+            ):
+                continue
+            node.outputs, node.since, node.until = old.outputs, old.since, old.until
+            node.stamp = old.stamp
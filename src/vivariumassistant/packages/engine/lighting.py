@@ -2,9 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, time, timedelta
-from zoneinfo import ZoneInfo
 
 from vivariumassistant.packages.core.config_schema import LightingProfile
+from vivariumassistant.packages.engine.context import TickContext, localize
 
 
 def _parse_hhmm(s: str) -> time:
@@ -17,9 +17,10 @@ class LightingDecision:
     level: float  # 0..1
 
 
-def compute_daylight_level(now: datetime, tz: str, profile: LightingProfile) -> LightingDecision:
-    zone = ZoneInfo(tz)
-    now = now.astimezone(zone) if now.tzinfo else now.replace(tzinfo=zone)
+def compute_daylight_level(
+    now: datetime | TickContext, tz: str, profile: LightingProfile
+) -> LightingDecision:
+    now, zone = localize(now, tz)
 
     day_start_t = _parse_hhmm(profile.day_start)
     day_end_t = _parse_hhmm(profile.day_end)
@@ -31,8 +32,9 @@ def compute_daylight_level(now: datetime, tz: str, profile: LightingProfile) ->
     # Support overnight windows (rare, but safe)
     if day_end <= day_start:
         day_end += timedelta(days=1)
-        if now < day_start:
+        if now < day_start:  # still inside yesterday's window
             day_start -= timedelta(days=1)
+            day_end -= timedelta(days=1)
 
     sunrise = timedelta(minutes=max(profile.sunrise_minutes, 0))
     sunset = timedelta(minutes=max(profile.sunset_minutes, 0))
@@ -3,13 +3,14 @@ from __future__ import annotations
 from datetime import datetime
 
 from vivariumassistant.packages.core.device_state import DeviceState
+from vivariumassistant.packages.engine.context import TickContext
 from vivariumassistant.packages.engine.lighting import compute_daylight_level
 from vivariumassistant.packages.core.config_schema import LightingProfile  # adjust import if your type lives elsewhere
 
 
 def desired_daylight_state(
     *,
-    now: datetime,
+    now: datetime | TickContext,
     timezone: str,
     lighting: LightingProfile,
     device_id: str = "light_day",
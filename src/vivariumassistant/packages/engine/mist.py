@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from datetime import datetime, time
-from zoneinfo import ZoneInfo
+from datetime import datetime, time, timedelta
 
 from vivariumassistant.packages.core.config_schema import MistProfile
+from vivariumassistant.packages.engine.context import TickContext, localize
 
 
 def _parse_hhmm(s: str) -> time:
@@ -11,11 +11,6 @@ def _parse_hhmm(s: str) -> time:
     return time(hour=int(hh), minute=int(mm))
 
 
-def _localize(now: datetime, tz: str) -> datetime:
-    zone = ZoneInfo(tz)
-    return now.astimezone(zone) if now.tzinfo else now.replace(tzinfo=zone)
-
-
 def _in_window(local: datetime, start: str, end: str) -> bool:
     t = local.time()
     s = _parse_hhmm(start)
@@ -29,13 +24,34 @@ def _in_window(local: datetime, start: str, end: str) -> bool:
     return t >= s or t <= e
 
 
+# per-day counters kept: today and yesterday (spacing can reach across midnight)
+KEEP_DAYS = 2
+
+
 class MistRuntime:
     def __init__(self):
         self.last_burst_at: datetime | None = None
         self.daily_seconds_used: dict[str, int] = {}  # YYYY-MM-DD -> seconds
-
-
-def mist_burst_due(now: datetime, tz: str, prof: MistProfile, rt: MistRuntime) -> int | None:
+        # every scheduled burst starting at or before this has fired or been skipped
+        self.slots_done_through: datetime | None = None
+
+    def record_burst(self, now: datetime, seconds: int) -> None:
+        """Account for a burst that started at `now` (local time)."""
+        self.last_burst_at = now
+        key = now.date().isoformat()
+        self.daily_seconds_used[key] = self.daily_seconds_used.get(key, 0) + int(seconds)
+        self.prune(now)
+
+    def prune(self, now: datetime) -> None:
+        """Drop daily counters older than KEEP_DAYS; they never affect a decision again."""
+        oldest = (now.date() - timedelta(days=KEEP_DAYS - 1)).isoformat()
+        for key in [k for k in self.daily_seconds_used if k < oldest]:
+            del self.daily_seconds_used[key]
+
+
+def mist_burst_due(
+    now: datetime | TickContext, tz: str, prof: MistProfile, rt: MistRuntime
+) -> int | None:
     """
     Returns burst seconds if a burst should trigger now, else None.
 
@@ -46,7 +62,7 @@ def mist_burst_due(now: datetime, tz: str, prof: MistProfile, rt: MistRuntime) -
       - min spacing (minutes)
       - daily cap (seconds)
     """
-    local = _localize(now, tz)
+    local, zone = localize(now, tz)
     today_key = local.date().isoformat()
     used = rt.daily_seconds_used.get(today_key, 0)
 
@@ -56,13 +72,15 @@ def mist_burst_due(now: datetime, tz: str, prof: MistProfile, rt: MistRuntime) -
 
     # min spacing
     if rt.last_burst_at is not None:
-        last_local = _localize(rt.last_burst_at, tz)
+        last = rt.last_burst_at
+        # same zone object: already local (the agent records bursts at its tick's now)
+        last_local = last if last.tzinfo is zone else localize(last, tz)[0]
         delta_min = (local - last_local).total_seconds() / 60.0
         if delta_min < prof.safety.min_minutes_between:
             return None
 
     # --- Mode A: fixed bursts (existing behavior) ---
-    now_hhmm = local.strftime("%H:%M")
+    now_hhmm = f"{local.hour:02d}:{local.minute:02d}"
     for b in prof.bursts:
         if b.at == now_hhmm:
             seconds = int(b.seconds)
@@ -5,13 +5,16 @@ from typing import Mapping
 
 from vivariumassistant.packages.core.device_state import DeviceState
 from vivariumassistant.packages.core.manual_override import ManualOverride
+from vivariumassistant.packages.engine.context import TickContext
 
 
 def apply_manual_overrides(
-    now: datetime,
+    now: datetime | TickContext,
     desired: Mapping[str, DeviceState],
     overrides: Mapping[str, ManualOverride],
 ) -> dict[str, DeviceState]:
+    if isinstance(now, TickContext):
+        now = now.now
     resolved = dict(desired)
 
     for device_id, ovr in overrides.items():
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+from collections.abc import Mapping, MutableMapping
+from datetime import datetime
+from typing import Any, Optional
+
+from vivariumassistant.packages.core.device_state import StateRecord
+from vivariumassistant.packages.core.manual_override import GroupOverride, ManualOverride
+
+# (scope, name) within an enclosure: ("device", device_id) | ("kind", kind) | ("all", "")
+Selector = tuple[str, str]
+
+ALL: Selector = ("all", "")
+
+
+class _Entry:
+    __slots__ = ("enclosure_id", "selector", "expires_at", "state", "removed")
+
+    def __init__(
+        self,
+        enclosure_id: Optional[str],
+        selector: Selector,
+        expires_at: datetime,
+        state: StateRecord,
+    ) -> None:
+        self.enclosure_id = enclosure_id
+        self.selector = selector
+        self.expires_at = expires_at
+        self.state = state
+        self.removed = False
+
+
+class OverrideStore:
+    """
+    Active manual overrides for any number of enclosures.
+
+    Overrides are indexed by enclosure (None = every enclosure) and then by
+    selector, so resolving one enclosure's tick looks up only the keys that can
+    match its devices and costs nothing when no override touches it. Expiry
+    order is kept in a heap: evict() drops expired entries as time passes and
+    next_expiry() is the heap top. Replaced or cleared entries stay in the heap
+    marked removed and are skipped when they surface.
+
+    `version` increases on every change, so readers that cache a rendering
+    of the store (the API snapshots) can tell cheaply when to rebuild it.
+
+    Precedence for one device, most specific first: device, kind, all; at each
+    level an enclosure-scoped override beats a global one.
+    """
+
+    def __init__(self) -> None:
+        self._index: dict[Optional[str], dict[Selector, _Entry]] = {}
+        self._heap: list[tuple[datetime, int, _Entry]] = []
+        self._seq = itertools.count()
+        self.version = 0
+
+    def set(self, ovr: ManualOverride, *, enclosure_id: Optional[str] = None) -> None:
+        """Override one device (in every enclosure if enclosure_id is None)."""
+        state = StateRecord.from_model(ovr.state)
+        self._add(enclosure_id, ("device", ovr.device_id), ovr.expires_at, state)
+
+    def set_group(self, ovr: GroupOverride) -> None:
+        selector = ("kind", ovr.kind) if ovr.kind is not None else ALL
+        self._add(ovr.enclosure_id, selector, ovr.expires_at, StateRecord.from_model(ovr.state))
+
+    def _add(
+        self,
+        enclosure_id: Optional[str],
+        selector: Selector,
+        expires_at: datetime,
+        state: StateRecord,
+    ) -> None:
+        self.clear(enclosure_id, selector)
+        entry = _Entry(enclosure_id, selector, expires_at, state)
+        self._index.setdefault(enclosure_id, {})[selector] = entry
+        heapq.heappush(self._heap, (expires_at, next(self._seq), entry))
+        self.version += 1
+
+    def clear(self, enclosure_id: Optional[str], selector: Selector) -> bool:
+        """Remove an override before it expires. Returns whether one was set."""
+        scoped = self._index.get(enclosure_id)
+        entry = scoped.pop(selector, None) if scoped else None
+        if entry is None:
+            return False
+        entry.removed = True
+        self.version += 1
+        if not scoped:
+            del self._index[enclosure_id]
+        return True
+
+    def evict(self, now: datetime) -> int:
+        """Drop every override that has expired by `now`. Returns how many."""
+        evicted = 0
+        while self._heap and (self._heap[0][2].removed or self._heap[0][0] <= now):
+            _, _, entry = heapq.heappop(self._heap)
+            if not entry.removed:
+                self.clear(entry.enclosure_id, entry.selector)
+                evicted += 1
+        return evicted
+
+    def next_expiry(self) -> datetime | None:
+        """Soonest expiry among the stored overrides, or None if there are none."""
+        while self._heap and self._heap[0][2].removed:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def __len__(self) -> int:
+        return sum(len(scoped) for scoped in self._index.values())
+
+    def affects(self, enclosure_id: str) -> bool:
+        return enclosure_id in self._index or None in self._index
+
+    def describe(self, enclosure_id: str, now: datetime) -> list[dict[str, Any]]:
+        """Active overrides that apply to one enclosure, as plain dicts."""
+        out: list[dict[str, Any]] = []
+        for scope in (enclosure_id, None):
+            for (kind, name), entry in (self._index.get(scope) or {}).items():
+                if now < entry.expires_at:
+                    out.append(
+                        {
+                            "scope": "enclosure" if scope is not None else "global",
+                            "selector": kind if not name else f"{kind}:{name}",
+                            "expires_at": entry.expires_at.isoformat(),
+                            "state": entry.state.as_dict(),
+                        }
+                    )
+        return out
+
+    def dump(self, enclosure_id: Optional[str]) -> list[dict[str, Any]]:
+        """One scope's overrides (None = global) in a form load() accepts."""
+        return [
+            {
+                "selector": list(selector),
+                "expires_at": entry.expires_at.isoformat(),
+                "state": entry.state.as_dict(),
+            }
+            for selector, entry in (self._index.get(enclosure_id) or {}).items()
+        ]
+
+    def load(self, enclosure_id: Optional[str], items: list[dict[str, Any]]) -> int:
+        """Add overrides produced by dump(); returns how many were added."""
+        for item in items:
+            kind, name = item["selector"]
+            state = item["state"]
+            self._add(
+                enclosure_id,
+                (kind, name),
+                datetime.fromisoformat(item["expires_at"]),
+                StateRecord(state["device_id"], state["on"], state["level"], state["meta"]),
+            )
+        return len(items)
+
+    def lookup(
+        self, now: datetime, enclosure_id: str, device_id: str, kind: str
+    ) -> StateRecord | None:
+        """Winning active override state for one device, if any."""
+        scoped = self._index.get(enclosure_id)
+        glob = self._index.get(None)
+        if not scoped and not glob:
+            return None
+        for selector in (("device", device_id), ("kind", kind), ALL):
+            for table in (scoped, glob):
+                entry = table.get(selector) if table else None
+                # evict() is lazy, so an entry can be past expiry here
+                if entry is not None and now < entry.expires_at:
+                    state = entry.state
+                    if state.device_id == device_id:
+                        return state
+                    return StateRecord(device_id, state.on, state.level, state.meta)
+        return None
+
+    def resolve(
+        self,
+        now: datetime,
+        enclosure_id: str,
+        kinds: Mapping[str, str],
+        desired: MutableMapping[str, StateRecord],
+    ) -> None:
+        """Apply active overrides to `desired` in place; `kinds` maps device id -> kind."""
+        if not self.affects(enclosure_id):
+            return
+        for device_id, kind in kinds.items():
+            state = self.lookup(now, enclosure_id, device_id, kind)
+            if state is not None:
+                desired[device_id] = state
@@ -0,0 +1,706 @@
+from __future__ import annotations
+
+import math
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Literal
+from zoneinfo import ZoneInfo
+
+from vivariumassistant.packages.core.config_schema import (
+    LightingProfile,
+    MistProfile,
+    ProfileConfig,
+    UVBProfile,
+)
+from vivariumassistant.packages.engine.context import TickContext, to_epoch_us
+from vivariumassistant.packages.engine.mist import MistRuntime
+
+Channel = Literal["light", "uvb"]
+
+# a point in time: a datetime, or a tick's already-resolved context
+Instant = datetime | TickContext
+
+US_PER_SECOND = 1_000_000
+US_PER_MINUTE = 60 * US_PER_SECOND
+US_PER_DAY = 24 * 60 * US_PER_MINUTE
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_EPOCH_DATE = date(1970, 1, 1)
+_ONE_US = timedelta(microseconds=1)
+
+# mist_burst_due matches fixed bursts against strftime("%H:%M"), so only the
+# zero-padded spelling of a minute can ever fire.
+HHMM_TO_MINUTE = {f"{m // 60:02d}:{m % 60:02d}": m for m in range(24 * 60)}
+
+
+def _parse_hhmm_us(s: str) -> int:
+    hh, mm = s.split(":")
+    return (int(hh) * 60 + int(mm)) * US_PER_MINUTE
+
+
+def from_epoch_us(us: int, zone: ZoneInfo) -> datetime:
+    return (_EPOCH + timedelta(microseconds=us)).astimezone(zone)
+
+
+@dataclass(frozen=True, slots=True)
+class Segment:
+    """
+    One piece of a piecewise-linear schedule, covering [start, end).
+
+    Times are epoch microseconds. With span == 0 the level is the constant
+    `peak`; otherwise it is `peak * (t - origin) / span` clamped to [0, peak],
+    which is exactly the arithmetic compute_daylight_level performs.
+    """
+
+    start: int
+    end: int
+    peak: float
+    origin: int = 0
+    span: int = 0
+
+    @property
+    def is_ramp(self) -> bool:
+        return self.span != 0
+
+    def level_at(self, t: int) -> float:
+        if self.span == 0:
+            return self.peak
+        return max(0.0, min(self.peak, self.peak * ((t - self.origin) / self.span)))
+
+    def integral(self, a: int, b: int) -> float:
+        """Level-seconds over [a, b] (must lie inside the segment)."""
+        if b <= a:
+            return 0.0
+        seconds = (b - a) / US_PER_SECOND
+        if self.span == 0:
+            return self.peak * seconds
+        return seconds * (self.level_at(a) + self.level_at(b)) / 2.0
+
+
+@dataclass(frozen=True, slots=True)
+class Ramp:
+    """
+    A linear stretch of one channel: `start_level` at `start`, `end_level` at
+    `end` (epoch microseconds), for interpolating between ticks.
+    """
+
+    start: int
+    end: int
+    start_level: float
+    end_level: float
+
+    def level_at(self, t: int) -> float:
+        if t >= self.end:
+            return self.end_level
+        if t <= self.start:
+            return self.start_level
+        frac = (t - self.start) / (self.end - self.start)
+        return self.start_level + (self.end_level - self.start_level) * frac
+
+
+@dataclass(frozen=True, slots=True)
+class MistSlot:
+    """Interval [start, end) during which mist_burst_due would pick `seconds`."""
+
+    start: int
+    end: int
+    seconds: int
+
+
+@dataclass(frozen=True, slots=True)
+class MistDecision:
+    """
+    Outcome of CompiledSchedule.mist_decision for one tick (epoch microseconds).
+
+    - seconds: burst to start now, or None
+    - scheduled: when the burst that fires was due (so lateness is start - scheduled)
+    - skipped: scheduled starts given up on (grace passed, or superseded by a later one)
+    - done_through: new MistRuntime.slots_done_through once the tick is applied
+    """
+
+    seconds: int | None
+    scheduled: int | None
+    skipped: tuple[int, ...]
+    done_through: int
+
+
+# (wall_lo, wall_hi, peak, wall_origin, span) relative to local midnight
+_WallPiece = tuple[int, int, float, int, int]
+
+
+class Track:
+    """Sorted, gap-free segments for one channel over one local day."""
+
+    __slots__ = ("starts", "segments", "cum")
+
+    def __init__(self, segments: list[Segment]) -> None:
+        self.segments = segments
+        self.starts = [s.start for s in segments]
+        self.cum = [0.0]
+        for s in segments:
+            self.cum.append(self.cum[-1] + s.integral(s.start, s.end))
+
+    def index(self, t: int) -> int:
+        return max(0, bisect_right(self.starts, t) - 1)
+
+    def level_at(self, t: int) -> float:
+        return self.segments[self.index(t)].level_at(t)
+
+    def integral_to(self, t: int) -> float:
+        """Level-seconds from the start of the day to t."""
+        i = self.index(t)
+        seg = self.segments[i]
+        return self.cum[i] + seg.integral(seg.start, min(t, seg.end))
+
+    @property
+    def total(self) -> float:
+        return self.cum[-1]
+
+
+@dataclass(frozen=True, slots=True)
+class DayPlan:
+    """Everything compiled for one local date, in absolute epoch microseconds."""
+
+    day: date
+    start: int
+    end: int
+    light: Track
+    uvb: Track
+    mist: tuple[MistSlot, ...]
+    mist_starts: tuple[int, ...]
+
+
+class CompiledSchedule:
+    """
+    A ProfileConfig compiled once for a timezone.
+
+    "HH:MM" parsing and window logic happen at construction. Each local date is
+    then mapped onto absolute time (splitting at DST transitions) the first time
+    it is needed and kept in a small LRU cache, so per-tick lookups are a bisect.
+
+    Results match compute_daylight_level, uvb_should_be_on and mist_burst_due:
+    like them, schedules are laid out on local wall-clock time.
+    """
+
+    def __init__(self, profile: ProfileConfig, tz: str, *, max_cached_days: int = 8) -> None:
+        if max_cached_days < 1:
+            raise ValueError("max_cached_days must be >= 1")
+
+        self.profile = profile
+        self.tz = tz
+        self.zone = ZoneInfo(tz)
+        self.max_cached_days = max_cached_days
+
+        self._light_wall = _light_wall_pieces(profile.lighting)
+        self._uvb_wall = _uvb_wall_pieces(profile.uvb)
+        self._mist_wall = _mist_wall_slots(profile.mist)
+        self._days: OrderedDict[date, DayPlan] = OrderedDict()
+        # (lo, hi): no mist burst is scheduled to start in (lo, hi)
+        self._mist_gap = (0, 0)
+
+    # ---- point queries ----
+
+    def context(self, now: datetime) -> TickContext:
+        """A TickContext in this schedule's zone, to share across one tick's queries."""
+        return TickContext.at(now, self.zone)
+
+    def localize(self, now: Instant) -> datetime:
+        if isinstance(now, TickContext):
+            if now.zone is self.zone:
+                return now.now
+            now = now.now
+        return now.astimezone(self.zone) if now.tzinfo else now.replace(tzinfo=self.zone)
+
+    def light_level(self, now: Instant) -> float:
+        t, plan = self._locate(now)
+        return plan.light.level_at(t)
+
+    def uvb_on(self, now: Instant) -> bool:
+        t, plan = self._locate(now)
+        return plan.uvb.level_at(t) > 0.0
+
+    def level_at(self, now: Instant, channel: Channel = "light") -> float:
+        t, plan = self._locate(now)
+        return self._track(plan, channel).level_at(t)
+
+    def level_until(self, now: Instant, channel: Channel = "light") -> tuple[float, int]:
+        """
+        Level at `now` and the epoch microsecond it holds until: the end of
+        the current flat segment, or `now` itself inside a ramp.
+        """
+        t, plan = self._locate(now)
+        track = self._track(plan, channel)
+        seg = track.segments[track.index(t)]
+        return seg.level_at(t), (t if seg.is_ramp else seg.end)
+
+    def ramp_at(self, now: Instant, channel: Channel = "light") -> Ramp | None:
+        """The ramp `now` is inside, or None while the level is flat."""
+        t, plan = self._locate(now)
+        track = self._track(plan, channel)
+        seg = track.segments[track.index(t)]
+        if not seg.is_ramp:
+            return None
+        return Ramp(seg.start, seg.end, seg.level_at(seg.start), seg.level_at(seg.end))
+
+    def mist_slot(self, now: Instant) -> int | None:
+        """Candidate burst seconds at `now`, before spacing and daily-cap checks."""
+        t, plan = self._locate(now)
+        i = bisect_right(plan.mist_starts, t) - 1
+        if i >= 0 and t < plan.mist[i].end:
+            return plan.mist[i].seconds
+        return None
+
+    def mist_burst_due(self, now: Instant, rt: MistRuntime) -> int | None:
+        """Drop-in equivalent of mist_burst_due() using the compiled slots."""
+        prof = self.profile.mist
+        if prof is None:
+            return None
+
+        local = self.localize(now)
+        seconds = self.mist_slot(local)
+        if seconds is None:
+            return None
+        return self.mist_burst_allowed(local, rt, seconds)
+
+    def mist_decision(self, now: Instant, rt: MistRuntime) -> MistDecision:
+        """
+        Mist burst to start at `now` under the profile's catch-up policy.
+
+        Unlike mist_burst_due, a burst is not tied to the tick landing inside
+        its minute: every scheduled start after rt.slots_done_through stays
+        eligible until its grace window ends, fires at most once, and is
+        reported as skipped when the window passes without it firing. When
+        several are eligible (ticks were delayed past more than one) only the
+        latest fires. Spacing and the daily cap are enforced as before; a
+        burst they hold back stays eligible until its window ends.
+        """
+        prof = self.profile.mist
+        t, plan = self._locate(now)
+        if prof is None:
+            return MistDecision(None, None, (), t)
+
+        if prof.catch_up.policy == "late":
+            window = max(US_PER_MINUTE, prof.catch_up.grace_seconds * US_PER_SECOND)
+        else:
+            window = US_PER_MINUTE
+        if rt.slots_done_through is None:
+            # bursts scheduled before the runtime existed are not "missed"
+            lo = t - window
+        else:
+            # after a long pause, report at most a day of skipped bursts
+            lo = max(to_epoch_us(rt.slots_done_through), t - window - US_PER_DAY)
+
+        # the common tick: no burst has come due since the last one was settled
+        gap_lo, gap_hi = self._mist_gap
+        if not gap_lo <= lo < gap_hi:
+            gap_lo, gap_hi = lo, self._next_mist_due(lo, plan)
+            self._mist_gap = (gap_lo, gap_hi)
+        if t < gap_hi:
+            return MistDecision(None, None, (), t)
+
+        live: list[tuple[int, int]] = []  # (scheduled start, seconds)
+        skipped: list[int] = []
+        for due, seconds in self._mist_instances(lo, t, plan):
+            if t < due + window:
+                live.append((due, seconds))
+            else:
+                skipped.append(due)
+        if not live:
+            return MistDecision(None, None, tuple(skipped), t)
+
+        due, seconds = live[-1]
+        fire = self.mist_burst_allowed(self.localize(now), rt, seconds)
+        if fire is None:
+            # held back by spacing or the cap: keep everything live for later ticks
+            return MistDecision(None, None, tuple(skipped), live[0][0] - 1)
+        skipped.extend(d for d, _ in live[:-1])
+        return MistDecision(fire, due, tuple(skipped), t)
+
+    def mist_burst_allowed(self, now: Instant, rt: MistRuntime, seconds: int) -> int | None:
+        """`seconds` clamped to the daily cap, or None if spacing or the cap forbid a burst."""
+        prof = self.profile.mist
+        if prof is None:
+            return None
+        local = self.localize(now)
+        used = rt.daily_seconds_used.get(local.date().isoformat(), 0)
+        if used >= prof.safety.max_seconds_per_day:
+            return None
+        if rt.last_burst_at is not None:
+            delta_min = (local - self.localize(rt.last_burst_at)).total_seconds() / 60.0
+            if delta_min < prof.safety.min_minutes_between:
+                return None
+        seconds = min(seconds, prof.safety.max_seconds_per_day - used)
+        return seconds if seconds > 0 else None
+
+    def _next_mist_due(self, lo: int, plan: DayPlan, *, horizon_days: int = 7) -> int:
+        """Scheduled start of the first burst after `lo` (at most `horizon_days` out)."""
+        hi = lo + horizon_days * US_PER_DAY
+        for due, _ in self._mist_instances(lo, hi, plan):
+            return due
+        return hi
+
+    def _mist_instances(self, lo: int, hi: int, plan: DayPlan) -> Iterator[tuple[int, int]]:
+        """
+        (scheduled start, seconds) of each burst starting in (lo, hi], in order.
+
+        A burst's start is the minute its slot begins in; slots that split one
+        minute between overlapping windows count once, with the first one's
+        seconds. `plan` is the day containing hi.
+        """
+        last = lo
+        while plan.start > lo:
+            plan = self._plan(plan.day - timedelta(days=1))
+        while plan.start <= hi:
+            slots = plan.mist
+            for i in range(bisect_right(plan.mist_starts, last - last % US_PER_MINUTE), len(slots)):
+                slot = slots[i]
+                due = slot.start - slot.start % US_PER_MINUTE
+                if due > hi:
+                    return
+                if due > last:
+                    last = due
+                    yield due, slot.seconds
+            plan = self._plan(plan.day + timedelta(days=1))
+
+    # ---- range queries ----
+
+    def next_change_after(
+        self,
+        now: Instant,
+        channel: Channel = "light",
+        *,
+        resolution: int | None = None,
+        horizon_days: int = 7,
+    ) -> datetime | None:
+        """
+        Next segment boundary after `now` at which the level stops being what it
+        is now (a step, or the start/end of a ramp).
+
+        Inside a ramp the level changes continuously. Without `resolution` this
+        returns the end of the ramp; with it, the first instant the level crosses
+        the next multiple of 1/resolution (e.g. 256 for 8-bit PWM).
+        Returns None if nothing changes within `horizon_days`.
+        """
+        t, plan = self._locate(now)
+        track = self._track(plan, channel)
+        i = track.index(t)
+        current = track.segments[i]
+
+        if resolution and current.is_ramp:
+            return from_epoch_us(_next_step(current, t, resolution), self.zone)
+
+        for _ in range(horizon_days + 1):
+            for seg in track.segments[i + 1 :]:
+                if seg.is_ramp or current.is_ramp or seg.peak != current.peak:
+                    return from_epoch_us(seg.start, self.zone)
+            plan = self._plan(plan.day + timedelta(days=1))
+            track = self._track(plan, channel)
+            i = -1
+        return None
+
+    def next_mist_slot_after(self, now: Instant, *, horizon_days: int = 7) -> MistSlot | None:
+        """First mist slot starting strictly after `now`."""
+        t, plan = self._locate(now)
+        for _ in range(horizon_days + 1):
+            i = bisect_right(plan.mist_starts, t)
+            if i < len(plan.mist):
+                return plan.mist[i]
+            plan = self._plan(plan.day + timedelta(days=1))
+        return None
+
+    def integral(self, start: datetime, end: datetime, channel: Channel = "light") -> float:
+        """
+        Level-seconds over [start, end] (e.g. light dose, or UVB on-seconds).
+
+        O(log n) within a day; whole days in between use cached day totals.
+        """
+        a, plan_a = self._locate(start)
+        b, plan_b = self._locate(end)
+        if b <= a:
+            return 0.0
+
+        track_a = self._track(plan_a, channel)
+        if plan_a.day == plan_b.day:
+            return track_a.integral_to(b) - track_a.integral_to(a)
+
+        total = track_a.total - track_a.integral_to(a)
+        d = plan_a.day + timedelta(days=1)
+        while d < plan_b.day:
+            total += self._track(self._plan(d), channel).total
+            d += timedelta(days=1)
+        return total + self._track(plan_b, channel).integral_to(b)
+
+    def day_plans(self, start: datetime, end: datetime) -> Iterator[DayPlan]:
+        """Compiled plans covering [start, end), in order."""
+        _, plan = self._locate(start)
+        b = to_epoch_us(self.localize(end))
+        while plan.start < b:
+            yield plan
+            plan = self._plan(plan.day + timedelta(days=1))
+
+    def segments(self, d: date, channel: Channel = "light") -> list[Segment]:
+        return list(self._track(self._plan(d), channel).segments)
+
+    def mist_slots(self, d: date) -> list[MistSlot]:
+        return list(self._plan(d).mist)
+
+    # ---- day plans ----
+
+    @staticmethod
+    def _track(plan: DayPlan, channel: Channel) -> Track:
+        return plan.light if channel == "light" else plan.uvb
+
+    def _locate(self, now: Instant) -> tuple[int, DayPlan]:
+        if isinstance(now, TickContext) and now.zone is self.zone:
+            t = now.t_us
+            plan = self._plan(now.today)
+        else:
+            local = self.localize(now)
+            t = to_epoch_us(local)
+            plan = self._plan(local.date())
+        # A repeated hour at midnight can put t just outside its date's plan.
+        while t < plan.start:
+            plan = self._plan(plan.day - timedelta(days=1))
+        while t >= plan.end:
+            plan = self._plan(plan.day + timedelta(days=1))
+        return t, plan
+
+    def _plan(self, d: date) -> DayPlan:
+        plan = self._days.get(d)
+        if plan is not None:
+            self._days.move_to_end(d)
+            return plan
+
+        plan = self._compile_day(d)
+        self._days[d] = plan
+        if len(self._days) > self.max_cached_days:
+            self._days.popitem(last=False)
+        return plan
+
+    def _midnight_us(self, d: date) -> int:
+        return to_epoch_us(datetime.combine(d, time(0), tzinfo=self.zone))
+
+    def _offset_us(self, t: int) -> int:
+        off = from_epoch_us(t, self.zone).utcoffset()
+        assert off is not None
+        return off // _ONE_US
+
+    def _offset_pieces(self, lo: int, hi: int) -> list[tuple[int, int, int]]:
+        """Split [lo, hi) into (lo, hi, utc_offset_us) runs of constant offset."""
+        pieces: list[tuple[int, int, int]] = []
+        while lo < hi:
+            off = self._offset_us(lo)
+            if self._offset_us(hi - 1) == off:
+                pieces.append((lo, hi, off))
+                break
+            # Transitions happen on whole seconds: bisect for the first one.
+            a, b = lo // US_PER_SECOND, (hi - 1) // US_PER_SECOND
+            while b - a > 1:
+                mid = (a + b) // 2
+                if self._offset_us(mid * US_PER_SECOND) == off:
+                    a = mid
+                else:
+                    b = mid
+            cut = max(lo + 1, b * US_PER_SECOND)
+            pieces.append((lo, cut, off))
+            lo = cut
+        return pieces
+
+    def _compile_day(self, d: date) -> DayPlan:
+        start = self._midnight_us(d)
+        end = self._midnight_us(d + timedelta(days=1))
+        # naive wall-clock microseconds of local midnight
+        wall0 = (d - _EPOCH_DATE).days * US_PER_DAY
+
+        light: list[Segment] = []
+        uvb: list[Segment] = []
+        mist: list[MistSlot] = []
+
+        for lo, hi, off in self._offset_pieces(start, end):
+            # absolute t <-> wall-of-day w:  w = t + off - wall0
+            shift = off - wall0
+            w_lo, w_hi = lo + shift, hi + shift
+            _map_pieces(light, self._light_wall, w_lo, w_hi, shift)
+            _map_pieces(uvb, self._uvb_wall, w_lo, w_hi, shift)
+            for k in range(w_lo // US_PER_DAY, (w_hi - 1) // US_PER_DAY + 1):
+                base = k * US_PER_DAY
+                for s in self._mist_wall:
+                    a = max(s.start + base, w_lo)
+                    b = min(s.end + base, w_hi)
+                    if a < b:
+                        mist.append(MistSlot(a - shift, b - shift, s.seconds))
+
+        mist.sort(key=lambda s: s.start)
+        return DayPlan(
+            day=d,
+            start=start,
+            end=end,
+            light=Track(_merge(light)),
+            uvb=Track(_merge(uvb)),
+            mist=tuple(mist),
+            mist_starts=tuple(s.start for s in mist),
+        )
+
+
+def _next_step(seg: Segment, t: int, resolution: int) -> int:
+    """First instant after t at which a ramp's level crosses a 1/resolution boundary."""
+    if seg.peak <= 0.0:
+        return seg.end
+    scaled = seg.level_at(t) * resolution
+    target = math.floor(scaled) + 1 if seg.span > 0 else math.ceil(scaled) - 1
+    # invert level = peak * (t - origin) / span; +1us so the crossing has happened
+    crossing = seg.origin + math.ceil(seg.span * (target / resolution) / seg.peak) + 1
+    return min(seg.end, max(t + 1, crossing))
+
+
+def _map_pieces(out: list[Segment], wall: list[_WallPiece], w_lo: int, w_hi: int, shift: int) -> None:
+    """Append the wall pieces overlapping [w_lo, w_hi) as absolute segments."""
+    # wall pieces are defined on [0, day); neighbouring dates repeat them
+    for k in range(w_lo // US_PER_DAY, (w_hi - 1) // US_PER_DAY + 1):
+        base = k * US_PER_DAY
+        for lo, hi, peak, origin, span in wall:
+            a = max(lo + base, w_lo)
+            b = min(hi + base, w_hi)
+            if a < b:
+                if span:
+                    out.append(Segment(a - shift, b - shift, peak, origin + base - shift, span))
+                else:
+                    out.append(Segment(a - shift, b - shift, peak))
+
+
+def _merge(segments: list[Segment]) -> list[Segment]:
+    merged: list[Segment] = []
+    for s in segments:
+        if merged:
+            prev = merged[-1]
+            if not prev.is_ramp and not s.is_ramp and prev.peak == s.peak and prev.end == s.start:
+                merged[-1] = Segment(prev.start, s.end, prev.peak)
+                continue
+        merged.append(s)
+    return merged
+
+
+def _split(lo: int, hi: int, cuts: list[int]) -> list[tuple[int, int]]:
+    points = sorted({lo, hi, *(c for c in cuts if lo < c < hi)})
+    return list(zip(points, points[1:]))
+
+
+def _light_branch(w: int, s: int, e: int, su: int, ss: int, max_b: float) -> tuple[float, int, int]:
+    """Mirror of compute_daylight_level's branches: (peak, origin, span) at wall time w."""
+    if w <= s:
+        return 0.0, 0, 0
+    if su > 0 and s < w < s + su:
+        return max_b, s, su
+    ramp_down_start = e - ss if ss > 0 else e
+    if w < ramp_down_start:
+        return max_b, 0, 0
+    if ss > 0 and ramp_down_start <= w < e:
+        return max_b, e, -ss
+    return 0.0, 0, 0
+
+
+def _light_wall_pieces(prof: LightingProfile) -> list[_WallPiece]:
+    s = _parse_hhmm_us(prof.day_start)
+    e = _parse_hhmm_us(prof.day_end)
+    su = max(prof.sunrise_minutes, 0) * US_PER_MINUTE
+    ss = max(prof.sunset_minutes, 0) * US_PER_MINUTE
+    max_b = float(prof.max_brightness)
+
+    if e <= s:
+        # overnight: before day_start we are in yesterday's window
+        regions = [(0, s, s - US_PER_DAY, e), (s, US_PER_DAY, s, e + US_PER_DAY)]
+    else:
+        regions = [(0, US_PER_DAY, s, e)]
+
+    pieces: list[_WallPiece] = []
+    for lo, hi, ws, we in regions:
+        rds = we - ss if ss > 0 else we
+        for a, b in _split(lo, hi, [ws, ws + su, rds, we]):
+            peak, origin, span = _light_branch((a + b) // 2, ws, we, su, ss, max_b)
+            # The branch taken exactly at a boundary can differ from the interior
+            # (e.g. `now <= day_start` with no sunrise); give that instant its own piece.
+            edge = _light_branch(a, ws, we, su, ss, max_b)
+            if Segment(a, b, *edge).level_at(a) != Segment(a, b, peak, origin, span).level_at(a):
+                pieces.append((a, a + 1, *edge))
+                a += 1
+            pieces.append((a, b, peak, origin, span))
+    return pieces
+
+
+def _uvb_wall_pieces(prof: UVBProfile | None) -> list[_WallPiece]:
+    if prof is None:
+        return [(0, US_PER_DAY, 0.0, 0, 0)]
+
+    s = _parse_hhmm_us(prof.start)
+    e = _parse_hhmm_us(prof.end)
+    if e <= s:
+        on = [(0, e), (s, US_PER_DAY)]
+    else:
+        on = [(s, e)]
+
+    pieces: list[_WallPiece] = []
+    for a, b in _split(0, US_PER_DAY, [c for iv in on for c in iv]):
+        lit = any(lo <= a < hi for lo, hi in on)
+        pieces.append((a, b, 1.0 if lit else 0.0, 0, 0))
+    return pieces
+
+
+def _mist_window_cover(minute: int, start: str, end: str) -> list[tuple[int, int]]:
+    """Parts of `minute` that mist._in_window accepts (its end bound is inclusive)."""
+    m0 = minute * US_PER_MINUTE
+    m1 = m0 + US_PER_MINUTE
+    s = _parse_hhmm_us(start)
+    e = _parse_hhmm_us(end) + 1
+    ranges = [(s, e)] if s < e else [(s, US_PER_DAY), (0, e)]
+    return [(max(lo, m0), min(hi, m1)) for lo, hi in ranges if max(lo, m0) < min(hi, m1)]
+
+
+def _mist_wall_slots(prof: MistProfile | None) -> list[MistSlot]:
+    """Burst candidates over one wall-clock day, in mist_burst_due's priority order."""
+    if prof is None:
+        return []
+
+    fixed: dict[int, int] = {}
+    for burst in prof.bursts:
+        m = HHMM_TO_MINUTE.get(burst.at)
+        if m is not None and m not in fixed:
+            fixed[m] = int(burst.seconds)
+
+    slots: list[MistSlot] = []
+    for minute in range(24 * 60):
+        m0 = minute * US_PER_MINUTE
+        if minute in fixed:
+            slots.append(MistSlot(m0, m0 + US_PER_MINUTE, fixed[minute]))
+            continue
+
+        claimed: list[tuple[int, int]] = []
+        for w in prof.windows:
+            if w.every_minutes <= 0 or minute % int(w.every_minutes) != 0:
+                continue
+            for lo, hi in _mist_window_cover(minute, w.start, w.end):
+                for a, b in _subtract(lo, hi, claimed):
+                    slots.append(MistSlot(a, b, int(w.seconds)))
+                    claimed.append((a, b))
+
+    slots.sort(key=lambda s: s.start)
+    return slots
+
+
+def _subtract(lo: int, hi: int, taken: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    free = [(lo, hi)]
+    for t_lo, t_hi in taken:
+        nxt: list[tuple[int, int]] = []
+        for a, b in free:
+            if t_hi <= a or b <= t_lo:
+                nxt.append((a, b))
+                continue
+            if a < t_lo:
+                nxt.append((a, t_lo))
+            if t_hi < b:
+                nxt.append((t_hi, b))
+        free = nxt
+    return free
+
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from vivariumassistant.packages.core.config_schema import ProfileConfig
+from vivariumassistant.packages.engine.mist import MistRuntime
+from vivariumassistant.packages.engine.schedule import (
+    CompiledSchedule,
+    DayPlan,
+    Track,
+    from_epoch_us,
+    to_epoch_us,
+)
+
+# Guarded import so the agent itself never requires numpy.
+try:
+    import numpy as np
+except Exception:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+
+@dataclass(frozen=True)
+class Timeline:
+    """
+    Desired outputs sampled on a regular grid. All arrays have the same length.
+
+    - t_us: sample instants, epoch microseconds (int64)
+    - light: daylight level (float64), as compute_daylight_level
+    - uvb: UVB on/off (bool), as uvb_should_be_on
+    - mist_seconds: burst seconds started at that sample, 0 otherwise (int32),
+      as an agent calling mist_burst_due on every sample would fire them
+    """
+
+    t_us: NDArray[np.int64]
+    light: NDArray[np.float64]
+    uvb: NDArray[np.bool_]
+    mist_seconds: NDArray[np.int32]
+
+    def __len__(self) -> int:
+        return len(self.t_us)
+
+
+def evaluate_timeline(
+    profile: ProfileConfig,
+    tz: str,
+    start: datetime,
+    end: datetime,
+    step: timedelta,
+    *,
+    mist_runtime: MistRuntime | None = None,
+) -> Timeline:
+    """
+    Evaluate lighting, UVB and mist for every instant start + k*step in [start, end).
+
+    Work is done one local day at a time with array operations over that day's
+    compiled segments. Mist runtime rules (spacing, daily cap) are inherently
+    sequential, so only samples that fall inside a burst slot are visited one by
+    one. Pass `mist_runtime` to continue from (and update) an existing runtime.
+    """
+    if np is None:
+        raise RuntimeError(
+            "evaluate_timeline requires numpy. Install it with: poetry install --with sim"
+        )
+
+    step_us = step // timedelta(microseconds=1)
+    if step_us <= 0:
+        raise ValueError("step must be positive")
+
+    sched = CompiledSchedule(profile, tz)
+    rt = mist_runtime if mist_runtime is not None else MistRuntime()
+
+    a = to_epoch_us(sched.localize(start))
+    b = to_epoch_us(sched.localize(end))
+    n = max(0, -(-(b - a) // step_us))
+
+    t = a + np.arange(n, dtype=np.int64) * step_us
+    light = np.zeros(n, dtype=np.float64)
+    uvb = np.zeros(n, dtype=np.bool_)
+    mist = np.zeros(n, dtype=np.int32)
+
+    if n == 0:
+        return Timeline(t_us=t, light=light, uvb=uvb, mist_seconds=mist)
+
+    for plan in sched.day_plans(start, end):
+        lo, hi = (int(i) for i in np.searchsorted(t, [plan.start, plan.end]))
+        if lo == hi:
+            continue
+        ts = t[lo:hi]
+        light[lo:hi] = _eval_track(plan.light, ts)
+        uvb[lo:hi] = _eval_track(plan.uvb, ts) > 0.0
+
+        for i in _mist_candidates(plan, ts) + lo:
+            now = from_epoch_us(int(t[i]), sched.zone)
+            seconds = sched.mist_burst_due(now, rt)
+            if seconds:
+                mist[i] = seconds
+                rt.record_burst(now, seconds)
+
+    return Timeline(t_us=t, light=light, uvb=uvb, mist_seconds=mist)
+
+
+def _eval_track(track: Track, t: NDArray[np.int64]) -> NDArray[np.float64]:
+    segs = track.segments
+    idx = np.searchsorted(np.array(track.starts, dtype=np.int64), t, side="right") - 1
+    np.maximum(idx, 0, out=idx)
+
+    peak = np.array([s.peak for s in segs], dtype=np.float64)[idx]
+    origin = np.array([s.origin for s in segs], dtype=np.int64)[idx]
+    span = np.array([s.span for s in segs], dtype=np.int64)[idx]
+
+    out = peak.copy()
+    ramp = span != 0
+    if ramp.any():
+        # int64 / int64 divides in float64, matching timedelta / timedelta exactly
+        frac = (t[ramp] - origin[ramp]) / span[ramp]
+        p = peak[ramp]
+        out[ramp] = np.maximum(0.0, np.minimum(p, p * frac))
+    return out
+
+
+def _mist_candidates(plan: DayPlan, t: NDArray[np.int64]) -> NDArray[np.intp]:
+    """Indices into t that fall inside one of the day's mist slots."""
+    if not plan.mist:
+        return np.empty(0, dtype=np.intp)
+    starts = np.array(plan.mist_starts, dtype=np.int64)
+    ends = np.array([s.end for s in plan.mist], dtype=np.int64)
+
+    idx = np.searchsorted(starts, t, side="right") - 1
+    inside = idx >= 0
+    inside[inside] = t[inside] < ends[idx[inside]]
+    return np.flatnonzero(inside)
@@ -1,16 +1,15 @@
 from __future__ import annotations
 from datetime import datetime, time, timedelta
-from zoneinfo import ZoneInfo
 
 from vivariumassistant.packages.core.config_schema import UVBProfile
+from vivariumassistant.packages.engine.context import TickContext, localize
 
 def _parse_hhmm(s: str) -> time:
     hh, mm = s.split(":")
     return time(hour=int(hh), minute=int(mm))
 
-def uvb_should_be_on(now: datetime, tz: str, prof: UVBProfile) -> bool:
-    zone = ZoneInfo(tz)
-    now = now.astimezone(zone) if now.tzinfo else now.replace(tzinfo=zone)
+def uvb_should_be_on(now: datetime | TickContext, tz: str, prof: UVBProfile) -> bool:
+    now, zone = localize(now, tz)
 
     start_t = _parse_hhmm(prof.start)
     end_t = _parse_hhmm(prof.end)
@@ -21,7 +20,8 @@ def uvb_should_be_on(now: datetime, tz: str, prof: UVBProfile) -> bool:
 
     if end <= start:  # overnight support
         end += timedelta(days=1)
-        if now < start:
+        if now < start:  # still inside yesterday's window
             start -= timedelta(days=1)
+            end -= timedelta(days=1)
 
     return start <= now < end
\ No newline at end of file
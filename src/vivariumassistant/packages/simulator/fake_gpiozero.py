@@ -0,0 +1,65 @@
+"""
+Stand-in for the parts of gpiozero the REAL drivers use, so they (and their
+hardware I/O worker) can be tested and benchmarked off the Pi:
+
+    VA_GPIOZERO_MODULE=vivariumassistant.packages.simulator.fake_gpiozero
+
+Every pin write is appended to `writes` as (pin, value). `latency` adds a
+delay to each write, and clearing `responsive` makes writes hang until it is
+set again, like a wedged pin. reset() puts all three back.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+writes: list[tuple[int, float]] = []
+latency = 0.0
+responsive = threading.Event()
+responsive.set()
+
+
+def reset() -> None:
+    global latency
+    writes.clear()
+    latency = 0.0
+    responsive.set()
+
+
+class _OutputDevice:
+    def __init__(self, pin: int, *, initial_value: float = 0.0) -> None:
+        self.pin = pin
+        self.closed = False
+        self._value = float(initial_value)
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    @value.setter
+    def value(self, v: float) -> None:
+        responsive.wait()
+        if latency:
+            time.sleep(latency)
+        self._value = float(v)
+        writes.append((self.pin, self._value))
+
+    def on(self) -> None:
+        self.value = 1.0
+
+    def off(self) -> None:
+        self.value = 0.0
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class PWMOutputDevice(_OutputDevice):
+    pass
+
+
+class DigitalOutputDevice(_OutputDevice):
+    @property
+    def is_active(self) -> bool:
+        return self._value > 0.0
@@ -0,0 +1,69 @@
+"""
+In-memory stand-in for the parts of smbus2 the I2C drivers use, so they run
+(and are benchmarked) without a bus:
+
+    VA_SMBUS_MODULE=vivariumassistant.packages.simulator.fake_smbus
+
+Each (bus, address) gets a 256-byte register file shared by every SMBus
+opened on that bus number, so a test can open the bus again to inspect what
+a driver wrote. Block transfers auto-increment the register address.
+Register-less devices (PCF8574-style expanders) keep their port byte in
+register 0. Every transaction is appended to `transactions` as
+(bus, address, register, data), with register None for those.
+reset() forgets all of it.
+"""
+
+from __future__ import annotations
+
+I2C_BLOCK_MAX = 32  # bytes per SMBus block transfer
+
+transactions: list[tuple[int, int, int | None, bytes]] = []
+_registers: dict[tuple[int, int], bytearray] = {}
+
+
+def reset() -> None:
+    transactions.clear()
+    _registers.clear()
+
+
+class SMBus:
+    def __init__(self, bus: int = 1) -> None:
+        self.bus = bus
+        self.closed = False
+
+    def registers(self, address: int) -> bytearray:
+        """The register file of the device at `address` (created empty on first use)."""
+        return _registers.setdefault((self.bus, address), bytearray(256))
+
+    def write_byte(self, i2c_addr: int, value: int) -> None:
+        self._write(i2c_addr, None, [value])
+
+    def read_byte(self, i2c_addr: int) -> int:
+        return self.registers(i2c_addr)[0]
+
+    def write_byte_data(self, i2c_addr: int, register: int, value: int) -> None:
+        self._write(i2c_addr, register, [value])
+
+    def read_byte_data(self, i2c_addr: int, register: int) -> int:
+        return self.registers(i2c_addr)[register]
+
+    def write_i2c_block_data(self, i2c_addr: int, register: int, data: list[int]) -> None:
+        if len(data) > I2C_BLOCK_MAX:
+            raise ValueError(f"block of {len(data)} bytes exceeds {I2C_BLOCK_MAX}")
+        self._write(i2c_addr, register, data)
+
+    def read_i2c_block_data(self, i2c_addr: int, register: int, length: int) -> list[int]:
+        regs = self.registers(i2c_addr)
+        return [regs[(register + i) & 0xFF] for i in range(length)]
+
+    def close(self) -> None:
+        self.closed = True
+
+    def _write(self, i2c_addr: int, register: int | None, data: list[int]) -> None:
+        regs = self.registers(i2c_addr)
+        start = register or 0
+        for i, value in enumerate(data):
+            if not 0 <= value <= 0xFF:
+                raise ValueError(f"byte out of range: {value!r}")
+            regs[(start + i) & 0xFF] = value
+        transactions.append((self.bus, i2c_addr, register, bytes(data)))
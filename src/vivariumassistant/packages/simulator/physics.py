@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Union
+
+from vivariumassistant.packages.core.config_schema import ProfileConfig
+from vivariumassistant.packages.engine.timeline import evaluate_timeline
+from vivariumassistant.packages.simulator.sensor import SimSensorDriver
+
+# Guarded import so the agent itself never requires numpy.
+try:
+    import numpy as np
+except Exception:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike, NDArray
+
+    Param = Union[float, NDArray[np.float64]]
+else:
+    Param = float
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError(
+            "The climate simulator requires numpy. Install it with: poetry install --with sim"
+        )
+
+
+@dataclass(frozen=True)
+class ClimateParams:
+    """
+    Lumped enclosure model. Every field may be a scalar or an array with one
+    value per enclosure in the batch.
+
+    Temperature relaxes toward ambient plus heat from the light and heat lamp;
+    relative humidity relaxes toward ambient humidity, corrected for the air
+    being warmer than ambient, and jumps with every second of misting. The fan
+    speeds up both by increasing air exchange.
+    """
+
+    ambient_temp_c: Param = 22.0
+    ambient_humidity_pct: Param = 55.0
+    temp_tau_s: Param = 1800.0  # time constant toward the equilibrium temperature
+    humidity_tau_s: Param = 2400.0
+    light_gain_c: Param = 4.0  # steady-state rise over ambient at full light
+    heat_gain_c: Param = 8.0  # same, heat lamp fully on
+    fan_exchange: Param = 3.0  # full fan multiplies air exchange by 1 + this
+    mist_humidity_per_s: Param = 0.8  # RH points per second of misting
+    mist_cooling_c_per_s: Param = 0.02
+    humidity_per_c: Param = 0.06  # fractional RH drop per degree above ambient
+
+
+@dataclass(frozen=True)
+class ClimateRun:
+    """State after each step, shape (steps, enclosures)."""
+
+    t_us: NDArray[np.int64]
+    temperature_c: NDArray[np.float64]
+    humidity_pct: NDArray[np.float64]
+
+
+class ClimateBatch:
+    """Temperature and humidity of `n` enclosures, stepped together with array operations."""
+
+    def __init__(
+        self,
+        n: int,
+        params: ClimateParams | None = None,
+        *,
+        temperature_c: ArrayLike | None = None,
+        humidity_pct: ArrayLike | None = None,
+    ) -> None:
+        _require_numpy()
+        self.n = n
+        self.params = params or ClimateParams()
+        p = self.params
+        self.temperature_c = np.array(
+            np.broadcast_to(p.ambient_temp_c if temperature_c is None else temperature_c, n),
+            dtype=np.float64,
+        )
+        self.humidity_pct = np.array(
+            np.broadcast_to(p.ambient_humidity_pct if humidity_pct is None else humidity_pct, n),
+            dtype=np.float64,
+        )
+
+    def step(
+        self,
+        dt: float,
+        *,
+        light: ArrayLike = 0.0,
+        heat: ArrayLike = 0.0,
+        fan: ArrayLike = 0.0,
+        mist_seconds: ArrayLike = 0.0,
+    ) -> None:
+        """
+        Advance every enclosure by `dt` seconds with the given outputs held
+        constant (levels 0..1; mist_seconds = seconds the mister ran in the step).
+        The relaxation is integrated exactly, so large steps stay stable.
+        """
+        p = self.params
+        exchange = 1.0 + p.fan_exchange * np.asarray(fan, dtype=np.float64)
+        mist = np.asarray(mist_seconds, dtype=np.float64)
+
+        temp = self.temperature_c
+        t_eq = (
+            p.ambient_temp_c
+            + p.light_gain_c * np.asarray(light, dtype=np.float64)
+            + p.heat_gain_c * np.asarray(heat, dtype=np.float64)
+        )
+        temp += (t_eq - temp) * -np.expm1(-dt * exchange / p.temp_tau_s)
+        temp -= p.mist_cooling_c_per_s * mist
+
+        hum = self.humidity_pct
+        h_eq = p.ambient_humidity_pct * np.exp(-p.humidity_per_c * (temp - p.ambient_temp_c))
+        hum += (h_eq - hum) * -np.expm1(-dt * exchange / p.humidity_tau_s)
+        hum += p.mist_humidity_per_s * mist
+        np.clip(hum, 0.0, 100.0, out=hum)
+
+    def run(
+        self,
+        dt: float,
+        steps: int,
+        *,
+        light: ArrayLike = 0.0,
+        heat: ArrayLike = 0.0,
+        fan: ArrayLike = 0.0,
+        mist_seconds: ArrayLike = 0.0,
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        Step `steps` times. Inputs broadcast to (steps, n): pass a scalar, one
+        value per step (shape (steps, 1)), or one per step and enclosure.
+        Returns temperature and humidity after each step, shape (steps, n).
+        """
+        shape = (steps, self.n)
+        inputs = [
+            np.broadcast_to(np.asarray(x, dtype=np.float64), shape)
+            for x in (light, heat, fan, mist_seconds)
+        ]
+        temps = np.empty(shape)
+        hums = np.empty(shape)
+        light_in, heat_in, fan_in, mist_in = inputs
+        for k in range(steps):
+            self.step(
+                dt, light=light_in[k], heat=heat_in[k], fan=fan_in[k], mist_seconds=mist_in[k]
+            )
+            temps[k] = self.temperature_c
+            hums[k] = self.humidity_pct
+        return temps, hums
+
+    def feed(self, sensors: Sequence[Sequence[SimSensorDriver]]) -> None:
+        """Push enclosure i's current state into each simulated sensor in sensors[i]."""
+        for i, group in enumerate(sensors):
+            for sensor in group:
+                sensor.set(float(self.temperature_c[i]), float(self.humidity_pct[i]))
+
+
+def simulate_profiles(
+    profiles: Sequence[ProfileConfig],
+    tz: str,
+    start: datetime,
+    end: datetime,
+    step: timedelta,
+    *,
+    params: ClimateParams | None = None,
+) -> ClimateRun:
+    """
+    What-if run: enclosure i follows profiles[i] (light level and mist bursts
+    from evaluate_timeline) from start to end. Repeat a profile in the list to
+    try it under several params (pass per-enclosure arrays in `params`).
+    """
+    _require_numpy()
+    # one timeline per distinct profile object, however often it is repeated
+    unique = {id(p): p for p in profiles}
+    by_id = {key: evaluate_timeline(p, tz, start, end, step) for key, p in unique.items()}
+    timelines = [by_id[id(p)] for p in profiles]
+    light = np.stack([tl.light for tl in timelines], axis=1)
+    mist = np.stack([tl.mist_seconds for tl in timelines], axis=1).astype(np.float64)
+
+    batch = ClimateBatch(len(profiles), params)
+    temps, hums = batch.run(step.total_seconds(), light.shape[0], light=light, mist_seconds=mist)
+    t_us = timelines[0].t_us if timelines else np.empty(0, dtype=np.int64)
+    return ClimateRun(t_us=t_us, temperature_c=temps, humidity_pct=hums)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+import asyncio
+from vivariumassistant.packages.drivers.base import SensorDriver, SensorReading
+
+class SimSensorDriver(SensorDriver):
+    """
+    Simulated climate sensor. Reports whatever was last set (by a test, or by a
+    physics model feeding it), limited to the quantities its kind measures.
+    """
+    def __init__(
+        self,
+        kind: str = "temp_humidity",
+        *,
+        temperature_c: float = 24.0,
+        humidity_pct: float = 70.0,
+        latency_s: float = 0.0,
+    ):
+        self.kind = kind
+        self.temperature_c = temperature_c
+        self.humidity_pct = humidity_pct
+        # simulated bus transfer time
+        self.latency_s = latency_s
+        self.reads = 0
+
+    def set(self, temperature_c: float | None = None, humidity_pct: float | None = None) -> None:
+        if temperature_c is not None:
+            self.temperature_c = temperature_c
+        if humidity_pct is not None:
+            self.humidity_pct = humidity_pct
+
+    async def read(self) -> SensorReading:
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        self.reads += 1
+        return SensorReading(
+            temperature_c=self.temperature_c if self.kind in ("temp_humidity", "temp") else None,
+            humidity_pct=self.humidity_pct if self.kind in ("temp_humidity", "humidity") else None,
+        )
@@ -0,0 +1,11 @@
+import pytest
+
+from vivariumassistant.packages.simulator import fake_smbus
+
+
+@pytest.fixture
+def bus():
+    """A fake SMBus on bus 1, with the shared register files cleared around the test."""
+    fake_smbus.reset()
+    yield fake_smbus.SMBus(1)
+    fake_smbus.reset()
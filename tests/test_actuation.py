@@ -0,0 +1,77 @@
+import asyncio
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from vivariumassistant.apps.agent.actuation import ActuationScheduler
+from vivariumassistant.packages.core.clock import RealClock, SimClock
+from vivariumassistant.packages.simulator.relay import SimRelayDriver
+
+START = datetime(2026, 1, 15, 7, 30, tzinfo=ZoneInfo("America/New_York"))
+
+
+@pytest.mark.asyncio
+async def test_pulse_turns_off_at_deadline_without_blocking():
+    clock = SimClock(START)
+    relay = SimRelayDriver()
+    sched = ActuationScheduler(clock)
+
+    await sched.pulse(relay, 2, 20)
+    assert await relay.get_on(2) is True
+    assert sched.next_deadline() == START + timedelta(seconds=20)
+
+    clock.advance(19)
+    assert await sched.fire_due() == 0
+    assert await relay.get_on(2) is True
+
+    clock.advance(1)
+    assert await sched.fire_due() == 1
+    assert await relay.get_on(2) is False
+    assert sched.next_deadline() is None
+
+
+@pytest.mark.asyncio
+async def test_repulse_replaces_deadline_and_cancel_is_lazy():
+    clock = SimClock(START)
+    relay = SimRelayDriver()
+    sched = ActuationScheduler(clock)
+
+    await sched.pulse(relay, 1, 10)
+    await sched.pulse(relay, 1, 30)
+    await sched.pulse(relay, 2, 5)
+    assert len(sched) == 2
+
+    assert sched.cancel(("nope", 0)) is False
+    clock.advance(10)
+    await sched.fire_due()
+    assert await relay.get_on(1) is True
+    assert await relay.get_on(2) is False
+
+
+@pytest.mark.asyncio
+async def test_close_runs_pending_offs():
+    clock = SimClock(START)
+    relay = SimRelayDriver()
+    sched = ActuationScheduler(clock)
+
+    await sched.pulse(relay, 1, 600)
+    await sched.pulse(relay, 2, 600)
+    await sched.close()
+
+    assert await relay.get_on(1) is False
+    assert await relay.get_on(2) is False
+    assert len(sched) == 0
+
+
+@pytest.mark.asyncio
+async def test_timer_task_fires_on_real_time():
+    sched = ActuationScheduler(RealClock("UTC"))
+    relay = SimRelayDriver()
+    sched.start()
+    try:
+        await sched.pulse(relay, 0, 0.05)
+        await asyncio.sleep(0.2)
+        assert await relay.get_on(0) is False
+    finally:
+        await sched.close()
@@ -0,0 +1,156 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from vivariumassistant.apps.agent.sim_agent import SimAgent
+from vivariumassistant.apps.api.app import create_api
+from vivariumassistant.apps.api.snapshots import SnapshotHub
+from vivariumassistant.packages.core.clock import SimClock
+from vivariumassistant.packages.core.device_state import DeviceState, StateRecord
+from vivariumassistant.packages.core.manual_override import ManualOverride
+from vivariumassistant.packages.core.telemetry import TelemetryBuffer
+
+ZONE = ZoneInfo("America/New_York")
+NOON = datetime(2026, 1, 15, 12, tzinfo=ZONE)
+
+
+def published_agent() -> tuple[SimAgent, SimClock]:
+    clock = SimClock(NOON)
+    agent = SimAgent("enclosure_1", "crested_gecko", clock=clock)
+    agent.snapshots = SnapshotHub()
+    agent.telemetry = TelemetryBuffer()
+    return agent, clock
+
+
+async def get(port: int, target: str, *headers: str) -> tuple[bytes, bytes]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    extra = "".join(f"{h}\r\n" for h in headers)
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: test\r\n{extra}\r\n".encode())
+    raw = await reader.read()
+    writer.close()
+    head, _, body = raw.partition(b"\r\n\r\n")
+    return head, body
+
+
+def test_publish_only_changes_on_new_state():
+    hub = SnapshotHub()
+    states = {"uvb": StateRecord("uvb", True)}
+    assert hub.publish("e1", NOON, states)
+    body, etag = hub.snapshot("e1")
+
+    assert not hub.publish("e1", NOON + timedelta(seconds=5), dict(states))
+    assert hub.snapshot("e1") == (body, etag)
+
+    assert hub.publish("e1", NOON, {"uvb": StateRecord("uvb", False)})
+    assert hub.snapshot("e1")[1] != etag
+    assert hub.snapshot("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_disconnected():
+    hub = SnapshotHub(queue_size=2)
+    sub = hub.subscribe()
+    for i in range(3):
+        hub.publish("e1", NOON, {"light_day": StateRecord("light_day", True, i / 10)})
+
+    assert sub.queue.get_nowait() is None
+    # the next publish does not queue anything for it
+    hub.publish("e1", NOON, {"light_day": StateRecord("light_day", False, 0.0)})
+    assert sub.queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_state_is_served_from_snapshot_with_etag():
+    agent, _ = published_agent()
+    await agent.tick()
+
+    def no_evaluation(now):
+        raise AssertionError("reads must not evaluate")
+
+    agent.evaluate = no_evaluation  # type: ignore[method-assign]
+    api = create_api(lambda: {}, snapshots=agent.snapshots, port=0)
+    await api.start()
+    try:
+        head, body = await get(api.port, "/state?enclosure=enclosure_1")
+        etag = next(
+            line.split(b": ", 1)[1] for line in head.split(b"\r\n") if line.startswith(b"ETag")
+        )
+        head2, body2 = await get(
+            api.port, "/state?enclosure=enclosure_1", f"If-None-Match: {etag.decode()}"
+        )
+        _, everything = await get(api.port, "/state")
+        missing, _ = await get(api.port, "/state?enclosure=nope")
+    finally:
+        await api.close()
+
+    assert head.startswith(b"HTTP/1.1 200")
+    doc = json.loads(body)
+    assert doc["desired"]["uvb"]["on"] is True
+    assert doc["overrides"] == []
+    assert head2.startswith(b"HTTP/1.1 304") and body2 == b""
+    assert json.loads(everything)["enclosure_1"] == doc
+    assert missing.startswith(b"HTTP/1.1 404")
+
+
+@pytest.mark.asyncio
+async def test_event_stream_sends_snapshot_then_deltas():
+    agent, clock = published_agent()
+    await agent.tick()
+    api = create_api(lambda: {}, snapshots=agent.snapshots, port=0)
+    await api.start()
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", api.port)
+        writer.write(b"GET /events?enclosure=enclosure_1 HTTP/1.1\r\nHost: test\r\n\r\n")
+        head = await reader.readuntil(b"\r\n\r\n")
+        first = await reader.readuntil(b"\n\n")
+
+        agent.set_override(
+            ManualOverride(
+                device_id="uvb",
+                state=DeviceState(device_id="uvb", on=False),
+                expires_at=NOON + timedelta(hours=1),
+            )
+        )
+        clock.advance(5)
+        await agent.tick()
+        second = await asyncio.wait_for(reader.readuntil(b"\n\n"), 2)
+        writer.close()
+    finally:
+        await api.close()
+
+    assert b"text/event-stream" in head
+    assert b"Content-Length" not in head
+    assert b"event: snapshot" in first
+    assert b"event: delta" in second
+    delta = json.loads(second.split(b"data: ", 1)[1])
+    assert set(delta["changed"]) == {"uvb"}
+    assert delta["overrides"][0]["selector"] == "device:uvb"
+
+
+@pytest.mark.asyncio
+async def test_history_endpoint():
+    agent, clock = published_agent()
+    for _ in range(3):
+        await agent.tick()
+        clock.advance(5)
+    api = create_api(lambda: {}, history=lambda _: agent.telemetry, port=0)
+    await api.start()
+    try:
+        head, body = await get(api.port, "/history?enclosure=enclosure_1&channel=uvb&seconds=60")
+        bad, _ = await get(api.port, "/history?enclosure=enclosure_1")
+        out_of_range = [
+            (await get(api.port, f"/history?enclosure=enclosure_1&channel=uvb&seconds={v}"))[0]
+            for v in ("inf", "nan", "-60", "0")
+        ]
+    finally:
+        await api.close()
+
+    assert head.startswith(b"HTTP/1.1 200")
+    doc = json.loads(body)
+    assert doc["resolution"] == "raw"
+    assert doc["value"] == [1.0, 1.0, 1.0]
+    assert bad.startswith(b"HTTP/1.1 400")
+    assert all(h.startswith(b"HTTP/1.1 400") for h in out_of_range)
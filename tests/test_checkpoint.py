@@ -0,0 +1,175 @@
+import asyncio
+import json
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from vivariumassistant.apps.agent.checkpoint import (
+    CHECKPOINT_VERSION,
+    AgentCheckpointer,
+    GlobalOverrideCheckpointer,
+    read_checkpoint,
+)
+from vivariumassistant.apps.agent.host import AgentHost
+from vivariumassistant.apps.agent.sim_agent import SimAgent
+from vivariumassistant.packages.core.clock import SimClock
+from vivariumassistant.packages.core.device_state import DeviceState
+from vivariumassistant.packages.core.manual_override import GroupOverride, ManualOverride
+from vivariumassistant.packages.engine.mist import MistRuntime
+from vivariumassistant.packages.engine.override_store import OverrideStore
+
+ZONE = ZoneInfo("America/New_York")
+
+
+def at(hh: int, mm: int = 0, ss: int = 0, day: int = 15) -> datetime:
+    return datetime(2026, 1, day, hh, mm, ss, tzinfo=ZONE)
+
+
+def make_agent(now: datetime) -> tuple[SimAgent, SimClock]:
+    clock = SimClock(now)
+    return SimAgent("enclosure_1", "crested_gecko", clock=clock), clock
+
+
+@pytest.mark.asyncio
+async def test_restart_does_not_repeat_a_burst(tmp_path):
+    path = tmp_path / "enclosure_1.json"
+    agent, clock = make_agent(at(7, 30, 5))
+    cp = AgentCheckpointer(agent, path)
+    _, desired = await agent.tick()
+    assert desired["mister"].on
+    agent.set_override(
+        ManualOverride(
+            device_id="uvb",
+            state=DeviceState(device_id="uvb", on=True),
+            expires_at=at(9),
+        )
+    )
+    assert cp.maybe_save(clock.now())
+
+    # restart a minute later, still inside the burst's grace window
+    restarted, _ = make_agent(at(7, 31))
+    assert AgentCheckpointer(restarted, path).restore()
+    _, desired = await restarted.tick()
+
+    assert not desired["mister"].on
+    assert desired["uvb"].on
+    assert restarted.mist_rt.daily_seconds_used == {"2026-01-15": 20}
+    # not trusted by default: the first tick rewrote every channel
+    assert restarted.metrics.driver_writes["pwm"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unchanged_state_is_not_rewritten(tmp_path):
+    agent, clock = make_agent(at(1))
+    cp = AgentCheckpointer(agent, tmp_path / "cp.json", min_interval_seconds=60)
+
+    for _ in range(720):  # one night hour of 5 s ticks
+        await agent.tick()
+        cp.maybe_save(clock.now())
+        clock.advance(5)
+    assert cp.writes == 1
+
+    agent.set_override(
+        ManualOverride(
+            device_id="uvb",
+            state=DeviceState(device_id="uvb", on=True),
+            expires_at=at(3),
+        )
+    )
+    await agent.tick()
+    assert cp.maybe_save(clock.now())
+    assert cp.writes == 2
+    doc = read_checkpoint(tmp_path / "cp.json")
+    assert doc is not None and doc["overrides"][0]["selector"] == ["device", "uvb"]
+
+
+def test_old_daily_counters_are_pruned():
+    rt = MistRuntime()
+    for day in range(10, 16):
+        rt.record_burst(at(7, 30, day=day), 20)
+    assert rt.daily_seconds_used == {"2026-01-14": 20, "2026-01-15": 20}
+
+
+def test_unusable_checkpoints_are_ignored(tmp_path):
+    agent, _ = make_agent(at(7))
+    path = tmp_path / "cp.json"
+    cp = AgentCheckpointer(agent, path)
+    assert not cp.restore()
+
+    path.write_text("{not json")
+    assert not cp.restore()
+
+    path.write_text(json.dumps({"version": CHECKPOINT_VERSION + 1}))
+    assert not cp.restore()
+    assert agent.mist_rt.last_burst_at is None
+
+
+@pytest.mark.asyncio
+async def test_host_restores_agents_and_global_overrides(tmp_path):
+    clock = SimClock(at(12))
+    host = AgentHost(
+        [SimAgent("enclosure_1", "crested_gecko", clock=clock)],
+        log_ticks=False,
+        checkpoint_dir=tmp_path,
+    )
+    host.overrides.set_group(
+        GroupOverride(state=DeviceState(device_id="*", on=False, level=0.0), expires_at=at(13))
+    )
+    agent = host.agents["enclosure_1"]
+    await agent.tick()
+    await host._checkpoint(agent, clock.now())
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["_global.json", "enclosure_1.json"]
+
+    again = AgentHost(
+        [SimAgent("enclosure_1", "crested_gecko", clock=clock)],
+        log_ticks=False,
+        checkpoint_dir=tmp_path,
+    )
+    _, desired = await again.agents["enclosure_1"].tick()
+    assert desired["light_day"].level == 0.0
+
+
+@pytest.mark.asyncio
+async def test_failed_global_write_is_retried(tmp_path):
+    store = OverrideStore()
+    path = tmp_path / "missing" / "_global.json"
+    cp = GlobalOverrideCheckpointer(store, path)
+    store.set_group(
+        GroupOverride(state=DeviceState(device_id="*", on=False, level=0.0), expires_at=at(13))
+    )
+    with pytest.raises(OSError):
+        await cp.flush()
+
+    path.parent.mkdir()
+    assert await cp.flush()
+    assert not await cp.flush()
+    doc = read_checkpoint(path)
+    assert doc is not None and len(doc["overrides"]) == 1
+
+
+async def wait_for(condition, timeout: float = 2.0) -> None:
+    # the writes go through a worker thread, so this waits in wall-clock time
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "timed out"
+        await asyncio.sleep(0.001)
+
+
+@pytest.mark.asyncio
+async def test_failed_write_does_not_stop_the_agent(tmp_path, caplog):
+    path = tmp_path / "missing" / "enclosure_1.json"
+    agent, clock = make_agent(at(12))
+    agent.checkpoint = AgentCheckpointer(agent, path, min_interval_seconds=0)
+    task = asyncio.create_task(agent.run(interval_seconds=5))
+    await wait_for(lambda: "checkpoint_write_failed" in [r.message for r in caplog.records])
+    assert not task.done()
+
+    # the checkpointer forgot the failed write, so it is written once the directory exists
+    path.parent.mkdir()
+    await wait_for(path.exists)
+    assert not task.done()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
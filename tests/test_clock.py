@@ -17,4 +17,12 @@ def test_sim_clock_advances():
 
     assert clock.now() == start
     clock.advance(60)
-    assert clock.now() == start + timedelta(seconds=60)
\ No newline at end of file
+    assert clock.now() == start + timedelta(seconds=60)
+
+@pytest.mark.asyncio
+async def test_sim_clock_sleep_advances_without_waiting():
+    start = datetime(2025, 1, 1, tzinfo=ZoneInfo("UTC"))
+    clock = SimClock(start)
+
+    await clock.sleep(3600)
+    assert clock.now() == start + timedelta(hours=1)
@@ -0,0 +1,73 @@
+import os
+from pathlib import Path
+
+import pytest
+import yaml
+
+from vivariumassistant.packages.core import config_store
+from vivariumassistant.packages.core.config_loader import PROFILES_DIR
+from vivariumassistant.packages.core.config_store import ConfigStore
+
+
+@pytest.fixture
+def profile_path(tmp_path: Path) -> Path:
+    path = tmp_path / "gecko.yaml"
+    path.write_text((PROFILES_DIR / "crested_gecko.yaml").read_text())
+    return path
+
+
+def rewrite(path: Path, **lighting) -> None:
+    data = yaml.safe_load(path.read_text())
+    data["lighting"].update(lighting)
+    path.write_text(yaml.safe_dump(data))
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+def test_cached_until_content_changes(profile_path):
+    store = ConfigStore()
+    first = store.profile(profile_path)
+    assert store.profile(profile_path) is first
+
+    # touched but identical: stamps differ, hash matches, model kept
+    st = profile_path.stat()
+    os.utime(profile_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert store.poll() == []
+    assert store.profile(profile_path) is first
+
+    rewrite(profile_path, max_brightness=0.5)
+    assert store.poll() == [profile_path]
+    assert store.profile(profile_path).lighting.max_brightness == 0.5
+
+
+def test_invalid_edit_keeps_last_good_model(profile_path):
+    store = ConfigStore()
+    good = store.profile(profile_path)
+
+    profile_path.write_text("lighting: [not, a, mapping")
+    st = profile_path.stat()
+    os.utime(profile_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert store.poll() == []
+    assert store.profile(profile_path) is good
+
+
+def test_snapshot_skips_yaml_parsing(profile_path, tmp_path, monkeypatch):
+    store = ConfigStore()
+    expected = store.profile(profile_path)
+    snapshot = tmp_path / "snapshot.json"
+    store.save_snapshot(snapshot)
+
+    def no_parse(*args):
+        raise AssertionError("snapshot entry should have been used")
+
+    monkeypatch.setattr(config_store, "_parse", no_parse)
+    warm = ConfigStore(snapshot)
+    assert len(warm) == 1
+    assert warm.profile(profile_path) == expected
+
+
+def test_bad_snapshot_is_ignored(tmp_path):
+    snapshot = tmp_path / "snapshot.json"
+    snapshot.write_text('{"version": 0, "entries": {}}')
+    assert ConfigStore().load_snapshot(snapshot) == 0
+    assert ConfigStore().load_snapshot(tmp_path / "missing.json") == 0
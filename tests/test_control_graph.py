@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from vivariumassistant.apps.agent.sim_agent import SimAgent
+from vivariumassistant.packages.core.clock import SimClock
+from vivariumassistant.packages.core.config_loader import load_profile
+from vivariumassistant.packages.core.config_schema import (
+    DeviceConfig,
+    DeviceKind,
+    EnclosureConfig,
+)
+from vivariumassistant.packages.engine.control_graph import ControlGraph, Rule
+from vivariumassistant.packages.engine.mist import MistRuntime
+from vivariumassistant.packages.engine.schedule import CompiledSchedule
+
+TZ = "America/New_York"
+ZONE = ZoneInfo(TZ)
+
+
+def at(hh: int, mm: int = 0, ss: int = 0) -> datetime:
+    return datetime(2026, 1, 15, hh, mm, ss, tzinfo=ZONE)
+
+
+def device(id: str, kind: DeviceKind, channel: int) -> DeviceConfig:
+    return DeviceConfig(id=id, name=id, kind=kind, driver="sim", params={"channel": channel})
+
+
+def two_of_each(start: datetime) -> tuple[SimAgent, SimClock]:
+    enc = EnclosureConfig(
+        id="big",
+        name="Big",
+        timezone=TZ,
+        devices=[
+            device("light_left", "light", 0),
+            device("light_right", "light", 4),
+            device("uvb", "uvb", 1),
+            device("mister_front", "mist", 2),
+            device("mister_back", "mist", 5),
+            device("heater", "heat", 6),
+        ],
+    )
+    clock = SimClock(start)
+    return SimAgent.from_config(enc, load_profile("crested_gecko"), clock=clock), clock
+
+
+@pytest.mark.asyncio
+async def test_steady_ticks_reuse_cached_outputs():
+    agent, clock = two_of_each(at(12))
+    for _ in range(720):  # an hour of 5 s ticks
+        await agent.tick()
+        clock.advance(5)
+
+    # each rule ran once, for both devices of its kind
+    assert agent.graph.evaluations == {"light": 1, "uvb": 1, "mist": 1}
+
+
+def test_outputs_match_the_schedule_through_a_day():
+    prof = load_profile("crested_gecko")
+    sched = CompiledSchedule(prof, TZ)
+    graph = ControlGraph([device("l", "light", 0), device("u", "uvb", 1)], sched, MistRuntime())
+
+    now = at(0)
+    while now < at(0) + timedelta(days=1):
+        desired = graph.evaluate(sched.context(now))
+        assert desired["l"].level == sched.light_level(now)
+        assert desired["u"].on == sched.uvb_on(now)
+        now += timedelta(seconds=5)
+    # ramps are evaluated every tick, flat stretches once
+    assert graph.evaluations["uvb"] < 5
+    assert graph.evaluations["light"] < 86400 // 5 // 4
+
+
+@pytest.mark.asyncio
+async def test_devices_of_one_kind_share_a_rule():
+    agent, clock = two_of_each(at(7, 29, 55))
+    await agent.tick()
+    clock.advance(5)
+    _, desired = await agent.tick()
+
+    assert desired["mister_front"].on and desired["mister_back"].on
+    assert [await agent.relay.get_on(ch) for ch in (2, 5)] == [True, True]
+    # one burst, not one per mister
+    assert agent.mist_rt.daily_seconds_used == {"2026-01-15": 20}
+    assert "heater" not in desired
+
+    clock.advance(60)
+    _, desired = await agent.tick()
+    assert not desired["mister_front"].on and not desired["mister_back"].on
+
+
+@pytest.mark.asyncio
+async def test_new_profile_only_reruns_changed_sections():
+    agent, clock = two_of_each(at(12))
+    await agent.tick()
+    prof = agent.prof
+    assert prof.uvb is not None
+    agent.stage_profile(prof.model_copy(update={"uvb": prof.uvb.model_copy(update={"end": "12:30"})}))
+    clock.advance(5)
+    await agent.tick()
+
+    assert agent.graph.evaluations == {"light": 0, "uvb": 1, "mist": 0}
+    clock.advance(30 * 60)
+    _, desired = await agent.tick()
+    assert desired["uvb"].on is False
+
+
+def test_rule_without_evaluate_cannot_be_built():
+    class Incomplete(Rule):
+        kind = "light"
+
+    profile = load_profile("crested_gecko")
+    with pytest.raises(TypeError):
+        Incomplete(CompiledSchedule(profile, TZ), [], MistRuntime())  # type: ignore[abstract]
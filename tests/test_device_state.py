@@ -1,5 +1,5 @@
 import pytest
-from vivariumassistant.packages.core.device_state import DeviceState
+from vivariumassistant.packages.core.device_state import DeviceState, StateRecord
 
 
 def test_device_state_accepts_basic_fields():
@@ -19,4 +19,17 @@ def test_device_state_level_bounds():
 
 def test_device_state_level_optional():
     s = DeviceState(device_id="mister", on=False)
-    assert s.level is None
\ No newline at end of file
+    assert s.level is None
+
+def test_state_record_round_trips_through_model():
+    rec = StateRecord(device_id="mister", on=True, meta={"burst_seconds": 20})
+    model = rec.to_model()
+    assert isinstance(model, DeviceState)
+    assert rec.as_dict() == model.model_dump()
+    assert StateRecord.from_model(model) == rec
+
+
+def test_state_record_validates_only_at_the_boundary():
+    rec = StateRecord(device_id="light_day", on=True, level=1.5)
+    with pytest.raises(ValueError):
+        rec.to_model()
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from vivariumassistant.apps.agent.fast_forward import FastForwardRunner
+from vivariumassistant.apps.agent.sim_agent import SimAgent
+from vivariumassistant.packages.core.clock import SimClock
+
+ZONE = ZoneInfo("America/New_York")
+START = datetime(2026, 1, 15, tzinfo=ZONE)
+
+
+def _runner() -> FastForwardRunner:
+    clock = SimClock(START)
+    return FastForwardRunner(SimAgent("enclosure_1", "crested_gecko", clock=clock), clock)
+
+
+@pytest.mark.asyncio
+async def test_one_day_fixed_interval_on_virtual_time():
+    runner = _runner()
+    seen = []
+    report = await runner.run_for(
+        timedelta(days=1), on_tick=lambda now, desired: seen.append(desired["mister"].on)
+    )
+
+    assert runner.clock.now() == START + timedelta(days=1)
+    assert report.simulated_seconds == 86400
+    assert report.ticks == 86400 // 5
+    # 20s and 25s bursts run for their full length: 4 and 5 ticks see the mister on
+    assert sum(seen) == 9
+    assert runner.agent.mist_rt.daily_seconds_used == {"2026-01-15": 45}
+    assert await runner.agent.relay.get_on(2) is False
+
+
+@pytest.mark.asyncio
+async def test_event_driven_matches_fixed_interval_with_fewer_ticks():
+    fixed = _runner()
+    event = _runner()
+
+    r_fixed = await fixed.run_for(timedelta(days=2))
+    r_event = await event.run_for(timedelta(days=2), event_driven=True)
+
+    assert r_event.ticks < r_fixed.ticks / 10
+    assert event.agent.mist_rt.daily_seconds_used == fixed.agent.mist_rt.daily_seconds_used
+    assert await event.agent.pwm.get_level(0) == await fixed.agent.pwm.get_level(0)
+
+
+@pytest.mark.asyncio
+async def test_sparse_ticks_still_fire_scheduled_bursts():
+    runner = _runner()
+    # 4 minute ticks never land inside the 07:30 or 20:30 minute
+    await runner.run_for(timedelta(days=1), interval_seconds=4 * 60)
+    assert runner.agent.mist_rt.daily_seconds_used == {"2026-01-15": 45}
+
+
+@pytest.mark.asyncio
+async def test_event_driven_sunrise_steps_with_ramps_enabled():
+    runner = _runner()
+    agent = runner.agent
+    agent.enable_ramps()  # its task never runs on virtual time
+    runner.clock.advance(7 * 3600 + 55 * 60)
+    levels: list[float] = []
+    await runner.run_for(
+        timedelta(hours=1),
+        event_driven=True,
+        on_tick=lambda now, desired: levels.append(agent.applied[0].get(0, 0.0)),
+    )
+
+    # the light climbs through the 45 minute sunrise a PWM step at a time
+    assert levels[-1] == 0.85
+    steps = [b - a for a, b in zip(levels, levels[1:])]
+    assert len(levels) > 100
+    assert max(steps) <= 2 / agent.pwm_resolution
+
+
+def test_runner_requires_the_agents_clock():
+    agent = SimAgent("enclosure_1", "crested_gecko", clock=SimClock(START))
+    with pytest.raises(ValueError):
+        FastForwardRunner(agent, SimClock(START))
@@ -0,0 +1,99 @@
+import asyncio
+import os
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+import yaml
+
+from vivariumassistant.apps.agent.host import AgentHost
+from vivariumassistant.packages.core.config_loader import ENCLOSURES_DIR, PROFILES_DIR
+from vivariumassistant.packages.core.device_state import DeviceState
+from vivariumassistant.packages.core.manual_override import GroupOverride
+
+
+def _write_enclosures(tmp_path: Path, n: int) -> Path:
+    base = yaml.safe_load((ENCLOSURES_DIR / "enclosure_1.yaml").read_text())
+    for i in range(n):
+        (tmp_path / f"enc_{i}.yaml").write_text(yaml.safe_dump({**base, "id": f"enc_{i}"}))
+    return tmp_path
+
+
+def test_from_directory_shares_compiled_schedules(tmp_path):
+    host = AgentHost.from_directory(_write_enclosures(tmp_path, 3))
+
+    assert sorted(host.agents) == ["enc_0", "enc_1", "enc_2"]
+    schedules = {id(a.schedule) for a in host.agents.values()}
+    assert len(schedules) == 1
+    assert [host.phase_offset(i) for i in range(3)] == pytest.approx([0.0, 5 / 3, 10 / 3])
+
+
+def test_enclosure_without_profile_is_rejected(tmp_path):
+    base = yaml.safe_load((ENCLOSURES_DIR / "enclosure_1.yaml").read_text())
+    base.pop("profile")
+    (tmp_path / "bare.yaml").write_text(yaml.safe_dump(base))
+
+    with pytest.raises(ValueError):
+        AgentHost.from_directory(tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_runs_all_enclosures_concurrently(tmp_path):
+    host = AgentHost.from_directory(
+        _write_enclosures(tmp_path, 4), interval_seconds=0.05, log_ticks=False
+    )
+
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(host.run(), timeout=0.3)
+
+    report = host.latency_report()
+    assert set(report) == {"enc_0", "enc_1", "enc_2", "enc_3"}
+    assert all(r["ticks"] >= 3 for r in report.values())
+
+
+@pytest.mark.asyncio
+async def test_profile_reload_swaps_between_ticks_and_keeps_mist_runtime(tmp_path):
+    (tmp_path / "enc").mkdir()
+    enc_dir = _write_enclosures(tmp_path / "enc", 2)
+    prof_dir = tmp_path / "profiles"
+    prof_dir.mkdir()
+    prof_path = prof_dir / "crested_gecko.yaml"
+    prof_path.write_text((PROFILES_DIR / "crested_gecko.yaml").read_text())
+
+    host = AgentHost.from_directory(enc_dir, prof_dir, log_ticks=False)
+    agent = host.agents["enc_0"]
+    old_schedule = agent.schedule
+    rt = agent.mist_rt
+
+    data = yaml.safe_load(prof_path.read_text())
+    data["lighting"]["max_brightness"] = 0.5
+    prof_path.write_text(yaml.safe_dump(data))
+    os.utime(prof_path, ns=(0, prof_path.stat().st_mtime_ns + 1_000_000))
+
+    assert sorted(host.reload_profiles()) == ["enc_0", "enc_1"]
+    # staged only: nothing changes until the next tick starts
+    assert agent.schedule is old_schedule
+
+    await agent.tick()
+    assert agent.prof.lighting.max_brightness == 0.5
+    assert agent.schedule is host.agents["enc_1"]._pending_profile[1]
+    assert agent.mist_rt is rt
+
+
+@pytest.mark.asyncio
+async def test_group_override_reaches_every_enclosure(tmp_path):
+    host = AgentHost.from_directory(_write_enclosures(tmp_path, 3), log_ticks=False)
+    agents = list(host.agents.values())
+    now = agents[0].clock.now()
+    host.overrides.set_group(
+        GroupOverride(
+            state=DeviceState(device_id="*", on=False, level=0.0),
+            expires_at=now + timedelta(hours=1),
+            kind="light",
+        )
+    )
+
+    for agent in agents:
+        _, desired = await agent.tick()
+        assert desired["light_day"].level == 0.0
+        assert await agent.pwm.get_level(0) == 0.0
@@ -0,0 +1,154 @@
+import asyncio
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from vivariumassistant.apps.agent.sim_agent import SimAgent
+from vivariumassistant.packages.core.clock import SimClock
+from vivariumassistant.packages.core.config_schema import DeviceConfig, EnclosureConfig
+from vivariumassistant.packages.drivers.factory import FAKE_GPIOZERO_MODULE, build_drivers
+from vivariumassistant.packages.drivers.hw_worker import HardwareWorker
+from vivariumassistant.packages.drivers.real_pwm_gpiozero import RealPWMDriverGpioZero
+from vivariumassistant.packages.drivers.real_relay_gpiozero import RealRelayDriverGpioZero
+from vivariumassistant.packages.simulator import fake_gpiozero
+
+
+@pytest.fixture(autouse=True)
+def fake_pins():
+    fake_gpiozero.reset()
+    yield fake_gpiozero
+    fake_gpiozero.reset()
+
+
+async def until_idle(worker: HardwareWorker) -> None:
+    # the worker has taken every queued write (it may still be running one)
+    await asyncio.sleep(0)
+    while len(worker):
+        await asyncio.sleep(0.001)
+
+
+@pytest.mark.asyncio
+async def test_writes_to_a_busy_channel_coalesce(fake_pins):
+    pwm = RealPWMDriverGpioZero({0: 18, 1: 19}, gpio=fake_pins)
+    fake_pins.responsive.clear()
+    first = asyncio.create_task(pwm.set_level(0, 0.1))
+    await until_idle(pwm._worker)
+
+    # queued behind the hung write; only the last one per channel runs
+    later = [asyncio.create_task(pwm.set_level(0, lvl)) for lvl in (0.2, 0.3, 0.4)]
+    other = asyncio.create_task(pwm.set_level(1, 0.5))
+    await asyncio.sleep(0.01)
+    assert pwm._worker.coalesced == 2
+
+    fake_pins.responsive.set()
+    await asyncio.gather(first, *later, other)
+    assert fake_pins.writes == [(18, 0.1), (18, 0.4), (19, 0.5)]
+    assert await pwm.get_level(0) == 0.4
+    pwm.close()
+
+
+@pytest.mark.asyncio
+async def test_hung_pin_times_out_without_blocking_the_loop(fake_pins):
+    relay = RealRelayDriverGpioZero({2: 23}, gpio=fake_pins, write_timeout=0.05)
+    fake_pins.responsive.clear()
+
+    ticks = 0
+
+    async def heartbeat() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    beat = asyncio.create_task(heartbeat())
+    t0 = time.monotonic()
+    with pytest.raises(TimeoutError):
+        await relay.set_on(2, True)
+    assert time.monotonic() - t0 < 0.5
+    assert ticks > 3  # the loop kept running while the pin hung
+    assert await relay.get_on(2) is False  # not reported until it lands
+
+    # the write stays queued and lands once the pin answers, and is reported then
+    fake_pins.responsive.set()
+    for _ in range(500):
+        if await relay.get_on(2):
+            break
+        await asyncio.sleep(0.001)
+    assert await relay.get_on(2) is True
+    await relay.set_on(2, False)
+    assert await relay.get_on(2) is False
+    beat.cancel()
+    assert fake_pins.writes == [(23, 1.0), (23, 0.0)]
+    relay.close()
+
+
+@pytest.mark.asyncio
+async def test_close_drops_queued_writes_and_switches_off_in_order(fake_pins, monkeypatch):
+    monkeypatch.setenv("VA_ENABLE_REAL", "1")
+    monkeypatch.setenv("VA_GPIOZERO_MODULE", FAKE_GPIOZERO_MODULE)
+    enc = EnclosureConfig(
+        id="pi",
+        name="Pi",
+        timezone="America/New_York",
+        runtime={"mode": "real"},
+        devices=[
+            DeviceConfig(
+                id="light", name="light", kind="light", driver="gpio", params={"channel": 0, "gpio_pin": 18}
+            ),
+            DeviceConfig(
+                id="mister", name="mister", kind="mist", driver="gpio", params={"channel": 2, "gpio_pin": 23}
+            ),
+        ],
+    )
+    bundle = build_drivers(enc)
+    assert isinstance(bundle.pwm, RealPWMDriverGpioZero)
+    assert isinstance(bundle.relay, RealRelayDriverGpioZero)
+    await bundle.pwm.set_level(0, 0.8)
+    await bundle.relay.set_on(2, True)
+
+    # one write hung on the pin, another queued behind it
+    fake_pins.responsive.clear()
+    running = asyncio.create_task(bundle.relay.set_on(2, False))
+    await until_idle(bundle.relay._worker)
+    queued = asyncio.create_task(bundle.relay.set_on(2, True))
+    closing = asyncio.create_task(bundle.close())
+    await asyncio.sleep(0.01)
+    fake_pins.responsive.set()
+    await closing
+
+    await running
+    with pytest.raises(RuntimeError):
+        await queued
+    # the queued write never ran; relays were switched off before lights
+    assert fake_pins.writes[2:] == [(23, 0.0), (23, 0.0), (18, 0.0)]
+
+
+@pytest.mark.asyncio
+async def test_hung_relay_does_not_end_the_agent_loop(fake_pins, caplog):
+    clock = SimClock(datetime(2026, 1, 15, 12, tzinfo=ZoneInfo("America/New_York")))
+    agent = SimAgent("enclosure_1", "crested_gecko", clock=clock)
+    relay = RealRelayDriverGpioZero({1: 22, 2: 23, 3: 24}, gpio=fake_pins, write_timeout=0.05)
+    agent.relay = relay
+    fake_pins.responsive.clear()
+
+    task = asyncio.create_task(agent.run(interval_seconds=5))
+    for _ in range(500):
+        if "driver_write_failed" in [r.message for r in caplog.records]:
+            break
+        await asyncio.sleep(0.001)
+    assert not task.done()
+    assert agent.applied[1] == {}  # not recorded, so a later tick retries
+
+    fake_pins.responsive.set()
+    for _ in range(500):
+        if agent.applied[1]:
+            break
+        await asyncio.sleep(0.001)
+    assert sorted(agent.applied[1]) == [1, 2, 3]
+    assert not task.done()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    relay.close()
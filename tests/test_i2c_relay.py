@@ -0,0 +1,109 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from vivariumassistant.apps.agent.sim_agent import SimAgent
+from vivariumassistant.packages.core.clock import SimClock
+from vivariumassistant.packages.core.config_loader import load_enclosure, load_profile
+from vivariumassistant.packages.core.config_schema import RuntimeConfig
+from vivariumassistant.packages.drivers.factory import FAKE_SMBUS_MODULE
+from vivariumassistant.packages.drivers.i2c_relay import IODIRA, OLATA, I2CRelayDriver
+from vivariumassistant.packages.drivers.pca9685 import PCA9685PWMDriver
+from vivariumassistant.packages.simulator import fake_smbus
+
+ADDR = 0x20
+
+
+class GlitchyBus(fake_smbus.SMBus):
+    """Acknowledges the next `drop` port writes without applying them."""
+
+    drop = 0
+
+    def write_byte(self, i2c_addr: int, value: int) -> None:
+        if self.drop:
+            self.drop -= 1
+            return
+        super().write_byte(i2c_addr, value)
+
+
+@pytest.mark.asyncio
+async def test_all_changes_go_out_in_one_port_write(bus):
+    relay = I2CRelayDriver(bus, {1: 1, 2: 2, 3: 3}, active_low=True)
+    assert fake_smbus.transactions == [(1, ADDR, None, bytes([0xFF]))]  # all off
+
+    await relay.apply({1: True, 2: True, 3: True})
+    assert bus.read_byte(ADDR) == 0xFF ^ 0b1110
+    assert relay.transactions == 2
+
+    # the shadow register skips batches that change nothing
+    await relay.apply({1: True, 3: True})
+    await relay.set_on(2, True)
+    assert relay.transactions == 2
+
+    await relay.apply({2: False, 3: False})
+    assert bus.read_byte(ADDR) == 0xFF ^ 0b0010
+    assert [await relay.get_on(ch) for ch in (1, 2, 3)] == [True, False, False]
+
+    relay.close()
+    assert bus.read_byte(ADDR) == 0xFF
+
+
+@pytest.mark.asyncio
+async def test_mcp23017_writes_the_port_word(bus):
+    relay = I2CRelayDriver(bus, {0: 0, 9: 12}, chip="mcp23017", address=ADDR)
+    # latch off before the pins become outputs
+    assert [reg for _, _, reg, _ in fake_smbus.transactions] == [OLATA, IODIRA]
+
+    await relay.apply({0: True, 9: True})
+    assert fake_smbus.transactions[-1] == (1, ADDR, OLATA, bytes([0x01, 0x10]))
+    assert relay.transactions == 2
+
+    with pytest.raises(ValueError):
+        I2CRelayDriver(bus, {0: 16}, chip="mcp23017")
+    relay.close()
+
+
+@pytest.mark.asyncio
+async def test_readback_catches_a_lost_write():
+    fake_smbus.reset()
+    bus = GlitchyBus(1)
+    relay = I2CRelayDriver(bus, {2: 2}, verify=True)
+
+    bus.drop = 1
+    with pytest.raises(RuntimeError, match="read back"):
+        await relay.set_on(2, True)
+    assert await relay.get_on(2) is False
+
+    # the shadow was forgotten, so the retry writes the port again
+    await relay.set_on(2, True)
+    assert bus.read_byte(ADDR) == 0b100
+    relay.close()
+    fake_smbus.reset()
+
+
+@pytest.mark.asyncio
+async def test_agent_switches_every_relay_in_one_write(bus, monkeypatch):
+    monkeypatch.setenv("VA_ENABLE_REAL", "1")
+    monkeypatch.setenv("VA_SMBUS_MODULE", FAKE_SMBUS_MODULE)
+    enc = load_enclosure("enclosure_1").model_copy(update={"runtime": RuntimeConfig(mode="real")})
+    clock = SimClock(datetime(2026, 1, 15, 12, tzinfo=ZoneInfo(enc.timezone)))
+    agent = SimAgent.from_config(enc, load_profile("crested_gecko"), clock=clock)
+    relay = agent.relay
+    assert isinstance(relay, I2CRelayDriver)
+
+    port_writes = relay.transactions
+    await agent.tick()
+    # the first tick sends uvb, mister and pump; one port write
+    assert relay.transactions == port_writes + 1
+    states = [await relay.get_on(ch) for ch in (1, 2, 3)]
+    assert states == [True, False, False]  # UVB on at noon
+    assert bus.read_byte(ADDR) == 0b0010
+
+    # each I2C driver has its own handle, released on close
+    pwm = agent.drivers.pwm
+    assert isinstance(pwm, PCA9685PWMDriver)
+    assert pwm.bus is not relay.bus
+    await agent.drivers.close()
+    assert bus.read_byte(ADDR) == 0
+    assert pwm.bus.closed and relay.bus.closed
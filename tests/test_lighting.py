@@ -14,4 +14,18 @@ def test_daylight_level_bounds():
     )
     now = datetime(2026, 1, 15, 12, 0, tzinfo=ZoneInfo("America/New_York"))
     lvl = compute_daylight_level(now, "America/New_York", prof).level
-    assert 0.0 <= lvl <= 0.8
\ No newline at end of file
+    assert 0.0 <= lvl <= 0.8
+
+def test_overnight_window_ends_next_morning():
+    prof = LightingProfile(
+        day_start="21:00",
+        day_end="06:00",
+        sunrise_minutes=0,
+        sunset_minutes=0,
+        max_brightness=1.0,
+    )
+    tz = "America/New_York"
+    zone = ZoneInfo(tz)
+    assert compute_daylight_level(datetime(2026, 1, 15, 2, 0, tzinfo=zone), tz, prof).level == 1.0
+    assert compute_daylight_level(datetime(2026, 1, 15, 12, 0, tzinfo=zone), tz, prof).level == 0.0
+    assert compute_daylight_level(datetime(2026, 1, 15, 22, 0, tzinfo=zone), tz, prof).level == 1.0
@@ -0,0 +1,58 @@
+import json
+import logging
+import queue
+
+from vivariumassistant.packages.core.logging import DroppingQueueHandler, JsonFormatter
+
+
+def record(msg: str, **extra) -> logging.LogRecord:
+    rec = logging.makeLogRecord({"name": "test", "levelno": 20, "levelname": "INFO", "msg": msg})
+    rec.__dict__.update(extra)
+    return rec
+
+
+def test_json_formatter_includes_extra_fields_and_event_time():
+    rec = record("control_tick", event="control_tick", enclosure_id="enc_1")
+    rec.created = 0.0
+    payload = json.loads(JsonFormatter().format(rec))
+    assert payload["ts"] == "1970-01-01T00:00:00+00:00"
+    assert payload["msg"] == "control_tick"
+    assert payload["enclosure_id"] == "enc_1"
+    assert "lineno" not in payload
+
+
+def test_queue_handler_drops_newest_and_reports_when_room_returns():
+    q: queue.Queue = queue.Queue(maxsize=2)
+    handler = DroppingQueueHandler(q)
+    for i in range(4):
+        handler.handle(record(f"m{i}"))
+
+    assert handler.dropped == 2
+    assert [q.get_nowait().msg for _ in range(2)] == ["m0", "m1"]
+
+    handler.handle(record("m4"))
+    report = q.get_nowait()
+    assert report.msg == "log_dropped"
+    assert report.dropped == 2
+    assert q.get_nowait().msg == "m4"
+
+
+def test_queue_handler_drop_oldest_keeps_latest():
+    q: queue.Queue = queue.Queue(maxsize=2)
+    handler = DroppingQueueHandler(q, drop="oldest")
+    for i in range(4):
+        handler.handle(record(f"m{i}"))
+
+    assert handler.dropped == 2
+    assert [q.get_nowait().msg for _ in range(2)] == ["m2", "m3"]
+
+
+def test_queue_handler_resolves_args_on_the_caller():
+    q: queue.Queue = queue.Queue()
+    handler = DroppingQueueHandler(q)
+    items = [1]
+    rec = record("items=%s")
+    rec.args = (items,)
+    handler.handle(rec)
+    items.append(2)
+    assert q.get_nowait().getMessage() == "items=[1]"
@@ -0,0 +1,95 @@
+import asyncio
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from vivariumassistant.apps.agent.sim_agent import SimAgent
+from vivariumassistant.apps.api.app import create_api
+from vivariumassistant.packages.core.clock import SimClock
+from vivariumassistant.packages.core.metrics import Histogram, TickMetrics, render_prometheus
+
+
+def test_histogram_buckets_and_quantiles():
+    h = Histogram((0.001, 0.01, 0.1))
+    for v in [0.0005] * 98 + [0.05, 0.2]:
+        h.observe(v)
+
+    assert h.counts == [98, 0, 1, 1]
+    assert h.count == 100 and h.max == 0.2
+    assert h.quantile(0.5) <= 0.001
+    assert 0.01 < h.quantile(0.99) <= 0.1
+    assert h.quantile(1.0) == 0.2
+
+
+def test_prometheus_text_has_cumulative_buckets():
+    m = TickMetrics(bounds=(0.001, 0.01))
+    m.stages["total"].observe(0.0005)
+    m.stages["total"].observe(0.005)
+    m.overruns = 2
+    text = render_prometheus({"enc_1": m})
+
+    assert "# TYPE vivarium_tick_stage_seconds histogram" in text
+    assert 'vivarium_tick_stage_seconds_bucket{enclosure="enc_1",stage="total",le="0.001"} 1' in text
+    assert 'vivarium_tick_stage_seconds_bucket{enclosure="enc_1",stage="total",le="+Inf"} 2' in text
+    assert 'vivarium_tick_overruns_total{enclosure="enc_1"} 2' in text
+
+
+def test_prometheus_label_values_are_escaped():
+    text = render_prometheus({'enc "a"\\b\nc': TickMetrics()})
+    assert 'vivarium_tick_overruns_total{enclosure="enc \\"a\\"\\\\b\\nc"} 0' in text
+
+
+class LateClock(SimClock):
+    """Oversleeps every sleep by 12 s, like a loop starved of CPU."""
+
+    async def sleep(self, seconds: float) -> None:
+        await super().sleep(seconds + 12)
+
+
+@pytest.mark.asyncio
+async def test_standalone_loop_counts_late_wakeups_as_overruns():
+    clock = LateClock(datetime(2026, 1, 15, 12, tzinfo=ZoneInfo("America/New_York")))
+    agent = SimAgent("enclosure_1", "crested_gecko", clock=clock)
+    task = asyncio.create_task(agent.run(interval_seconds=5))
+    while agent.metrics.ticks < 3:
+        await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    # each wakeup is at least 12 s (two 5 s slots) late
+    assert agent.metrics.overruns >= 4
+
+
+@pytest.mark.asyncio
+async def test_tick_records_stages_and_driver_writes():
+    agent = SimAgent("enclosure_1", "crested_gecko")
+    await agent.tick()
+    await agent.tick()
+
+    m = agent.metrics
+    assert m.ticks == 2
+    assert all(m.stages[s].count == 2 for s in ("engine", "overrides", "drivers", "total"))
+    # first tick writes every channel, the second (same state) nothing
+    assert m.driver_writes == {"pwm": 1, "relay": 3}
+    assert m.driver_batches == {"pwm": 1, "relay": 1}
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_serves_prometheus_text():
+    agent = SimAgent("enclosure_1", "crested_gecko")
+    await agent.tick()
+    api = create_api(lambda: {agent.enc.id: agent.metrics}, port=0)
+    await api.start()
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", api.port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: test\r\n\r\n")
+        raw = await reader.read()
+        writer.close()
+    finally:
+        await api.close()
+
+    head, _, body = raw.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 200 OK")
+    assert b"text/plain; version=0.0.4" in head
+    assert b'stage="drivers"' in body
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+
+from vivariumassistant.packages.core.device_state import DeviceState, StateRecord
+from vivariumassistant.packages.core.manual_override import GroupOverride, ManualOverride
+from vivariumassistant.packages.engine.override_store import OverrideStore
+
+NOW = datetime(2026, 1, 15, 12, tzinfo=timezone.utc)
+KINDS = {"light_day": "light", "uvb": "uvb", "mister": "mist"}
+
+
+def desired() -> dict[str, StateRecord]:
+    return {
+        "light_day": StateRecord("light_day", on=True, level=0.85),
+        "uvb": StateRecord("uvb", on=True),
+        "mister": StateRecord("mister", on=False),
+    }
+
+
+def device(device_id: str, on: bool, minutes: int, level: float | None = None) -> ManualOverride:
+    return ManualOverride(
+        device_id=device_id,
+        state=DeviceState(device_id=device_id, on=on, level=level),
+        expires_at=NOW + timedelta(minutes=minutes),
+    )
+
+
+def group(on: bool, minutes: int, **scope) -> GroupOverride:
+    return GroupOverride(
+        state=DeviceState(device_id="*", on=on),
+        expires_at=NOW + timedelta(minutes=minutes),
+        **scope,
+    )
+
+
+def test_untouched_enclosure_is_left_alone():
+    store = OverrideStore()
+    store.set(device("uvb", False, 10), enclosure_id="enc_1")
+
+    states = desired()
+    store.resolve(NOW, "enc_2", KINDS, states)
+    assert states == desired()
+    assert not store.affects("enc_2")
+
+
+def test_precedence_device_then_kind_then_all():
+    store = OverrideStore()
+    store.set_group(group(False, 30))  # everything, everywhere
+    store.set_group(group(True, 30, kind="uvb", enclosure_id="enc_1"))
+    store.set(device("light_day", True, 30, level=0.2), enclosure_id="enc_1")
+
+    states = desired()
+    store.resolve(NOW, "enc_1", KINDS, states)
+    assert states["light_day"].level == 0.2
+    assert states["uvb"].on is True
+    assert states["mister"] == StateRecord("mister", on=False)
+
+    other = desired()
+    store.resolve(NOW, "enc_2", KINDS, other)
+    assert [s.on for s in other.values()] == [False, False, False]
+
+
+def test_expiry_heap_evicts_lazily_and_reports_soonest():
+    store = OverrideStore()
+    store.set(device("uvb", False, 10), enclosure_id="enc_1")
+    store.set_group(group(False, 5, kind="mist"))
+    assert store.next_expiry() == NOW + timedelta(minutes=5)
+
+    # expired but not yet evicted: ignored by lookups
+    later = NOW + timedelta(minutes=6)
+    assert store.lookup(later, "enc_1", "mister", "mist") is None
+
+    assert store.evict(later) == 1
+    assert len(store) == 1
+    assert store.next_expiry() == NOW + timedelta(minutes=10)
+
+    assert store.evict(NOW + timedelta(minutes=10)) == 1
+    assert len(store) == 0 and store.next_expiry() is None
+    assert not store.affects("enc_1")
+
+
+def test_replacing_an_override_resets_its_timeout():
+    store = OverrideStore()
+    store.set(device("uvb", False, 5), enclosure_id="enc_1")
+    store.set(device("uvb", True, 20), enclosure_id="enc_1")
+
+    assert len(store) == 1
+    assert store.next_expiry() == NOW + timedelta(minutes=20)
+    assert store.lookup(NOW, "enc_1", "uvb", "uvb").on is True
+    assert store.clear("enc_1", ("device", "uvb"))
+    assert store.next_expiry() is None
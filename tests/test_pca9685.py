@@ -0,0 +1,100 @@
+import pytest
+
+from vivariumassistant.packages.core.config_loader import load_enclosure
+from vivariumassistant.packages.core.config_schema import RuntimeConfig
+from vivariumassistant.packages.drivers.factory import FAKE_SMBUS_MODULE, build_drivers
+from vivariumassistant.packages.drivers.pca9685 import (
+    ALL_LED_ON_L,
+    FULL,
+    LED0_ON_L,
+    MODE1,
+    PRESCALE,
+    SLEEP,
+    PCA9685PWMDriver,
+)
+from vivariumassistant.packages.simulator import fake_smbus
+
+ADDR = 0x40
+
+
+def led(bus: fake_smbus.SMBus, ch: int) -> list[int]:
+    return bus.read_i2c_block_data(ADDR, LED0_ON_L + 4 * ch, 4)
+
+
+def led_writes() -> list[tuple[int, int]]:
+    # (first channel, channels written) per LED register transaction
+    return [
+        ((reg - LED0_ON_L) // 4, len(data) // 4)
+        for _, _, reg, data in fake_smbus.transactions
+        if reg is not None and LED0_ON_L <= reg < LED0_ON_L + 64
+    ]
+
+
+@pytest.mark.asyncio
+async def test_changed_channels_go_out_in_one_block_write(bus):
+    pwm = PCA9685PWMDriver(bus, freq_hz=1000)
+    regs = bus.registers(ADDR)
+    assert regs[PRESCALE] == 5  # 25 MHz / (4096 * 1000 Hz) - 1
+    assert regs[MODE1] & 0x20  # auto-increment
+
+    # channel 0 is already off since init, so the block starts at 1
+    await pwm.apply({0: 0.0, 1: 0.25, 2: 0.5, 3: 1.0})
+    assert led_writes() == [(1, 3)]
+    assert led(bus, 1) == [0, 0, 1024 & 0xFF, 1024 >> 8]
+    assert led(bus, 3) == [0, FULL, 0, 0]
+    assert await pwm.get_level(2) == 0.5
+
+    # the register cache skips a batch that changes nothing on the chip
+    await pwm.apply({1: 0.25, 2: 0.5})
+    assert pwm.transactions == 1
+    await pwm.apply({0: 0.01, 2: 0.0})
+    assert led_writes()[-1] == (0, 3)
+    assert led(bus, 2) == [0, 0, 0, FULL]
+    pwm.close()
+
+
+@pytest.mark.asyncio
+async def test_writes_span_unchanged_channels_up_to_a_block(bus):
+    pwm = PCA9685PWMDriver(bus)
+    await pwm.apply({0: 0.1, 7: 0.1})  # 8 channels: 32 bytes, one block
+    await pwm.apply({0: 0.2, 8: 0.2})  # 9 channels: two blocks
+    await pwm.apply({2: 0.3, 4: 0.3, 15: 0.3})
+    assert led_writes() == [(0, 8), (0, 1), (8, 1), (2, 3), (15, 1)]
+    pwm.close()
+
+
+@pytest.mark.asyncio
+async def test_resolution_bits_quantize_levels(bus):
+    fine = PCA9685PWMDriver(bus, address=ADDR, channels={0})
+    coarse = PCA9685PWMDriver(bus, address=0x41, channels={0}, resolution_bits=8)
+    assert fine.resolution == 4096 and coarse.resolution == 256
+    assert fine.code_for(0.3) == 1228
+    assert coarse.code_for(0.3) == 76 << 4
+
+    await coarse.set_level(0, 0.3)
+    await coarse.set_level(0, 0.299)  # same 8-bit step: nothing to write
+    assert coarse.transactions == 1
+    with pytest.raises(KeyError):
+        await fine.set_level(5, 0.5)
+    with pytest.raises(ValueError):
+        PCA9685PWMDriver(bus, resolution_bits=13)
+    fine.close()
+    coarse.close()
+
+
+@pytest.mark.asyncio
+async def test_factory_builds_pca9685_for_configured_lights(bus, monkeypatch):
+    monkeypatch.setenv("VA_ENABLE_REAL", "1")
+    monkeypatch.setenv("VA_SMBUS_MODULE", FAKE_SMBUS_MODULE)
+    enc = load_enclosure("enclosure_1").model_copy(update={"runtime": RuntimeConfig(mode="real")})
+
+    bundle = build_drivers(enc)
+    assert isinstance(bundle.pwm, PCA9685PWMDriver)
+    await bundle.pwm.set_level(0, 1.0)
+    assert led(bus, 0) == [0, FULL, 0, 0]
+
+    # safe-off: every channel fully off, oscillator asleep
+    await bundle.close()
+    regs = bus.registers(ADDR)
+    assert regs[ALL_LED_ON_L : ALL_LED_ON_L + 4] == bytes([0, 0, 0, FULL])
+    assert regs[MODE1] & SLEEP
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from vivariumassistant.apps.agent.climate import AgentClimate  # noqa: E402
+from vivariumassistant.apps.agent.fast_forward import FastForwardRunner  # noqa: E402
+from vivariumassistant.apps.agent.sim_agent import SimAgent  # noqa: E402
+from vivariumassistant.packages.core.clock import SimClock  # noqa: E402
+from vivariumassistant.packages.core.config_loader import load_profile  # noqa: E402
+from vivariumassistant.packages.core.config_schema import (  # noqa: E402
+    DeviceConfig,
+    EnclosureConfig,
+)
+from vivariumassistant.packages.simulator.physics import (  # noqa: E402
+    ClimateBatch,
+    ClimateParams,
+    simulate_profiles,
+)
+
+TZ = "America/New_York"
+
+
+def test_large_steps_stay_accurate():
+    coarse = ClimateBatch(1)
+    fine = ClimateBatch(1)
+    coarse.step(600, light=1.0, fan=0.5)
+    for _ in range(600):
+        fine.step(1, light=1.0, fan=0.5)
+
+    # temperature relaxation is integrated exactly; humidity follows the
+    # temperature it ends the step at, so it is only close
+    np.testing.assert_allclose(coarse.temperature_c, fine.temperature_c)
+    np.testing.assert_allclose(coarse.humidity_pct, fine.humidity_pct, rtol=0.05)
+
+
+def test_outputs_move_the_climate_the_right_way():
+    params = ClimateParams(ambient_temp_c=np.array([20.0, 20.0, 20.0, 20.0]))
+    batch = ClimateBatch(4, params)
+    batch.step(
+        600,
+        light=np.array([0.0, 1.0, 0.0, 0.0]),
+        heat=np.array([0.0, 0.0, 1.0, 0.0]),
+        mist_seconds=np.array([0.0, 0.0, 0.0, 20.0]),
+    )
+    idle, lit, heated, misted = zip(batch.temperature_c, batch.humidity_pct)
+
+    assert idle[0] == pytest.approx(20.0)
+    assert heated[0] > lit[0] > idle[0]
+    assert misted[1] > idle[1] > lit[1]
+    assert (batch.humidity_pct <= 100.0).all()
+
+
+def test_simulate_profiles_shows_the_morning_mist():
+    prof = load_profile("crested_gecko")
+    start = datetime(2026, 1, 15, tzinfo=ZoneInfo(TZ))
+    run = simulate_profiles([prof, prof], TZ, start, start + timedelta(days=1), timedelta(minutes=1))
+
+    assert run.temperature_c.shape == (1440, 2)
+    before, after = 7 * 60 + 29, 7 * 60 + 30  # burst at 07:30
+    assert run.humidity_pct[after, 0] > run.humidity_pct[before, 0] + 10
+    np.testing.assert_array_equal(run.humidity_pct[:, 0], run.humidity_pct[:, 1])
+
+
+@pytest.mark.asyncio
+async def test_fast_forward_feeds_simulated_sensors():
+    clock = SimClock(datetime(2026, 1, 15, 7, 0, tzinfo=ZoneInfo(TZ)))
+    agent = SimAgent("enclosure_1", "crested_gecko", clock=clock)
+    runner = FastForwardRunner(agent, clock, climate=AgentClimate([agent]))
+
+    await runner.run_for(timedelta(minutes=29, seconds=55))
+    dry = agent.observations["climate_1"].reading.humidity_pct
+    await runner.run_for(timedelta(minutes=2))
+    wet = agent.observations["climate_1"].reading.humidity_pct
+
+    assert wet > dry + 10
+
+
+def test_climate_reads_the_channels_the_agent_drives():
+    # no channel params: the agent's per-kind defaults apply (mist on relay 2)
+    enc = EnclosureConfig(
+        id="bare",
+        name="Bare",
+        timezone=TZ,
+        devices=[
+            DeviceConfig(id=kind, name=kind, kind=kind, driver="sim")
+            for kind in ("light", "uvb", "mist")
+        ],
+    )
+    clock = SimClock(datetime(2026, 1, 15, 7, 0, tzinfo=ZoneInfo(TZ)))
+    agent = SimAgent.from_config(enc, load_profile("crested_gecko"), clock=clock)
+    climate = AgentClimate([agent])
+    assert climate._outputs == [[("light", 0), ("mist", 2)]]
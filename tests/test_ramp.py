@@ -0,0 +1,106 @@
+import asyncio
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from vivariumassistant.apps.agent.sim_agent import SimAgent
+from vivariumassistant.packages.core.clock import SimClock
+from vivariumassistant.packages.core.device_state import DeviceState
+from vivariumassistant.packages.core.manual_override import ManualOverride
+
+ZONE = ZoneInfo("America/New_York")
+DAY = timedelta(days=1)
+
+
+def at(hh: int, mm: int = 0, ss: int = 0) -> datetime:
+    return datetime(2026, 1, 15, hh, mm, ss, tzinfo=ZONE)
+
+
+def ramping_agent(start: datetime) -> tuple[SimAgent, SimClock]:
+    clock = SimClock(start)
+    agent = SimAgent("enclosure_1", "crested_gecko", clock=clock)
+    agent.enable_ramps(rate_hz=50)
+    return agent, clock
+
+
+@pytest.mark.asyncio
+async def test_executor_follows_the_sunrise_between_ticks():
+    agent, clock = ramping_agent(at(8, 10))
+    await agent.tick()
+    assert agent.ramps is not None and agent.ramps.following(0)
+
+    step = 1 / agent.pwm_resolution
+    writes = agent.ramps.writes
+    for _ in range(60 * 50):  # one minute at 50 Hz, no ticks
+        clock.advance(0.02)
+        await agent.ramps.step()
+        level = await agent.pwm.get_level(0)
+        assert abs(level - agent.schedule.light_level(clock.now())) < step
+
+    # written once per PWM step crossed, not 50 times a second
+    crossed = int(agent.schedule.light_level(clock.now()) / step) - int(
+        agent.schedule.light_level(at(8, 10)) / step
+    )
+    assert agent.ramps.writes - writes == pytest.approx(crossed, abs=1)
+    assert agent.applied[0][0] == await agent.pwm.get_level(0)
+
+
+@pytest.mark.asyncio
+async def test_ramp_end_is_written_and_released():
+    agent, clock = ramping_agent(at(8, 44, 58))
+    await agent.tick()
+    clock.advance(5)
+    assert agent.ramps is not None
+    assert await agent.ramps.step() == 1
+    assert await agent.pwm.get_level(0) == pytest.approx(0.85)
+    assert not agent.ramps.following(0)
+
+    # back on a flat stretch: the tick owns the channel and has nothing to write
+    batches = agent.metrics.driver_batches["pwm"]
+    await agent.tick()
+    assert agent.metrics.driver_batches["pwm"] == batches
+
+
+@pytest.mark.asyncio
+async def test_overridden_light_is_not_ramped():
+    agent, _ = ramping_agent(at(8, 10))
+    agent.set_override(
+        ManualOverride(
+            device_id="light_day",
+            state=DeviceState(device_id="light_day", on=True, level=0.3),
+            expires_at=at(9),
+        )
+    )
+    await agent.tick()
+    assert agent.ramps is not None and not agent.ramps.following(0)
+    assert await agent.pwm.get_level(0) == 0.3
+
+
+@pytest.mark.asyncio
+async def test_event_driven_wakes_at_the_end_of_a_ramp():
+    agent, _ = ramping_agent(at(8, 10))
+    assert agent.ramps is not None
+    # until its task runs, the executor only moves when a tick steps it
+    assert agent.next_wakeup(at(8, 10), max_sleep=DAY) < at(8, 10, 30)
+    agent.ramps.start()
+    try:
+        assert agent.next_wakeup(at(8, 10), max_sleep=DAY) == at(8, 45)
+    finally:
+        await agent.ramps.close()
+
+
+@pytest.mark.asyncio
+async def test_task_interpolates_until_closed():
+    agent, clock = ramping_agent(at(8, 10))
+    await agent.tick()
+    assert agent.ramps is not None
+    agent.ramps.start()
+    try:
+        clock.advance(30)
+        await asyncio.sleep(0.1)
+        expected = agent.schedule.light_level(clock.now())
+        assert await agent.pwm.get_level(0) == pytest.approx(expected)
+    finally:
+        await agent.ramps.close()
+    assert len(agent.ramps) == 0
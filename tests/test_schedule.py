@@ -0,0 +1,240 @@
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from vivariumassistant.packages.core.config_schema import (
+    LightingProfile,
+    MistBurst,
+    MistCatchUp,
+    MistProfile,
+    MistSafety,
+    MistWindow,
+    ProfileConfig,
+    UVBProfile,
+)
+from vivariumassistant.packages.engine.lighting import compute_daylight_level
+from vivariumassistant.packages.engine.mist import MistRuntime, mist_burst_due
+from vivariumassistant.packages.engine.schedule import CompiledSchedule, to_epoch_us
+from vivariumassistant.packages.engine.uvb import uvb_should_be_on
+
+TZ = "America/New_York"
+ZONE = ZoneInfo(TZ)
+
+
+def _profile(**lighting) -> ProfileConfig:
+    return ProfileConfig(
+        id="test",
+        lighting=LightingProfile(
+            **{"day_start": "08:00", "day_end": "20:00", "max_brightness": 0.85, **lighting}
+        ),
+        uvb=UVBProfile(start="10:00", end="18:00"),
+        mist=MistProfile(
+            bursts=[MistBurst(at="07:30", seconds=20)],
+            windows=[MistWindow(start="22:00", end="02:00", every_minutes=60, seconds=10)],
+            safety=MistSafety(min_minutes_between=0, max_seconds_per_day=240),
+        ),
+    )
+
+
+def _minutes(day: date):
+    start = datetime.combine(day, datetime.min.time(), tzinfo=ZONE)
+    for m in range(0, 26 * 60, 7):
+        yield start + timedelta(minutes=m, seconds=m % 60)
+
+
+@pytest.mark.parametrize("day", [date(2026, 1, 15), date(2026, 3, 8), date(2026, 11, 1)])
+@pytest.mark.parametrize("lighting", [{}, {"day_start": "21:00", "day_end": "06:00"}])
+def test_matches_scalar_rules(day, lighting):
+    prof = _profile(**lighting)
+    sched = CompiledSchedule(prof, TZ)
+
+    assert prof.mist is not None and prof.uvb is not None
+    for now in _minutes(day):
+        assert sched.light_level(now) == compute_daylight_level(now, TZ, prof.lighting).level
+        assert sched.uvb_on(now) == uvb_should_be_on(now, TZ, prof.uvb)
+        assert sched.mist_burst_due(now, MistRuntime()) == mist_burst_due(
+            now, TZ, prof.mist, MistRuntime()
+        )
+
+
+@pytest.mark.parametrize("day", [date(2026, 3, 8), date(2026, 11, 1)])
+def test_tick_context_matches_plain_datetimes(day):
+    prof = _profile()
+    sched = CompiledSchedule(prof, TZ)
+
+    assert prof.mist is not None and prof.uvb is not None
+    for now in _minutes(day):
+        utc = now.astimezone(ZoneInfo("UTC"))
+        ctx = sched.context(utc)
+        assert ctx.t_us == to_epoch_us(now)
+        assert sched.light_level(ctx) == sched.light_level(now)
+        assert sched.uvb_on(ctx) == sched.uvb_on(now)
+        assert sched.mist_decision(ctx, MistRuntime()) == sched.mist_decision(now, MistRuntime())
+        assert compute_daylight_level(ctx, TZ, prof.lighting) == compute_daylight_level(
+            now, TZ, prof.lighting
+        )
+        assert uvb_should_be_on(ctx, TZ, prof.uvb) == uvb_should_be_on(now, TZ, prof.uvb)
+        assert mist_burst_due(ctx, TZ, prof.mist, MistRuntime()) == mist_burst_due(
+            now, TZ, prof.mist, MistRuntime()
+        )
+
+
+def test_tick_context_in_another_zone():
+    prof = _profile()
+    ctx = CompiledSchedule(prof, "Europe/Berlin").context(datetime(2026, 1, 15, 12, tzinfo=ZONE))
+
+    # compiled schedules re-localize; scalar rules refuse a context for the wrong zone
+    assert CompiledSchedule(prof, TZ).light_level(ctx) == 0.85
+    with pytest.raises(ValueError):
+        compute_daylight_level(ctx, TZ, prof.lighting)
+
+
+def test_fall_back_repeats_fixed_burst_minute():
+    prof = _profile()
+    prof.mist.bursts = [MistBurst(at="01:30", seconds=20)]  # type: ignore[union-attr]
+    sched = CompiledSchedule(prof, TZ)
+
+    slots = [s for s in sched.mist_slots(date(2026, 11, 1)) if s.seconds == 20]
+    assert len(slots) == 2
+    assert slots[1].start - slots[0].start == 3600 * 1_000_000
+
+
+def test_next_change_after():
+    sched = CompiledSchedule(_profile(), TZ)
+    night = datetime(2026, 1, 15, 3, 0, tzinfo=ZONE)
+
+    assert sched.next_change_after(night) == datetime(2026, 1, 15, 8, 0, tzinfo=ZONE)
+    assert sched.next_change_after(night, "uvb") == datetime(2026, 1, 15, 10, 0, tzinfo=ZONE)
+
+    # inside the sunrise ramp, the next boundary is the end of the ramp
+    ramp = datetime(2026, 1, 15, 8, 10, tzinfo=ZONE)
+    assert sched.next_change_after(ramp) == datetime(2026, 1, 15, 8, 45, tzinfo=ZONE)
+
+    evening = datetime(2026, 1, 15, 21, 0, tzinfo=ZONE)
+    assert sched.next_change_after(evening) == datetime(2026, 1, 16, 8, 0, tzinfo=ZONE)
+
+
+def test_integral():
+    sched = CompiledSchedule(_profile(), TZ)
+    start = datetime(2026, 1, 15, tzinfo=ZONE)
+
+    # 10.5h at full brightness plus two 45-minute linear ramps
+    one_day = sched.integral(start, start + timedelta(days=1))
+    assert one_day == pytest.approx(0.85 * (10.5 + 0.75) * 3600)
+
+    three_days = sched.integral(start, start + timedelta(days=3), "uvb")
+    assert three_days == pytest.approx(3 * 8 * 3600)
+
+    # the spring-forward day is 23h long, but UVB runs on wall-clock time
+    dst = datetime(2026, 3, 8, tzinfo=ZONE)
+    assert sched.integral(dst, dst + timedelta(hours=23), "uvb") == pytest.approx(8 * 3600)
+
+
+def test_day_cache_is_bounded():
+    sched = CompiledSchedule(_profile(), TZ, max_cached_days=2)
+    start = datetime(2026, 1, 1, 12, tzinfo=ZONE)
+    for d in range(5):
+        sched.light_level(start + timedelta(days=d))
+    assert len(sched._days) == 2
+
+
+def _mist_schedule(**mist) -> CompiledSchedule:
+    prof = _profile()
+    assert prof.mist is not None
+    return CompiledSchedule(prof.model_copy(update={"mist": prof.mist.model_copy(update=mist)}), TZ)
+
+
+def _at(hh: int, mm: int, ss: int = 0, day: int = 15) -> datetime:
+    return datetime(2026, 1, day, hh, mm, ss, tzinfo=ZONE)
+
+
+def _settle(sched: CompiledSchedule, now: datetime, rt: MistRuntime):
+    decision = sched.mist_decision(now, rt)
+    if decision.seconds:
+        rt.record_burst(now, decision.seconds)
+    rt.slots_done_through = datetime.fromtimestamp(decision.done_through / 1e6, ZONE)
+    return decision
+
+
+def test_mist_decision_fires_a_missed_minute_late_and_once():
+    sched = _mist_schedule()
+    rt = MistRuntime()
+    _settle(sched, _at(7, 29, 50), rt)
+
+    late = _settle(sched, _at(7, 33), rt)
+    assert late.seconds == 20
+    assert late.scheduled == to_epoch_us(_at(7, 30))
+    assert _settle(sched, _at(7, 34), rt).seconds is None
+    assert rt.daily_seconds_used == {"2026-01-15": 20}
+
+
+def test_mist_decision_skips_after_grace_or_under_skip_policy():
+    rt = MistRuntime()
+    sched = _mist_schedule()
+    _settle(sched, _at(7, 29), rt)
+    missed = _settle(sched, _at(7, 36), rt)
+    assert missed.seconds is None
+    assert missed.skipped == (to_epoch_us(_at(7, 30)),)
+    # reported once
+    assert _settle(sched, _at(7, 40), rt).skipped == ()
+
+    rt = MistRuntime()
+    strict = _mist_schedule(catch_up=MistCatchUp(policy="skip"))
+    _settle(strict, _at(7, 29), rt)
+    assert _settle(strict, _at(7, 30, 59), rt).seconds == 20
+
+    rt = MistRuntime()
+    _settle(strict, _at(7, 29), rt)
+    assert _settle(strict, _at(7, 31), rt).skipped == (to_epoch_us(_at(7, 30)),)
+
+
+def test_mist_decision_fires_only_the_latest_of_several_missed():
+    # overnight window 22:00-02:00 every 60 min, anchored at midnight
+    sched = _mist_schedule(catch_up=MistCatchUp(grace_seconds=3 * 3600))
+    rt = MistRuntime()
+    _settle(sched, _at(21, 30), rt)
+
+    decision = _settle(sched, _at(0, 20, day=16), rt)
+    assert decision.seconds == 10
+    assert decision.scheduled == to_epoch_us(_at(0, 0, day=16))
+    assert decision.skipped == (to_epoch_us(_at(22, 0)), to_epoch_us(_at(23, 0)))
+
+
+def test_mist_decision_overlapping_windows_count_a_minute_once():
+    sched = _mist_schedule(
+        bursts=[],
+        windows=[
+            MistWindow(start="06:00", end="12:00", every_minutes=60, seconds=15),
+            MistWindow(start="06:00", end="12:00", every_minutes=30, seconds=5),
+        ],
+    )
+    rt = MistRuntime()
+    _settle(sched, _at(6, 59), rt)
+    decision = _settle(sched, _at(7, 2), rt)
+    assert decision.seconds == 15
+    assert decision.skipped == ()
+
+
+def test_mist_decision_keeps_a_burst_held_back_by_spacing():
+    sched = _mist_schedule(safety=MistSafety(min_minutes_between=120, max_seconds_per_day=240))
+    rt = MistRuntime()
+    rt.record_burst(_at(5, 32), 10)
+    _settle(sched, _at(7, 29), rt)
+
+    assert _settle(sched, _at(7, 31), rt).seconds is None
+    assert _settle(sched, _at(7, 32), rt).seconds == 20
+
+
+
+def test_mist_decision_quiet_gap_does_not_hide_an_earlier_runtime():
+    # one schedule shared by two runtimes: the quiet gap cached for the first
+    # must not cover the second, which has not settled 07:30 yet
+    sched = _mist_schedule()
+    ahead = MistRuntime()
+    _settle(sched, _at(7, 31), ahead)
+    assert _settle(sched, _at(7, 40), ahead).seconds is None
+
+    behind = MistRuntime()
+    behind.slots_done_through = _at(7, 29)
+    assert _settle(sched, _at(7, 32), behind).seconds == 20
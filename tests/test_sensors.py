@@ -0,0 +1,100 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from vivariumassistant.apps.agent.sensors import SensorPoller
+from vivariumassistant.apps.agent.sim_agent import SimAgent
+from vivariumassistant.packages.core.clock import RealClock, SimClock
+from vivariumassistant.packages.core.config_loader import load_enclosure
+from vivariumassistant.packages.drivers.base import SensorReading
+from vivariumassistant.packages.drivers.factory import build_sensors
+from vivariumassistant.packages.simulator.sensor import SimSensorDriver
+
+START = datetime(2026, 1, 15, 12, tzinfo=ZoneInfo("America/New_York"))
+
+
+class HungSensor(SimSensorDriver):
+    async def read(self) -> SensorReading:
+        await asyncio.sleep(3600)
+        raise AssertionError("unreachable")
+
+
+def test_build_sensors_simulates_configured_sensors():
+    sensors = build_sensors(load_enclosure("enclosure_1"))
+    assert list(sensors) == ["climate_1"]
+
+
+@pytest.mark.asyncio
+async def test_poll_due_caches_readings_and_marks_them_stale():
+    clock = SimClock(START)
+    sensor = SimSensorDriver(temperature_c=25.5, humidity_pct=80.0)
+    poller = SensorPoller({"climate_1": sensor}, clock, interval_seconds=10)
+
+    assert poller.latest("climate_1") is None
+    assert await poller.poll_due() == 1
+    obs = poller.latest("climate_1")
+    assert obs.reading == SensorReading(25.5, 80.0) and not obs.stale
+
+    clock.advance(5)
+    assert await poller.poll_due() == 0
+    assert poller.next_due() == START + timedelta(seconds=10)
+
+    # nobody polls for a while: the cached value ages out
+    clock.advance(30)
+    assert poller.snapshot()["climate_1"].stale is True
+
+
+@pytest.mark.asyncio
+async def test_failing_callback_does_not_stop_polling(caplog):
+    clock = SimClock(START)
+    calls = []
+
+    def on_reading(sensor_id: str, at: datetime, reading: SensorReading) -> None:
+        calls.append(at)
+        raise ValueError("boom")
+
+    poller = SensorPoller(
+        {"climate_1": SimSensorDriver()}, clock, interval_seconds=10, on_reading=on_reading
+    )
+    assert await poller.poll_due() == 1
+    clock.advance(10)
+    assert await poller.poll_due() == 1
+
+    assert len(calls) == 2
+    assert poller.latest("climate_1") is not None
+    assert [r.event for r in caplog.records].count("sensor_callback_failed") == 2
+
+
+@pytest.mark.asyncio
+async def test_hung_sensor_times_out_without_holding_up_others():
+    clock = SimClock(START)
+    poller = SensorPoller(
+        {"bad": HungSensor(), "good": SimSensorDriver(kind="temp")},
+        clock,
+        timeout_seconds=0.05,
+    )
+    await poller.poll_due()
+
+    assert poller.latest("bad") is None
+    assert poller.latest("good").reading == SensorReading(temperature_c=24.0)
+
+
+@pytest.mark.asyncio
+async def test_tick_reads_the_cache_while_a_slow_read_is_in_flight():
+    agent = SimAgent("enclosure_1", "crested_gecko", clock=RealClock("America/New_York"))
+    agent.sensors["climate_1"].latency_s = 0.5
+    agent.poller.start()
+    try:
+        t0 = time.perf_counter()
+        await agent.tick()
+        assert time.perf_counter() - t0 < 0.1
+        assert agent.observations == {}
+
+        await asyncio.sleep(0.6)
+        await agent.tick()
+        assert agent.observations["climate_1"].reading.humidity_pct == 70.0
+    finally:
+        await agent.poller.close()
@@ -0,0 +1,184 @@
+import asyncio
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from vivariumassistant.apps.agent.sim_agent import SimAgent
+from vivariumassistant.packages.core.clock import SimClock
+from vivariumassistant.packages.core.device_state import DeviceState
+from vivariumassistant.packages.core.manual_override import ManualOverride
+from vivariumassistant.packages.simulator.pwm import SimPWMDriver
+from vivariumassistant.packages.simulator.relay import SimRelayDriver
+
+ZONE = ZoneInfo("America/New_York")
+DAY = timedelta(days=1)
+
+
+def at(hh: int, mm: int = 0, ss: int = 0) -> datetime:
+    return datetime(2026, 1, 15, hh, mm, ss, tzinfo=ZONE)
+
+
+@pytest.fixture
+def agent() -> SimAgent:
+    return SimAgent("enclosure_1", "crested_gecko")
+
+
+class WallClock(SimClock):
+    """Virtual time that stands still while sleeps take real time."""
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+
+async def _until(condition) -> None:
+    while not condition():
+        await asyncio.sleep(0.001)
+
+
+def test_next_wakeup_sleeps_through_the_night(agent):
+    # crested_gecko: mist burst at 07:30, lights from 08:00
+    assert agent.next_wakeup(at(1), max_sleep=DAY) == at(7, 30)
+
+
+def test_next_wakeup_follows_uvb_edges(agent):
+    assert agent.next_wakeup(at(12), max_sleep=DAY) == at(18)
+
+
+def test_next_wakeup_steps_through_ramp_at_pwm_resolution(agent):
+    wake = agent.next_wakeup(at(8, 10), max_sleep=DAY)
+    assert at(8, 10) < wake < at(8, 10, 30)
+
+    level = agent.schedule.light_level
+    step = 1 / agent.pwm_resolution
+    assert int(level(wake) / step) == int(level(at(8, 10)) / step) + 1
+
+
+def test_next_wakeup_honours_override_expiry_and_max_sleep(agent):
+    agent.set_override(
+        ManualOverride(
+            device_id="uvb",
+            state=DeviceState(device_id="uvb", on=True),
+            expires_at=at(2, 15),
+        )
+    )
+    assert agent.next_wakeup(at(1), max_sleep=DAY) == at(2, 15)
+    assert agent.next_wakeup(at(1), max_sleep=timedelta(minutes=5)) == at(1, 5)
+
+
+def test_evaluate_midday(agent):
+    desired = agent.evaluate(at(12))
+    assert desired["light_day"].level == pytest.approx(0.85)
+    assert desired["uvb"].on is True
+    assert desired["mister"].on is False
+
+
+@pytest.mark.asyncio
+async def test_tick_applies_active_override(agent):
+    agent.set_override(
+        ManualOverride(
+            device_id="light_day",
+            state=DeviceState(device_id="light_day", on=True, level=0.3),
+            expires_at=datetime.now(tz=ZONE) + timedelta(hours=1),
+        )
+    )
+    _, desired = await agent.tick()
+    assert desired["light_day"].level == 0.3
+    assert await agent.pwm.get_level(0) == 0.3
+
+
+class RecordingPWM(SimPWMDriver):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[dict[int, float]] = []
+
+    async def apply(self, levels):
+        self.batches.append(dict(levels))
+        await super().apply(levels)
+
+
+class RecordingRelay(SimRelayDriver):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[dict[int, bool]] = []
+
+    async def apply(self, states):
+        self.batches.append(dict(states))
+        await super().apply(states)
+
+
+def recording_agent(start: datetime) -> tuple[SimAgent, SimClock]:
+    clock = SimClock(start)
+    agent = SimAgent("enclosure_1", "crested_gecko", clock=clock)
+    agent.pwm = RecordingPWM()
+    agent.relay = RecordingRelay()
+    return agent, clock
+
+
+@pytest.mark.asyncio
+async def test_tick_writes_only_changed_channels():
+    agent, clock = recording_agent(at(12))
+
+    await agent.tick()
+    assert agent.pwm.batches == [{0: pytest.approx(0.85)}]
+    assert agent.relay.batches == [{1: True, 2: False, 3: False}]
+
+    # steady midday: nothing to write
+    clock.advance(5)
+    await agent.tick()
+    assert len(agent.pwm.batches) == 1
+    assert len(agent.relay.batches) == 1
+
+    agent.invalidate_applied()
+    await agent.tick()
+    assert len(agent.pwm.batches) == 2
+    assert agent.relay.batches[-1] == {1: True, 2: False, 3: False}
+
+
+@pytest.mark.asyncio
+async def test_mist_pulse_goes_through_batches():
+    agent, clock = recording_agent(at(7, 30))
+
+    await agent.tick()
+    assert agent.relay.batches[-1][2] is True
+
+    clock.advance(20)
+    await agent.actuator.fire_due()
+    assert agent.relay.batches[-1] == {2: False}
+    assert await agent.relay.get_on(2) is False
+
+    # the off-deadline updated the applied state, so the next tick is silent
+    writes = len(agent.relay.batches)
+    clock.advance(5)
+    await agent.tick()
+    assert len(agent.relay.batches) == writes
+
+
+@pytest.mark.asyncio
+async def test_default_batch_apply_sets_every_channel():
+    relay = SimRelayDriver()
+    await relay.apply({0: True, 1: False, 4: True})
+    assert [await relay.get_on(ch) for ch in (0, 1, 4)] == [True, False, True]
+
+
+@pytest.mark.asyncio
+async def test_new_override_wakes_the_event_driven_loop():
+    agent = SimAgent("enclosure_1", "crested_gecko", clock=WallClock(at(1)))
+    task = asyncio.create_task(agent.run(event_driven=True))
+    try:
+        while agent.metrics.ticks < 1:
+            await asyncio.sleep(0.001)
+        # next_wakeup is 07:30; the override must not wait for it
+        agent.set_override(
+            ManualOverride(
+                device_id="uvb",
+                state=DeviceState(device_id="uvb", on=True),
+                expires_at=at(3),
+            )
+        )
+        await asyncio.wait_for(_until(lambda: agent.metrics.ticks >= 2), timeout=1.0)
+        assert await agent.relay.get_on(1) is True
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
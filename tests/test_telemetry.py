@@ -0,0 +1,96 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from vivariumassistant.apps.agent.sim_agent import SimAgent
+from vivariumassistant.packages.core.clock import SimClock
+from vivariumassistant.packages.core.telemetry import Resolution, TelemetryBuffer
+from vivariumassistant.packages.engine.schedule import to_epoch_us
+
+S = 1_000_000  # us
+
+
+def small() -> TelemetryBuffer:
+    return TelemetryBuffer(
+        (Resolution("raw", 0, 50), Resolution("1m", 60, 20), Resolution("15m", 900, 10))
+    )
+
+
+def test_raw_window_after_wraparound_matches_brute_force():
+    buf = small()
+    samples = [(k * 5 * S, float(k)) for k in range(137)]  # wraps the 50-slot ring
+    for t, v in samples:
+        buf.record(t, "light_day", v)
+
+    kept = samples[-50:]
+    for since, until in [(0, 10**12), (500 * S, 600 * S), (kept[10][0], kept[10][0] + 1)]:
+        got = buf.series("light_day", since, until, resolution="raw")
+        expected = [(t, v) for t, v in kept if since <= t < until]
+        assert list(zip(got.t_us, got.value)) == expected
+
+
+def test_downsampled_buckets_hold_mean_min_max():
+    buf = small()
+    for k in range(25):  # 0..120 s at 5 s; buckets [0,60) and [60,120) close
+        buf.record(k * 5 * S, "uvb", float(k % 3 == 0))
+
+    s = buf.series("uvb", 0, resolution="1m")
+    assert list(s.t_us) == [0, 60 * S]
+    assert list(s.value) == pytest.approx([4 / 12, 4 / 12])
+    assert list(s.low) == [0.0, 0.0] and list(s.high) == [1.0, 1.0]
+
+
+def test_auto_resolution_picks_finest_covering_ring():
+    buf = small()
+    for k in range(400):
+        buf.record(k * 5 * S, "light_day", 0.5)
+    end = 400 * 5 * S
+
+    assert buf.series("light_day", end - 60 * S).resolution == "raw"
+    assert buf.series("light_day", end - 900 * S).resolution == "1m"
+    assert buf.series("light_day", 0).resolution == "15m"
+
+
+def test_memory_is_fixed_and_out_of_order_samples_are_dropped():
+    buf = small()
+    assert buf.bytes_per_channel() == 8 * (50 * 2 + 20 * 4 + 10 * 4)
+    buf.record(10 * S, "mister", 1.0)
+    buf.record(5 * S, "mister", 0.0)
+    assert buf.dropped == 1
+    assert list(buf.series("mister", 0).value) == [1.0]
+    with pytest.raises(KeyError):
+        buf.series("nope", 0)
+
+
+@pytest.mark.asyncio
+async def test_agent_records_outputs_each_tick():
+    start = datetime(2026, 1, 15, 17, tzinfo=timezone.utc)  # 12:00 in New York
+    clock = SimClock(start)
+    agent = SimAgent("enclosure_1", "crested_gecko", clock=clock)
+    agent.telemetry = TelemetryBuffer()
+
+    for _ in range(3):
+        await agent.tick()
+        clock.advance(5)
+
+    s = agent.telemetry.series("light_day", 0)
+    assert len(s) == 3
+    assert list(s.value) == pytest.approx([0.85] * 3)
+    assert set(agent.telemetry.channels) == {"light_day", "uvb", "mister", "waterfall"}
+    assert s.t_us[0] == to_epoch_us(start)
+
+
+@pytest.mark.asyncio
+async def test_clock_stepping_back_does_not_fail_ticks():
+    start = datetime(2026, 1, 15, 17, tzinfo=timezone.utc)
+    clock = SimClock(start)
+    agent = SimAgent("enclosure_1", "crested_gecko", clock=clock)
+    agent.telemetry = TelemetryBuffer()
+
+    await agent.tick()
+    clock.advance(-2)  # e.g. NTP correcting the wall clock
+    await agent.tick()
+    assert agent.telemetry.dropped == 4  # one per device
+    clock.advance(5)
+    await agent.tick()
+    assert len(agent.telemetry.series("light_day", 0)) == 2
@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta, timezone
+
+from vivariumassistant.apps.agent.tick_log import TickLog
+from vivariumassistant.packages.core.device_state import StateRecord
+
+T0 = datetime(2026, 1, 15, 12, tzinfo=timezone.utc)
+
+
+def states(light: float, uvb: bool) -> dict[str, StateRecord]:
+    return {
+        "light_day": StateRecord("light_day", on=light > 0, level=light),
+        "uvb": StateRecord("uvb", on=uvb),
+    }
+
+
+def test_full_mode_logs_every_tick():
+    log = TickLog()
+    assert log.fields(T0, states(0.5, True))["desired"]["uvb"]["on"] is True
+    assert "desired" in log.fields(T0, states(0.5, True))
+
+
+def test_delta_mode_logs_changes_and_periodic_snapshots():
+    log = TickLog(delta=True, snapshot_seconds=60)
+
+    first = log.fields(T0, states(0.5, True))
+    assert first["snapshot"] is True and set(first["desired"]) == {"light_day", "uvb"}
+
+    assert log.fields(T0 + timedelta(seconds=5), states(0.5, True)) is None
+
+    delta = log.fields(T0 + timedelta(seconds=10), states(0.6, True))
+    assert list(delta["changed"]) == ["light_day"]
+    assert delta["changed"]["light_day"]["level"] == 0.6
+
+    again = log.fields(T0 + timedelta(seconds=60), states(0.6, True))
+    assert again["snapshot"] is True
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from vivariumassistant.packages.core.config_schema import (
+    LightingProfile,
+    MistBurst,
+    MistProfile,
+    MistSafety,
+    MistWindow,
+    ProfileConfig,
+    UVBProfile,
+)
+from vivariumassistant.packages.engine.lighting import compute_daylight_level
+from vivariumassistant.packages.engine.mist import MistRuntime, mist_burst_due
+from vivariumassistant.packages.engine.schedule import from_epoch_us
+from vivariumassistant.packages.engine.uvb import uvb_should_be_on
+
+np = pytest.importorskip("numpy")
+
+from vivariumassistant.packages.engine.timeline import evaluate_timeline  # noqa: E402
+
+TZ = "America/New_York"
+ZONE = ZoneInfo(TZ)
+
+PROFILES = {
+    "day": ProfileConfig(
+        id="day",
+        lighting=LightingProfile(day_start="08:00", day_end="20:00", max_brightness=0.85),
+        uvb=UVBProfile(start="10:00", end="18:00"),
+        mist=MistProfile(
+            bursts=[MistBurst(at="07:30", seconds=20), MistBurst(at="01:30", seconds=25)],
+            windows=[MistWindow(start="09:00", end="17:00", every_minutes=90, seconds=12)],
+            safety=MistSafety(min_minutes_between=30, max_seconds_per_day=60),
+        ),
+    ),
+    "overnight": ProfileConfig(
+        id="overnight",
+        lighting=LightingProfile(
+            day_start="21:30", day_end="02:15", sunrise_minutes=20, sunset_minutes=90
+        ),
+        uvb=UVBProfile(start="23:00", end="01:00"),
+        mist=MistProfile(
+            windows=[MistWindow(start="22:00", end="02:00", every_minutes=30, seconds=8)],
+            safety=MistSafety(min_minutes_between=0, max_seconds_per_day=40),
+        ),
+    ),
+}
+
+
+def _reference(prof: ProfileConfig, times: list[datetime]):
+    """What an agent calling the scalar rules once per sample would produce."""
+    assert prof.uvb is not None and prof.mist is not None
+    rt = MistRuntime()
+    light, uvb, mist = [], [], []
+    for now in times:
+        light.append(compute_daylight_level(now, TZ, prof.lighting).level)
+        uvb.append(uvb_should_be_on(now, TZ, prof.uvb))
+        seconds = mist_burst_due(now, TZ, prof.mist, rt)
+        if seconds:
+            rt.record_burst(now, seconds)
+        mist.append(seconds or 0)
+    return light, uvb, mist
+
+
+@pytest.mark.parametrize("name", sorted(PROFILES))
+@pytest.mark.parametrize(
+    "start",
+    [
+        datetime(2026, 1, 14, 23, 0, tzinfo=ZONE),
+        datetime(2026, 3, 7, 12, 0, tzinfo=ZONE),  # spring forward
+        datetime(2026, 10, 31, 12, 0, tzinfo=ZONE),  # fall back
+    ],
+)
+def test_matches_scalar_rules_exactly(name, start):
+    prof = PROFILES[name]
+    end = start + timedelta(days=2)
+    step = timedelta(seconds=17)
+
+    tl = evaluate_timeline(prof, TZ, start, end, step)
+    times = [from_epoch_us(int(t), ZONE) for t in tl.t_us]
+    light, uvb, mist = _reference(prof, times)
+
+    assert times[0] == start and times[-1] < end <= times[-1] + step
+    assert tl.light.tolist() == light
+    assert tl.uvb.tolist() == uvb
+    assert tl.mist_seconds.tolist() == mist
+    assert tl.mist_seconds.any()
+
+
+def test_continues_existing_mist_runtime():
+    prof = PROFILES["day"]
+    rt = MistRuntime()
+    rt.daily_seconds_used["2026-01-15"] = 60
+
+    start = datetime(2026, 1, 15, tzinfo=ZONE)
+    end = start + timedelta(days=1)
+    tl = evaluate_timeline(prof, TZ, start, end, timedelta(minutes=1), mist_runtime=rt)
+    assert not tl.mist_seconds.any()
+
+
+def test_rejects_non_positive_step():
+    start = datetime(2026, 1, 15, tzinfo=ZONE)
+    with pytest.raises(ValueError):
+        evaluate_timeline(PROFILES["day"], TZ, start, start + timedelta(hours=1), timedelta(0))